@@ -1,8 +1,25 @@
+import itertools
 import os
 import re
+import sys
+import time
 
-import joblib
-from flask import Flask, render_template, request
+from flask import Flask, Response, abort, g, jsonify, render_template, request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from metrics import Metrics  # noqa: E402
+from model_store import ModelReloader, ModelStore  # noqa: E402
+from nb_inference import CompactNBModel  # noqa: E402
+from pdf_classifier import classify_pages  # noqa: E402
+from prediction_cache import PredictionCache, file_fingerprint  # noqa: E402
+from section_classifier import classify_document  # noqa: E402
+from search_index import SearchIndex  # noqa: E402
+from similarity_index import SimilarityIndex  # noqa: E402
+from synonym_expander import SynonymExpander  # noqa: E402
+from term_explainer import TermExplainer  # noqa: E402
 
 """
 Entry point serverless untuk deployment Vercel.
@@ -10,11 +27,132 @@ Identik dengan app.py, dengan penyesuaian path karena file
 berada di subdirektori api/.
 """
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 app = Flask(__name__, template_folder=os.path.join(BASE_DIR, "templates"))
 
 MODEL_PATH = os.path.join(BASE_DIR, "model_klasifikasi_ojk.joblib")
-model = joblib.load(MODEL_PATH)
+COMPACT_MODEL_DIR = os.path.join(BASE_DIR, "model_klasifikasi_ojk_compact")
+SLIM_MODEL_PATH = os.path.join(BASE_DIR, "model_klasifikasi_ojk.slim.joblib")
+
+# Versi model hasil train_model.py; jika store kosong dipakai file model di atas
+MODEL_STORE_DIR = os.environ.get("OJK_MODEL_STORE", os.path.join(BASE_DIR, "model_store"))
+model_store = ModelStore(MODEL_STORE_DIR)
+# Interval (detik) pemeriksaan versi model baru di thread latar (0 = nonaktif)
+MODEL_RELOAD_INTERVAL = float(os.environ.get("OJK_MODEL_RELOAD_INTERVAL", "2"))
+# Teks untuk memanaskan model baru sebelum dipasang
+MODEL_WARMUP_TEXTS = [
+    "pinjaman online ilegal menagih dengan kasar",
+    "klaim asuransi jiwa ditolak perusahaan",
+    "rekening bank diblokir tanpa pemberitahuan",
+]
+
+
+def load_serving_model():
+    """Muat model serving beserta info versinya.
+
+    Versi aktif di model store diutamakan. Tanpa store, model ringkas
+    (NumPy saja) dimuat jika tersedia dengan fallback ke Pipeline joblib
+    (versi padat dari model_compaction.py jika ada).
+    Model ringkas tidak membutuhkan import scikit-learn sehingga cold start
+    jauh lebih cepat; lihat nb_inference.py.
+    """
+    version = model_store.active()
+    if version is not None:
+        return model_store.load(version), {
+            "version": version, "source": "model_store", "metadata": model_store.metadata(version),
+        }
+    if os.path.isdir(COMPACT_MODEL_DIR):
+        return CompactNBModel.load(COMPACT_MODEL_DIR), {
+            "version": None, "source": os.path.basename(COMPACT_MODEL_DIR), "metadata": {},
+        }
+    import joblib
+    path = SLIM_MODEL_PATH if os.path.exists(SLIM_MODEL_PATH) else MODEL_PATH
+    return joblib.load(path), {"version": None, "source": os.path.basename(path), "metadata": {}}
+
+
+def model_files() -> list[str]:
+    """File yang menjadi sumber model serving, untuk mendeteksi perubahan model."""
+    if model_store.active() is not None:
+        return [model_store.pointer_path]
+    if os.path.isdir(COMPACT_MODEL_DIR):
+        return [os.path.join(COMPACT_MODEL_DIR, f) for f in sorted(os.listdir(COMPACT_MODEL_DIR))]
+    return [SLIM_MODEL_PATH, MODEL_PATH]
+
+
+# Cache hasil predict_proba per teks ternormalisasi (0 = nonaktif)
+PREDICTION_CACHE_SIZE = int(os.environ.get("OJK_PREDICTION_CACHE_SIZE", "4096"))
+prediction_cache = PredictionCache(PREDICTION_CACHE_SIZE)
+# Penjelasan per (teks ternormalisasi, jumlah term), dikosongkan bersama prediction_cache
+explanation_cache = PredictionCache(PREDICTION_CACHE_SIZE)
+
+
+def swap_model(new_model, info: dict) -> None:
+    """Pasang model baru; request yang sedang berjalan tetap memakai model lamanya."""
+    global model, model_info, model_explainer
+    explainer = TermExplainer.from_model(new_model)
+    replacing = model is not None
+    model, model_info, model_explainer = new_model, info, explainer
+    # Model pertama saat startup tidak menggantikan apa pun; cache masih kosong
+    if replacing:
+        prediction_cache.clear()
+        explanation_cache.clear()
+
+
+model = None
+model_info: dict = {}
+model_explainer: TermExplainer | None = None
+model_reloader = ModelReloader(
+    load_serving_model,
+    lambda: file_fingerprint(model_files()),
+    swap_model,
+    warmup_texts=MODEL_WARMUP_TEXTS,
+    interval=MODEL_RELOAD_INTERVAL,
+)
+model_reloader.reload()
+model_reloader.start()
+
+# Batas jumlah teks per request ke /api/classify
+MAX_BATCH_SIZE = int(os.environ.get("OJK_MAX_BATCH_SIZE", "64"))
+DEFAULT_TOP_K = 3
+# Jumlah term penjelasan per kelas ("explain" pada /api/classify dan form)
+DEFAULT_EXPLAIN_TERMS = 5
+MAX_EXPLAIN_TERMS = 20
+
+# Batas unggah PDF: ukuran file, jumlah halaman, dan waktu ekstraksi. Ekstraksi
+# berhenti lebih awal jika label bertahan di atas OJK_PDF_CONFIDENCE (persen)
+# selama OJK_PDF_PATIENCE halaman berturut-turut.
+MAX_UPLOAD_MB = float(os.environ.get("OJK_MAX_UPLOAD_MB", "20"))
+PDF_MAX_PAGES = int(os.environ.get("OJK_PDF_MAX_PAGES", "60"))
+PDF_TIME_LIMIT = float(os.environ.get("OJK_PDF_TIME_LIMIT", "20"))
+PDF_CONFIDENCE = float(os.environ.get("OJK_PDF_CONFIDENCE", "80"))
+PDF_PATIENCE = int(os.environ.get("OJK_PDF_PATIENCE", "3"))
+app.config["MAX_CONTENT_LENGTH"] = int(MAX_UPLOAD_MB * 1024 * 1024)
+
+# Indeks regulasi serupa hasil `python similarity_index.py build`
+SIMILARITY_INDEX_DIR = os.environ.get("OJK_SIMILARITY_INDEX", os.path.join(BASE_DIR, "similarity_index"))
+MAX_SIMILAR_TOP_K = 50
+_similarity_index = None
+_similarity_fingerprint = None
+
+# Indeks full-text BM25 hasil `python search_index.py build`
+SEARCH_INDEX_DIR = os.environ.get("OJK_SEARCH_INDEX", os.path.join(BASE_DIR, "search_index"))
+MAX_SEARCH_TOP_K = 50
+_search_index = None
+_search_fingerprint = None
+
+# Instrumentasi per tahap dan endpoint /metrics (OJK_METRICS=1 untuk mengaktifkan)
+metrics = Metrics(enabled=os.environ.get("OJK_METRICS", "0") == "1")
+
+
+def _prediction_cache_metrics() -> list[tuple]:
+    gauges = ("size", "maxsize", "hit_rate")
+    return [
+        (f"prediction_cache_{name}", "gauge", f"prediction_cache {name}.", value) if name in gauges
+        else (f"prediction_cache_{name}_total", "counter", f"prediction_cache {name}.", value)
+        for name, value in prediction_cache.stats().items()
+    ]
+
+
+metrics.add_collector(_prediction_cache_metrics)
 
 DEPT_INFO = {
     "Perbankan": {
@@ -113,16 +251,12 @@ SYNONYM_MAP = {
 }
 
 
+_SYNONYM_EXPANDER = SynonymExpander(SYNONYM_MAP)
+
+
 def expand_synonyms(text: str) -> str:
     """Ganti istilah populer dengan terminologi formal peraturan OJK."""
-    text_lower = text.lower()
-    for colloquial, formal in SYNONYM_MAP.items():
-        text_lower = re.sub(
-            r"\b" + re.escape(colloquial) + r"\b",
-            formal,
-            text_lower,
-        )
-    return text_lower
+    return _SYNONYM_EXPANDER.expand(text)
 
 
 KEYWORD_OVERRIDE = {
@@ -154,33 +288,430 @@ def clean_text(text: str) -> str:
     return text.strip()
 
 
+def predict_proba_timed(model, texts: list[str], return_features: bool = False):
+    """predict_proba dengan vectorize dan perhitungan probabilitas diukur terpisah.
+
+    Dengan ``return_features`` hasil vectorizer ikut dikembalikan sebagai
+    ``(proba, features)`` untuk TermExplainer.
+    """
+    if not metrics.enabled and not return_features:
+        return model.predict_proba(texts)
+    if isinstance(model, CompactNBModel):
+        vectorize, predict = model.transform, model.predict_proba_features
+    else:
+        vectorize, predict = model[:-1].transform, model[-1].predict_proba
+    with metrics.stage("vectorize"):
+        features = vectorize(texts)
+    with metrics.stage("predict_proba"):
+        proba = predict(features)
+    return (proba, features) if return_features else proba
+
+
+def classify_batch(texts: list[str], top_k: int = DEFAULT_TOP_K, explain: int | list[int] = 0) -> list[dict]:
+    """Klasifikasikan banyak teks dengan satu panggilan predict_proba.
+
+    Label model diambil dari argmax probabilitas (sama dengan model.predict),
+    lalu keyword_override diterapkan per teks. Probabilitas diambil dari
+    prediction_cache jika teks ternormalisasi yang sama pernah diprediksi;
+    keyword_override tetap dihitung dari teks asli karena dua input berbeda
+    bisa menghasilkan teks ternormalisasi yang sama.
+
+    Dengan ``explain`` > 0 setiap hasil memuat ``explanation``: sebanyak
+    ``explain`` n-gram yang paling mendukung label model dan runner-up
+    (lihat term_explainer.py). ``explain`` boleh berupa daftar jumlah term
+    per teks (0 = tanpa penjelasan) untuk batch gabungan dari beberapa
+    request. Penjelasan disimpan di explanation_cache; hanya teks yang
+    penjelasannya belum ada di cache yang divektorisasi ulang.
+    """
+    # Satu referensi model untuk seluruh batch agar hot reload di tengah
+    # request tidak mencampur probabilitas dan kelas dari dua model.
+    current, explainer = model, model_explainer
+    counts = explain if isinstance(explain, list) else [explain] * len(texts)
+
+    with metrics.stage("expand_synonyms"):
+        expanded = [expand_synonyms(text) for text in texts]
+    with metrics.stage("clean_text"):
+        cleaned = [clean_text(text) for text in expanded]
+    rows = [prediction_cache.get(key) for key in cleaned]
+    explanations = {}
+    for explain_key in dict.fromkeys((key, n) for key, n in zip(cleaned, counts) if n):
+        cached = explanation_cache.get(explain_key)
+        if cached is not None:
+            explanations[explain_key] = cached
+    missing = [
+        explain_key for explain_key in dict.fromkeys(zip(cleaned, counts))
+        if explain_key[1] and explain_key not in explanations
+    ]
+
+    # Teks yang belum ada di cache (atau belum punya penjelasan yang diminta)
+    # diprediksi; duplikat dalam satu batch cukup dihitung sekali.
+    pending = list(dict.fromkeys(
+        [key for key, row in zip(cleaned, rows) if row is None] + [key for key, _ in missing]
+    ))
+    if pending:
+        if missing:
+            proba, features = predict_proba_timed(current, pending, return_features=True)
+            if explainer is None or explainer.model is not current:
+                explainer = TermExplainer.from_model(current)
+            position = {key: i for i, key in enumerate(pending)}
+            with metrics.stage("explain"):
+                for n in dict.fromkeys(n for _, n in missing):
+                    keys = [key for key, m in missing if m == n]
+                    idx = [position[key] for key in keys]
+                    subset = features[idx] if hasattr(features, "tocsr") else [features[i] for i in idx]
+                    for key, explanation in zip(keys, explainer.explain(subset, proba[idx], n)):
+                        explanations[(key, n)] = explanation
+                        if current is model:
+                            explanation_cache.put((key, n), explanation)
+        else:
+            proba = predict_proba_timed(current, pending)
+        # Salin per baris agar entri cache tidak menahan array batch utuh
+        computed = {key: row.copy() for key, row in zip(pending, proba)}
+        for key, row in computed.items():
+            row.flags.writeable = False
+            # Hasil model lama tidak dimasukkan ke cache yang sudah dikosongkan
+            if current is model:
+                prediction_cache.put(key, row)
+        rows = [computed.get(key, row) if row is None else row for key, row in zip(cleaned, rows)]
+    classes = current.classes_
+
+    results = []
+    for text, key, row, n in zip(texts, cleaned, rows, counts):
+        best = int(row.argmax())
+        model_label = str(classes[best])
+        confidence = round(float(row[best]) * 100, 1)
+        with metrics.stage("keyword_override"):
+            label = keyword_override(text, model_label, confidence)
+        if metrics.enabled:
+            metrics.observe_input(len(text))
+            metrics.observe_prediction(label, label != model_label)
+        ranked = row.argsort()[::-1][:top_k]
+        result = {
+            "label": label,
+            "model_label": model_label,
+            "confidence": confidence,
+            "top_k": [
+                {"department": str(classes[i]), "probability": round(float(row[i]), 4)}
+                for i in ranked
+            ],
+            "keyword_override": label != model_label,
+        }
+        if n:
+            result["explanation"] = explanations[(key, n)]
+        results.append(result)
+    return results
+
+
+def classify_pdf_upload(upload) -> dict:
+    """Ekstrak dan klasifikasikan PDF yang diunggah halaman demi halaman.
+
+    Library PDF (backend dari ``OJK_PDF_BACKEND``, default pdfplumber) hanya
+    dibutuhkan di sini dan di-import saat dipakai, sehingga deployment tanpa
+    library tersebut tetap bisa melayani klasifikasi teks.
+    """
+    from extract_pdf import clean_text as clean_page
+    from extract_pdf import count_pages, iter_pdf_pages
+
+    with metrics.stage("classify_pdf"):
+        result = classify_pages(
+            model,
+            iter_pdf_pages(upload.stream),
+            preprocess=clean_page,
+            threshold=PDF_CONFIDENCE,
+            patience=PDF_PATIENCE,
+            max_pages=PDF_MAX_PAGES,
+            time_limit=PDF_TIME_LIMIT,
+        )
+    upload.stream.seek(0)
+    result["total_pages"] = count_pages(upload.stream)
+    result["filename"] = upload.filename
+    return result
+
+
+def read_pdf_text(upload, max_pages: int) -> str:
+    """Teks bersih dari paling banyak ``max_pages`` halaman PDF yang diunggah."""
+    from extract_pdf import clean_text as clean_page
+    from extract_pdf import iter_pdf_pages
+
+    pages = iter_pdf_pages(upload.stream)
+    try:
+        return " ".join(clean_page(text) for _, text in itertools.islice(pages, max_pages))
+    finally:
+        pages.close()
+
+
+def get_similarity_index() -> SimilarityIndex:
+    """Indeks regulasi serupa; dimuat saat pertama dipakai dan dimuat ulang jika dibangun ulang.
+
+    FileNotFoundError dinaikkan jika indeks belum dibangun.
+    """
+    global _similarity_index, _similarity_fingerprint
+    fingerprint = file_fingerprint([os.path.join(SIMILARITY_INDEX_DIR, "meta.json")])
+    if _similarity_index is None or fingerprint != _similarity_fingerprint:
+        _similarity_index = SimilarityIndex.load(SIMILARITY_INDEX_DIR)
+        _similarity_fingerprint = fingerprint
+    return _similarity_index
+
+
+def get_search_index() -> SearchIndex:
+    """Indeks full-text; dimuat saat pertama dipakai dan dimuat ulang setelah ``add``/``merge``.
+
+    FileNotFoundError dinaikkan jika indeks belum dibangun.
+    """
+    global _search_index, _search_fingerprint
+    fingerprint = file_fingerprint([os.path.join(SEARCH_INDEX_DIR, "meta.json")])
+    if _search_index is None or fingerprint != _search_fingerprint:
+        _search_index = SearchIndex.load(SEARCH_INDEX_DIR)
+        _search_fingerprint = fingerprint
+    return _search_index
+
+
+def read_pdf_upload(field: str):
+    """File PDF dari form multipart, atau None jika tidak ada yang diunggah.
+
+    ValueError dinaikkan jika file bukan PDF.
+    """
+    upload = request.files.get(field)
+    if upload is None or not upload.filename:
+        return None
+    if upload.stream.read(5) != b"%PDF-":
+        raise ValueError("File yang diunggah bukan PDF")
+    upload.stream.seek(0)
+    return upload
+
+
 @app.route("/", methods=["GET", "POST"])
 def index():
     prediction = None
     dept_info = None
     user_input = ""
     confidence = None
+    pdf_result = None
+    explanation = None
+    error = None
 
     if request.method == "POST":
-        user_input = request.form.get("complaint", "").strip()
+        try:
+            upload = read_pdf_upload("document")
+        except RequestEntityTooLarge:
+            upload, error = None, f"Ukuran file maksimal {MAX_UPLOAD_MB:g} MB"
+        except ValueError as exc:
+            upload, error = None, str(exc)
+        if upload is not None:
+            try:
+                pdf_result = classify_pdf_upload(upload)
+            except ImportError:
+                error = "Ekstraksi PDF tidak tersedia di server ini"
+            except Exception:
+                error = "PDF tidak dapat dibaca"
+            if pdf_result and pdf_result["label"]:
+                prediction = pdf_result["label"]
+                confidence = pdf_result["confidence"]
+                dept_info = DEPT_INFO.get(prediction, {})
+            elif pdf_result:
+                error = "Tidak ada teks yang dapat diekstrak dari PDF"
+        user_input = "" if error or pdf_result else request.form.get("complaint", "").strip()
         if user_input:
-            expanded = expand_synonyms(user_input)
-            cleaned = clean_text(expanded)
-            prediction = model.predict([cleaned])[0]
+            result = classify_batch([user_input], explain=DEFAULT_EXPLAIN_TERMS)[0]
+            prediction = result["label"]
+            confidence = result["confidence"]
+            explanation = result["explanation"]
+            dept_info = DEPT_INFO.get(prediction, {})
 
-            if hasattr(model, "predict_proba"):
-                proba = model.predict_proba([cleaned])[0]
-                confidence = round(max(proba) * 100, 1)
-            else:
-                confidence = None
+    with metrics.stage("render_template"):
+        return render_template(
+            "index.html",
+            prediction=prediction,
+            dept_info=dept_info,
+            user_input=user_input,
+            confidence=confidence,
+            pdf_result=pdf_result,
+            explanation=explanation,
+            error=error,
+        )
 
-            prediction = keyword_override(user_input, prediction, confidence or 100.0)
-            dept_info = DEPT_INFO.get(prediction, {})
 
-    return render_template(
-        "index.html",
-        prediction=prediction,
-        dept_info=dept_info,
-        user_input=user_input,
-        confidence=confidence,
-    )
+class ClassifyRequestError(ValueError):
+    """Body /api/classify tidak valid; ``status`` adalah kode HTTP respons."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_classify_payload(payload) -> tuple[list[str], int, int]:
+    """Validasi body {"texts": [...], "top_k": 3, "explain": 5} dan kembalikan (texts, top_k, explain).
+
+    ``explain`` boleh berupa boolean (True = DEFAULT_EXPLAIN_TERMS term) atau
+    jumlah term; 0/False berarti tanpa penjelasan.
+    """
+    if not isinstance(payload, dict):
+        raise ClassifyRequestError("Body harus berupa objek JSON")
+
+    texts = payload.get("texts")
+    if not isinstance(texts, list) or not all(isinstance(t, str) and t.strip() for t in texts):
+        raise ClassifyRequestError("'texts' harus berupa list string yang tidak kosong")
+    if len(texts) > MAX_BATCH_SIZE:
+        raise ClassifyRequestError(f"Maksimal {MAX_BATCH_SIZE} teks per request", 413)
+
+    top_k = payload.get("top_k", DEFAULT_TOP_K)
+    if not isinstance(top_k, int) or isinstance(top_k, bool) or top_k < 1:
+        raise ClassifyRequestError("'top_k' harus berupa bilangan bulat positif")
+
+    explain = payload.get("explain", 0)
+    if isinstance(explain, bool):
+        explain = DEFAULT_EXPLAIN_TERMS if explain else 0
+    if not isinstance(explain, int) or not 0 <= explain <= MAX_EXPLAIN_TERMS:
+        raise ClassifyRequestError(f"'explain' harus berupa boolean atau bilangan bulat 0-{MAX_EXPLAIN_TERMS}")
+
+    return [t.strip() for t in texts], top_k, explain
+
+
+@app.route("/api/classify", methods=["POST"])
+def api_classify():
+    """Klasifikasi batch: {"texts": [...], "top_k": 3, "explain": false} -> {"results": [...]}."""
+    try:
+        texts, top_k, explain = parse_classify_payload(request.get_json(silent=True))
+    except ClassifyRequestError as exc:
+        return jsonify(error=str(exc)), exc.status
+
+    results = classify_batch(texts, top_k, explain) if texts else []
+    return jsonify(results=results)
+
+
+@app.route("/api/classify/document", methods=["POST"])
+def api_classify_document():
+    """Klasifikasi dokumen peraturan per bagian: {"text": "..."} -> label dan rincian per BAB."""
+    payload = request.get_json(silent=True)
+    text = payload.get("text") if isinstance(payload, dict) else None
+    if not isinstance(text, str) or not text.strip():
+        return jsonify(error="'text' harus berupa string yang tidak kosong"), 400
+
+    # Teks peraturan tidak melalui expand_synonyms: model dilatih dari
+    # terminologi resmi, dan istilah seperti "dana" bermakna lain di sini.
+    with metrics.stage("classify_document"):
+        result = classify_document(model, text, preprocess=clean_text)
+    return jsonify(result)
+
+
+@app.route("/api/classify/pdf", methods=["POST"])
+def api_classify_pdf():
+    """Klasifikasi PDF peraturan (multipart, field "file") dengan penghentian dini."""
+    try:
+        upload = read_pdf_upload("file")
+    except RequestEntityTooLarge:
+        return jsonify(error=f"Ukuran file maksimal {MAX_UPLOAD_MB:g} MB"), 413
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
+    if upload is None:
+        return jsonify(error="Unggah file PDF pada field 'file'"), 400
+
+    try:
+        result = classify_pdf_upload(upload)
+    except ImportError:
+        return jsonify(error="Ekstraksi PDF tidak tersedia di server ini"), 501
+    except Exception:
+        return jsonify(error="PDF tidak dapat dibaca"), 422
+    return jsonify(result)
+
+
+def model_status() -> dict:
+    """Versi model yang sedang dipakai beserta metadata dan statistik reload."""
+    return {**model_info, **model_reloader.stats()}
+
+
+@app.route("/api/model", methods=["GET"])
+def api_model():
+    """Versi model aktif (dari model store) dan metadata training-nya."""
+    return jsonify(model_status())
+
+
+@app.route("/api/similar", methods=["POST"])
+def api_similar():
+    """Regulasi paling mirip: JSON {"text": "...", "top_k": 5} atau PDF multipart (field "file")."""
+    exclude = []
+    if request.files:
+        try:
+            upload = read_pdf_upload("file")
+        except RequestEntityTooLarge:
+            return jsonify(error=f"Ukuran file maksimal {MAX_UPLOAD_MB:g} MB"), 413
+        except ValueError as exc:
+            return jsonify(error=str(exc)), 400
+        if upload is None:
+            return jsonify(error="Unggah file PDF pada field 'file'"), 400
+        top_k = request.form.get("top_k", "5")
+        top_k = int(top_k) if top_k.isdigit() else None
+        try:
+            text = read_pdf_text(upload, PDF_MAX_PAGES)
+        except ImportError:
+            return jsonify(error="Ekstraksi PDF tidak tersedia di server ini"), 501
+        except Exception:
+            return jsonify(error="PDF tidak dapat dibaca"), 422
+        # Dokumen yang sama di korpus tidak perlu ditampilkan sebagai hasil
+        exclude = [upload.filename]
+    else:
+        payload = request.get_json(silent=True)
+        text = payload.get("text") if isinstance(payload, dict) else None
+        if not isinstance(text, str) or not text.strip():
+            return jsonify(error="'text' harus berupa string yang tidak kosong"), 400
+        # Normalisasi sama dengan jalur klasifikasi (sinonim dan pembersihan teks)
+        text = clean_text(expand_synonyms(text))
+        top_k = payload.get("top_k", 5)
+    if not isinstance(top_k, int) or isinstance(top_k, bool) or not 1 <= top_k <= MAX_SIMILAR_TOP_K:
+        return jsonify(error=f"'top_k' harus berupa bilangan bulat 1-{MAX_SIMILAR_TOP_K}"), 400
+
+    try:
+        similarity_index = get_similarity_index()
+    except FileNotFoundError:
+        return jsonify(error="Indeks regulasi belum dibangun (python similarity_index.py build)"), 503
+    with metrics.stage("similarity_search"):
+        results = similarity_index.search(text, top_k, exclude=exclude)
+    return jsonify(results=results)
+
+
+@app.route("/api/search", methods=["POST"])
+def api_search():
+    """Pencarian full-text BM25: JSON {"query": "...", "top_k": 10}; frasa ditulis dalam tanda kutip."""
+    payload = request.get_json(silent=True)
+    query = payload.get("query") if isinstance(payload, dict) else None
+    if not isinstance(query, str) or not query.strip():
+        return jsonify(error="'query' harus berupa string yang tidak kosong"), 400
+    top_k = payload.get("top_k", 10)
+    if not isinstance(top_k, int) or isinstance(top_k, bool) or not 1 <= top_k <= MAX_SEARCH_TOP_K:
+        return jsonify(error=f"'top_k' harus berupa bilangan bulat 1-{MAX_SEARCH_TOP_K}"), 400
+
+    try:
+        search_index = get_search_index()
+    except FileNotFoundError:
+        return jsonify(error="Indeks pencarian belum dibangun (python search_index.py build)"), 503
+    with metrics.stage("full_text_search"):
+        found = search_index.search(query, top_k)
+    return jsonify(found)
+
+
+@app.route("/api/cache/stats", methods=["GET"])
+def api_cache_stats():
+    """Penghitung hit/miss/eviction prediction_cache untuk menentukan ukuran cache."""
+    return jsonify(prediction_cache.stats())
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    """Metrik format teks Prometheus; 404 jika instrumentasi nonaktif."""
+    if not metrics.enabled:
+        abort(404)
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+if metrics.enabled:
+    @app.before_request
+    def _start_timer():
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop("request_start", None)
+        if start is not None:
+            endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+            metrics.observe_request(endpoint, request.method, response.status_code, time.perf_counter() - start)
+        return response
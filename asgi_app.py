@@ -0,0 +1,241 @@
+"""
+Mode serving async (ASGI) dengan micro-batching request konkuren.
+
+Alternatif untuk app.py saat beban tinggi: request ke ``POST /api/classify``
+dan form ``/`` tidak langsung memanggil model, melainkan dimasukkan ke
+``MicroBatcher`` yang menggabungkan request yang datang bersamaan menjadi
+satu panggilan ``classify_batch`` (satu ``predict_proba``). Seluruh logika
+klasifikasi (``expand_synonyms``, ``clean_text``, ``keyword_override``,
+cache prediksi, ``DEPT_INFO``) dan validasi input dipakai ulang dari app.py,
+sehingga respons identik dengan server Flask.
+
+Upload PDF di form ``/`` (multipart) diklasifikasikan per halaman dengan
+``app.classify_pdf_upload`` di thread terpisah, tanpa micro-batching.
+
+Menjalankan (membutuhkan uvicorn):
+    pip install uvicorn
+    uvicorn asgi_app:app --port 8000
+
+Ukuran batch dan waktu tunggu maksimum diatur lewat ``OJK_MICROBATCH_MAX_SIZE``
+(default 64 teks) dan ``OJK_MICROBATCH_MAX_WAIT_MS`` (default 0: batch berisi
+semua request yang mengantre selama batch sebelumnya diproses, tanpa
+menunda request tunggal). Nilai > 0 menahan batch hingga sekian milidetik
+untuk batch yang lebih besar dengan imbalan latensi tambahan.
+"""
+
+import asyncio
+import io
+import json
+import os
+import time
+
+from werkzeug.formparser import FormDataParser
+from werkzeug.http import parse_options_header
+
+from app import (
+    DEFAULT_EXPLAIN_TERMS,
+    DEPT_INFO,
+    MAX_UPLOAD_MB,
+    ClassifyRequestError,
+    classify_batch,
+    classify_pdf_upload,
+    metrics,
+    model_status,
+    parse_classify_payload,
+    prediction_cache,
+)
+from app import app as flask_app
+from micro_batcher import MicroBatcher
+
+MICROBATCH_MAX_SIZE = int(os.environ.get("OJK_MICROBATCH_MAX_SIZE", "64"))
+MICROBATCH_MAX_WAIT_MS = float(os.environ.get("OJK_MICROBATCH_MAX_WAIT_MS", "0"))
+# Batas ukuran body request (byte); form "/" memakai batas upload PDF app.py
+MAX_BODY_BYTES = 1024 * 1024
+MAX_UPLOAD_BYTES = int(MAX_UPLOAD_MB * 1024 * 1024)
+
+batcher = MicroBatcher(classify_batch, MICROBATCH_MAX_SIZE, MICROBATCH_MAX_WAIT_MS)
+# Template yang sama dengan app.py, dirender tanpa request context Flask
+_index_template = flask_app.jinja_env.get_template("index.html")
+
+
+def _json(status: int, data: dict) -> tuple[int, str, bytes]:
+    return status, "application/json", json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def _parse_form(body: bytes, content_type: str) -> tuple[dict, dict]:
+    """Field form dan file upload dari body urlencoded atau multipart."""
+    mimetype, options = parse_options_header(content_type)
+    _, form, files = FormDataParser().parse(io.BytesIO(body), mimetype, len(body), options)
+    return form, files
+
+
+async def index(method: str, body: bytes | None, content_type: str) -> tuple[int, str, bytes]:
+    prediction = None
+    dept_info = None
+    user_input = ""
+    confidence = None
+    pdf_result = None
+    explanation = None
+    error = None
+
+    if method == "POST":
+        form, files = _parse_form(body, content_type) if body is not None else ({}, {})
+        upload = files.get("document")
+        if body is None:
+            error = f"Ukuran file maksimal {MAX_UPLOAD_MB:g} MB"
+        elif upload is not None and upload.filename:
+            if upload.stream.read(5) != b"%PDF-":
+                error = "File yang diunggah bukan PDF"
+            else:
+                upload.stream.seek(0)
+                try:
+                    pdf_result = await asyncio.to_thread(classify_pdf_upload, upload)
+                except ImportError:
+                    error = "Ekstraksi PDF tidak tersedia di server ini"
+                except Exception:
+                    error = "PDF tidak dapat dibaca"
+                if pdf_result and pdf_result["label"]:
+                    prediction = pdf_result["label"]
+                    confidence = pdf_result["confidence"]
+                    dept_info = DEPT_INFO.get(prediction, {})
+                elif pdf_result:
+                    error = "Tidak ada teks yang dapat diekstrak dari PDF"
+        user_input = "" if error or pdf_result else form.get("complaint", "").strip()
+        if user_input:
+            result = (await batcher.submit([user_input], 1, DEFAULT_EXPLAIN_TERMS))[0]
+            prediction = result["label"]
+            confidence = result["confidence"]
+            explanation = result["explanation"]
+            dept_info = DEPT_INFO.get(prediction, {})
+
+    with metrics.stage("render_template"):
+        html = _index_template.render(
+            prediction=prediction,
+            dept_info=dept_info,
+            user_input=user_input,
+            confidence=confidence,
+            pdf_result=pdf_result,
+            explanation=explanation,
+            error=error,
+        )
+    return 200, "text/html; charset=utf-8", html.encode("utf-8")
+
+
+async def api_classify(method: str, body: bytes, content_type: str) -> tuple[int, str, bytes]:
+    """Klasifikasi batch: {"texts": [...], "top_k": 3, "explain": false} -> {"results": [...]}."""
+    try:
+        payload = json.loads(body) if body else None
+    except ValueError:
+        payload = None
+    try:
+        texts, top_k, explain = parse_classify_payload(payload)
+    except ClassifyRequestError as exc:
+        return _json(exc.status, {"error": str(exc)})
+
+    results = await batcher.submit(texts, top_k, explain) if texts else []
+    return _json(200, {"results": results})
+
+
+async def api_cache_stats(method: str, body: bytes, content_type: str) -> tuple[int, str, bytes]:
+    return _json(200, prediction_cache.stats())
+
+
+async def api_model(method: str, body: bytes, content_type: str) -> tuple[int, str, bytes]:
+    return _json(200, model_status())
+
+
+async def api_batcher_stats(method: str, body: bytes, content_type: str) -> tuple[int, str, bytes]:
+    """Jumlah batch dan rata-rata ukuran batch, untuk menyetel max_batch_size/max_wait_ms."""
+    return _json(200, batcher.stats())
+
+
+async def metrics_endpoint(method: str, body: bytes, content_type: str) -> tuple[int, str, bytes]:
+    if not metrics.enabled:
+        return _json(404, {"error": "Not Found"})
+    return 200, "text/plain; version=0.0.4", metrics.render().encode("utf-8")
+
+
+ROUTES = {
+    "/": (("GET", "POST"), index),
+    "/api/classify": (("POST",), api_classify),
+    "/api/model": (("GET",), api_model),
+    "/api/cache/stats": (("GET",), api_cache_stats),
+    "/api/batcher/stats": (("GET",), api_batcher_stats),
+    "/metrics": (("GET",), metrics_endpoint),
+}
+
+
+async def _read_body(receive, limit: int) -> bytes | None:
+    """Body request utuh, atau None jika melebihi ``limit`` byte."""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return b""
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            return None
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+async def _lifespan(receive, send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            batcher.start()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await batcher.stop()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    start = time.perf_counter()
+    method = scope["method"]
+    route = ROUTES.get(scope["path"])
+    if route is None:
+        status, content_type, payload = _json(404, {"error": "Not Found"})
+    elif method not in route[0]:
+        status, content_type, payload = _json(405, {"error": "Method Not Allowed"})
+    else:
+        handler = route[1]
+        headers = dict(scope.get("headers", []))
+        request_type = headers.get(b"content-type", b"").decode("latin-1")
+        body = await _read_body(receive, MAX_UPLOAD_BYTES if handler is index else MAX_BODY_BYTES)
+        if body is None and handler is not index:
+            status, content_type, payload = _json(413, {"error": f"Body maksimal {MAX_BODY_BYTES} byte"})
+        else:
+            # index merender pesan error sendiri untuk upload yang terlalu besar
+            status, content_type, payload = await handler(method, body, request_type)
+
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", content_type.encode("latin-1")),
+            (b"content-length", str(len(payload)).encode("latin-1")),
+        ],
+    })
+    await send({"type": "http.response.body", "body": payload})
+    if metrics.enabled:
+        endpoint = scope["path"] if route is not None else "unmatched"
+        metrics.observe_request(endpoint, method, status, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("uvicorn belum terpasang: pip install uvicorn")
+    uvicorn.run(app, host="127.0.0.1", port=8000)
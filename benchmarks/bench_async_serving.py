@@ -0,0 +1,155 @@
+"""
+Load test: server Flask (app.py) vs server ASGI dengan micro-batching (asgi_app.py).
+
+Kedua server dijalankan sebagai proses terpisah dengan cache prediksi
+dimatikan agar setiap request benar-benar sampai ke model. Sejumlah klien
+konkuren (thread dengan koneksi keep-alive) mengirim satu pengaduan
+sintetis per request ke ``POST /api/classify`` selama durasi tertentu.
+Yang dilaporkan per tingkat konkurensi: throughput, latensi p50/p95/p99,
+dan untuk ASGI rata-rata ukuran batch yang terbentuk.
+
+    pip install uvicorn
+    python benchmarks/bench_async_serving.py --concurrency 1 8 32 --duration 10
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.join(BASE_DIR, "benchmarks"))
+
+from run_benchmarks import percentile, synthetic_text  # noqa: E402
+
+SERVERS = {
+    "flask": [sys.executable, "-c", "from app import app; app.run(port={port}, threaded=True)"],
+    "asgi": [sys.executable, "-m", "uvicorn", "asgi_app:app", "--port", "{port}", "--log-level", "warning"],
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(name: str, port: int) -> subprocess.Popen:
+    cmd = [part.format(port=port) for part in SERVERS[name]]
+    env = dict(os.environ, OJK_PREDICTION_CACHE_SIZE="0")
+    proc = subprocess.Popen(cmd, cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server {name} berhenti saat startup (exit {proc.returncode})")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f"Server {name} tidak siap dalam 30 detik")
+
+
+def request_json(conn: http.client.HTTPConnection, method: str, path: str, payload=None) -> tuple[int, dict]:
+    body = json.dumps(payload).encode("utf-8") if payload is not None else None
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    conn.request(method, path, body=body, headers=headers)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def batcher_stats(port: int) -> dict:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        return request_json(conn, "GET", "/api/batcher/stats")[1]
+    finally:
+        conn.close()
+
+
+def drive(port: int, concurrency: int, duration: float, texts: list[str]) -> dict:
+    """Jalankan ``concurrency`` klien selama ``duration`` detik; kumpulkan latensi."""
+    latencies: list[list[float]] = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    stop_at = time.perf_counter() + duration
+
+    def client(worker: int):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        i = worker
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            try:
+                status, _ = request_json(conn, "POST", "/api/classify", {"texts": [texts[i % len(texts)]]})
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                status = None
+            if status == 200:
+                latencies[worker].append(time.perf_counter() - start)
+            else:
+                errors[worker] += 1
+            i += concurrency
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(w,)) for w in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    values = sorted(v for worker in latencies for v in worker)
+    return {
+        "requests": len(values),
+        "errors": sum(errors),
+        "throughput": len(values) / elapsed,
+        "p50_ms": percentile(values, 50) * 1000 if values else 0.0,
+        "p95_ms": percentile(values, 95) * 1000 if values else 0.0,
+        "p99_ms": percentile(values, 99) * 1000 if values else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test Flask vs ASGI micro-batching")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=10.0, help="Detik per tingkat konkurensi")
+    parser.add_argument("--chars", type=int, default=300, help="Panjang teks pengaduan sintetis")
+    parser.add_argument("--servers", nargs="+", choices=list(SERVERS), default=list(SERVERS))
+    args = parser.parse_args()
+
+    texts = [synthetic_text(args.chars, seed=i) for i in range(2000)]
+
+    print(f"{'Server':<7} {'Conc':>5} {'Req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Errors':>7} {'Batch':>6}")
+    print("-" * 66)
+    for name in args.servers:
+        port = free_port()
+        proc = start_server(name, port)
+        try:
+            for concurrency in args.concurrency:
+                # Pemanasan singkat agar import lazy dan cache CPU tidak ikut terukur
+                drive(port, concurrency, 1.0, texts)
+                before = batcher_stats(port) if name == "asgi" else None
+                result = drive(port, concurrency, args.duration, texts)
+                batch = ""
+                if name == "asgi":
+                    after = batcher_stats(port)
+                    n_batches = after["batches"] - before["batches"]
+                    if n_batches:
+                        batch = f"{(after['texts'] - before['texts']) / n_batches:.1f}"
+                print(
+                    f"{name:<7} {concurrency:>5} {result['throughput']:>9.1f} {result['p50_ms']:>8.2f} "
+                    f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['errors']:>7} {batch:>6}"
+                )
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
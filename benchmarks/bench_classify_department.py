@@ -0,0 +1,70 @@
+"""
+Benchmark classify_department: re.findall per keyword vs KeywordScanner.
+
+Memakai teks dari output_pojk.csv jika tersedia, jika tidak memakai teks
+sintetis. Hitungan per keyword dibandingkan terlebih dahulu agar kedua
+implementasi dipastikan menghasilkan skor yang sama.
+
+    python benchmarks/bench_classify_department.py
+"""
+
+import csv
+import os
+import random
+import re
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from classify_department import DEPARTMENT_KEYWORDS, keyword_hits  # noqa: E402
+
+INPUT_CSV = os.path.join(BASE_DIR, "output_pojk.csv")
+
+
+def reference_hits(text: str) -> dict[str, int]:
+    """Hitungan keyword dengan satu re.findall per keyword (implementasi lama)."""
+    text_lower = text.lower()
+    return {
+        kw: len(re.findall(re.escape(kw), text_lower))
+        for keywords in DEPARTMENT_KEYWORDS.values()
+        for kw in keywords
+    }
+
+
+def load_texts() -> list[str]:
+    if os.path.exists(INPUT_CSV):
+        csv.field_size_limit(sys.maxsize)
+        with open(INPUT_CSV, "r", encoding="utf-8") as f:
+            texts = [row["content"] for row in csv.DictReader(f)]
+        print(f"Loaded {len(texts)} documents from '{INPUT_CSV}'")
+        return texts
+
+    rng = random.Random(0)
+    vocab = ["peraturan", "otoritas", "jasa", "keuangan", "pasal", "ayat", "dan", "yang"]
+    vocab += [w for kws in DEPARTMENT_KEYWORDS.values() for kw in kws for w in kw.split()]
+    texts = [" ".join(rng.choice(vocab) for _ in range(50000)) for _ in range(20)]
+    print(f"'{INPUT_CSV}' not found, using {len(texts)} synthetic documents")
+    return texts
+
+
+def main():
+    texts = load_texts()
+    total_mb = sum(len(t) for t in texts) / 1e6
+
+    for text in texts:
+        if reference_hits(text) != keyword_hits(text):
+            raise AssertionError("Hitungan keyword berbeda dari implementasi lama")
+    print("Per-keyword hit counts identical\n")
+
+    for name, fn in (("re.findall per keyword", reference_hits), ("KeywordScanner", keyword_hits)):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<24} {elapsed:8.3f} s  ({total_mb / elapsed:6.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Ukur cold start serving: Pipeline joblib (scikit-learn) vs model ringkas NumPy.
+
+Setiap skenario dijalankan di proses Python baru agar import dan pemuatan
+model benar-benar dingin. Yang dilaporkan: waktu sampai prediksi pertama,
+jumlah modul sklearn yang ter-import, dan peak RSS proses.
+
+    python benchmarks/bench_cold_start.py
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import json, resource, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {base_dir!r})
+{load}
+proba = model.predict_proba(["pinjaman online ilegal menagih dengan kasar"])
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "maxrss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "sklearn_modules": sum(1 for m in sys.modules if m.startswith("sklearn")),
+}}))
+"""
+
+SCENARIOS = {
+    "joblib Pipeline": (
+        "import joblib\n"
+        "model = joblib.load({path!r})".format(path=os.path.join(BASE_DIR, "model_klasifikasi_ojk.joblib"))
+    ),
+    "compact NumPy": (
+        "from nb_inference import CompactNBModel\n"
+        "model = CompactNBModel.load({path!r})".format(path=os.path.join(BASE_DIR, "model_klasifikasi_ojk_compact"))
+    ),
+}
+
+
+def run(load: str) -> dict:
+    code = PROBE.format(base_dir=BASE_DIR, load=load)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def main(repeats: int = 5):
+    print(f"{'Scenario':<18} {'First predict (ms)':>19} {'Peak RSS (MB)':>14} {'sklearn modules':>16}")
+    print("-" * 70)
+    for name, load in SCENARIOS.items():
+        runs = [run(load) for _ in range(repeats)]
+        ms = statistics.median(r["seconds"] for r in runs) * 1000
+        rss = statistics.median(r["maxrss_mb"] for r in runs)
+        print(f"{name:<18} {ms:>19.1f} {rss:>14.1f} {runs[0]['sklearn_modules']:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Micro-benchmark expand_synonyms: loop re.sub per entri vs SynonymExpander.
+
+Menjalankan pengecekan kesetaraan output pada input acak terlebih dahulu,
+lalu mengukur waktu rata-rata per panggilan untuk beberapa panjang teks.
+
+    python benchmarks/bench_expand_synonyms.py
+"""
+
+import os
+import random
+import sys
+import timeit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from app import SYNONYM_MAP  # noqa: E402
+from synonym_expander import SynonymExpander, expand_sequential  # noqa: E402
+
+FILLER = [
+    "saya", "sudah", "melapor", "ke", "kantor", "cabang", "tetapi", "belum",
+    "ada", "tanggapan", "dari", "pihak", "perusahaan", "kartu", "kredit",
+    "motor", "investasi", "konsumen", "tagihan", "bunga", "tinggi",
+]
+
+
+def make_text(rng: random.Random, n_words: int) -> str:
+    """Susun teks pengaduan sintetis dari filler dan istilah di SYNONYM_MAP."""
+    vocab = FILLER + [w for key in SYNONYM_MAP for w in key.split()]
+    seps = [" ", " ", " ", ", ", ". ", "-"]
+    return "".join(rng.choice(vocab) + rng.choice(seps) for _ in range(n_words))
+
+
+def reference_expand(text: str, items: list[tuple[str, str]]) -> str:
+    return expand_sequential(text.lower(), items)
+
+
+def check_equivalence(expander: SynonymExpander, n_cases: int = 20000) -> None:
+    rng = random.Random(0)
+    items = list(SYNONYM_MAP.items())
+    for _ in range(n_cases):
+        text = make_text(rng, rng.randint(1, 12))
+        expected = reference_expand(text, items)
+        actual = expander.expand(text)
+        if expected != actual:
+            raise AssertionError(f"Output berbeda untuk {text!r}:\n  {expected}\n  {actual}")
+    print(f"Equivalence check passed on {n_cases} random inputs\n")
+
+
+def main():
+    expander = SynonymExpander(SYNONYM_MAP)
+    items = list(SYNONYM_MAP.items())
+    check_equivalence(expander)
+
+    rng = random.Random(42)
+    print(f"{'Words':>8} {'re.sub loop (us)':>18} {'single pass (us)':>18} {'Speedup':>8}")
+    print("-" * 56)
+    for n_words in (10, 100, 1000, 10000):
+        text = make_text(rng, n_words)
+        number = max(1, 20000 // n_words)
+        t_loop = min(timeit.repeat(lambda: reference_expand(text, items), number=number, repeat=5))
+        t_fast = min(timeit.repeat(lambda: expander.expand(text), number=number, repeat=5))
+        us_loop = t_loop / number * 1e6
+        us_fast = t_fast / number * 1e6
+        print(f"{n_words:>8} {us_loop:>18.1f} {us_fast:>18.1f} {us_loop / us_fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
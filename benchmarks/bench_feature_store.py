@@ -0,0 +1,84 @@
+"""
+Ukur training, CV, dan tuning dari teks mentah vs dari feature store.
+
+Feature store dibangun di direktori sementara (build awal dan sync tanpa
+perubahan ikut diukur). Kedua jalur harus menghasilkan skor CV, hasil
+tuning, dan probabilitas model final yang sama; benchmark gagal jika tidak.
+
+    python benchmarks/bench_feature_store.py
+    python benchmarks/bench_feature_store.py --n-iter 720    # grid tuning penuh
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import train_model  # noqa: E402
+from feature_store import FeatureStore  # noqa: E402
+
+
+def timed(fn, *args, **kwargs):
+    # Output training (laporan CV, confusion matrix) tidak relevan di sini
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--input", default=train_model.INPUT_CSV)
+    parser.add_argument("--n-iter", type=int, default=60, help="Jumlah kombinasi tuning (720 = grid penuh).")
+    parser.add_argument("--n-jobs", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    df, _ = timed(train_model.load_data, args.input)
+    texts = df["content"].tolist()
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        store_dir = os.path.join(tmp, "feature_store")
+        _, build = timed(FeatureStore(store_dir).sync, args.input)
+        _, resync = timed(FeatureStore(store_dir).sync, args.input)
+        rows.append(("store build (initial)", None, build))
+        rows.append(("store sync (unchanged)", None, resync))
+
+        (text_pipeline, text_cv), text_train = timed(train_model.train_and_evaluate, df)
+        (store_pipeline, store_cv), store_train = timed(
+            train_model.train_and_evaluate, df, FeatureStore(store_dir),
+        )
+        rows.append(("train_and_evaluate", text_train, store_train))
+
+        text_tune, text_tune_s = timed(train_model.tune_hyperparameters, df, n_iter=args.n_iter, n_jobs=args.n_jobs)
+        store_tune, store_tune_s = timed(
+            train_model.tune_hyperparameters, df, n_iter=args.n_iter, n_jobs=args.n_jobs, store=FeatureStore(store_dir),
+        )
+        rows.append((f"tune ({len(text_tune)} combos)", text_tune_s, store_tune_s))
+
+    proba_diff = np.abs(text_pipeline.predict_proba(texts) - store_pipeline.predict_proba(texts)).max()
+    same_tune = [(r["params"], r["scores"]) for r in text_tune] == [(r["params"], r["scores"]) for r in store_tune]
+
+    print(f"{len(df)} documents, {sum(map(len, texts)) / 1e6:.1f}M characters\n")
+    print(f"{'Step':<26} {'Text (s)':>9} {'Store (s)':>10} {'Speedup':>8}")
+    print("-" * 56)
+    for name, text_s, store_s in rows:
+        text_col = f"{text_s:>9.2f}" if text_s is not None else f"{'-':>9}"
+        speedup = f"{text_s / store_s:>7.1f}x" if text_s is not None else f"{'-':>8}"
+        print(f"{name:<26} {text_col} {store_s:>10.2f} {speedup}")
+    print(f"\nCV scores identical: {np.array_equal(text_cv, store_cv)}")
+    print(f"Tuning results identical: {same_tune}")
+    print(f"Max predict_proba difference of final model: {proba_diff:.1e}")
+    if not (np.array_equal(text_cv, store_cv) and same_tune and proba_diff < 1e-9):
+        raise SystemExit("Feature store results differ from text pipeline")
+
+
+if __name__ == "__main__":
+    main()
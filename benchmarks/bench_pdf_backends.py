@@ -0,0 +1,115 @@
+"""
+Bandingkan backend ekstraksi PDF pada docs_POJK/: kecepatan, kemiripan token, dan hasil klasifikasi.
+
+Backend pertama (default pdfplumber) menjadi acuan. Untuk setiap backend lain
+dilaporkan waktu ekstraksi, halaman per detik, overlap token setelah
+``clean_text`` (multiset, dibagi jumlah token dokumen yang lebih panjang),
+serta jumlah dokumen yang label keyword (``classify_department``) dan
+prediksi modelnya sama dengan acuan.
+
+    python benchmarks/bench_pdf_backends.py
+    python benchmarks/bench_pdf_backends.py --backends pdfplumber pypdfium2 --limit 10
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+import joblib
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import extract_pdf  # noqa: E402
+from classify_department import classify_department  # noqa: E402
+from train_model import MODEL_PATH  # noqa: E402
+
+DOCS_DIR = os.path.join(BASE_DIR, "docs_POJK")
+
+
+def token_overlap(reference: list[str], tokens: list[str]) -> float:
+    """Jumlah token bersama (multiset) dibagi panjang dokumen yang lebih panjang."""
+    longest = max(len(reference), len(tokens))
+    if longest == 0:
+        return 1.0
+    return sum((Counter(reference) & Counter(tokens)).values()) / longest
+
+
+def extract_all(paths: list[str], backend: str) -> tuple[list[str], int, float]:
+    """Teks bersih per dokumen, total halaman, dan waktu ekstraksi (detik)."""
+    extractor = extract_pdf.get_backend(backend)
+    texts = []
+    pages = 0
+    elapsed = 0.0
+    for path in paths:
+        start = time.perf_counter()
+        page_texts = list(extractor.iter_pages(path))
+        elapsed += time.perf_counter() - start
+        pages += len(page_texts)
+        texts.append(extract_pdf.clean_text("\n".join(text for text in page_texts if text)))
+    return texts, pages, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--backends", nargs="+", choices=list(extract_pdf.BACKENDS), default=list(extract_pdf.BACKENDS),
+        help="Backend yang dibandingkan; yang pertama menjadi acuan.",
+    )
+    parser.add_argument("--limit", type=int, default=None, help="Hanya N PDF pertama.")
+    args = parser.parse_args(argv)
+
+    paths = sorted(
+        os.path.join(DOCS_DIR, f) for f in os.listdir(DOCS_DIR) if f.lower().endswith(".pdf")
+    )[:args.limit]
+    model = joblib.load(MODEL_PATH)
+
+    rows = []
+    reference = None
+    for backend in args.backends:
+        print(f"Extracting {len(paths)} PDF(s) with {backend}...", flush=True)
+        texts, pages, elapsed = extract_all(paths, backend)
+        tokens = [text.lower().split() for text in texts]
+        keyword_labels = [classify_department(text) for text in texts]
+        predictions = model.predict(texts).tolist()
+        if reference is None:
+            reference = (tokens, keyword_labels, predictions, elapsed)
+        ref_tokens, ref_keywords, ref_predictions, ref_elapsed = reference
+        overlaps = [token_overlap(a, b) for a, b in zip(ref_tokens, tokens)]
+        rows.append({
+            "backend": backend,
+            "seconds": elapsed,
+            "pages_per_s": pages / elapsed,
+            "speedup": ref_elapsed / elapsed,
+            "tokens": sum(map(len, tokens)),
+            "overlap_mean": sum(overlaps) / len(overlaps),
+            "overlap_min": min(overlaps),
+            "keyword_agree": sum(a == b for a, b in zip(ref_keywords, keyword_labels)),
+            "model_agree": sum(a == b for a, b in zip(ref_predictions, predictions)),
+            "differs": [
+                (kind, os.path.basename(path), a, b)
+                for kind, ref_labels, labels in (
+                    ("keyword label", ref_keywords, keyword_labels), ("model prediction", ref_predictions, predictions),
+                )
+                for path, a, b in zip(paths, ref_labels, labels) if a != b
+            ],
+        })
+
+    n = len(paths)
+    print(f"\n{n} documents, reference backend: {args.backends[0]}\n")
+    print(f"{'Backend':<12} {'Time (s)':>9} {'Pages/s':>8} {'Speedup':>8} {'Tokens':>8} "
+          f"{'Overlap':>8} {'Min':>6} {'Keyword':>8} {'Model':>8}")
+    print("-" * 85)
+    for row in rows:
+        print(f"{row['backend']:<12} {row['seconds']:>9.2f} {row['pages_per_s']:>8.1f} {row['speedup']:>7.1f}x "
+              f"{row['tokens']:>8} {row['overlap_mean']:>8.2%} {row['overlap_min']:>6.1%} "
+              f"{row['keyword_agree']:>4}/{n:<3} {row['model_agree']:>4}/{n:<3}")
+    for row in rows:
+        for kind, filename, expected, actual in row["differs"]:
+            print(f"  {row['backend']}: {kind} differs for {filename} ({expected} -> {actual})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Ukur ukuran indeks dan latensi query search_index terhadap ukuran korpus.
+
+Korpus sintetis dibuat dari potongan acak dokumen nyata di output_pojk.csv
+seperti benchmarks/bench_similarity.py. Setiap query diukur pada indeks
+BM25 dan pada pemindaian substring seluruh teks (cara mencari istilah
+sebelum ada indeks) sebagai pembanding.
+
+    python benchmarks/bench_search.py --sizes 1000 5000 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.join(BASE_DIR, "benchmarks"))
+
+from corpus_io import iter_documents  # noqa: E402
+from run_benchmarks import RAW_CSV, percentile  # noqa: E402
+from search_index import SearchIndex, parse_query  # noqa: E402
+
+QUERIES = [
+    "suku bunga dasar kredit",
+    '"bursa karbon"',
+    '"layanan pendanaan bersama" teknologi informasi',
+    "perlindungan konsumen pengaduan",
+    '"dana pensiun"',
+    "kualitas aset",
+]
+
+
+def scan(texts: list[str], query: str) -> int:
+    """Jumlah dokumen yang memuat salah satu kata atau semua frasa (pemindaian teks mentah)."""
+    terms, phrases = parse_query(query)
+    matched = 0
+    for text in texts:
+        lowered = text.lower()
+        if phrases:
+            matched += all(" ".join(phrase) in lowered for phrase in phrases)
+        else:
+            matched += any(term in lowered for term in terms)
+    return matched
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ukuran dan latensi search_index.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--doc-chars", type=int, default=6000, help="Panjang dokumen sintetis.")
+    parser.add_argument("--repeat", type=int, default=20, help="Pengulangan per query.")
+    args = parser.parse_args(argv)
+
+    docs = list(iter_documents(RAW_CSV))
+    rng = random.Random(0)
+
+    def window() -> str:
+        doc = rng.choice(docs)["content"]
+        start = rng.randrange(max(1, len(doc) - args.doc_chars))
+        return doc[start:start + args.doc_chars]
+
+    print(f"{'Docs':>11} {'Build (s)':>9} {'Text MB':>8} {'Postings MB':>11} {'p50 (ms)':>9} {'p99 (ms)':>9} {'Scan p50 (ms)':>13}")
+    corpora = [("real", [{"filename": d["filename"], "content": d["content"]} for d in docs])]
+    corpora += [(str(size), [{"filename": f"doc{i}", "content": window()} for i in range(size)]) for size in args.sizes]
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, corpus in corpora:
+            path = os.path.join(tmp, name)
+            start = time.perf_counter()
+            index = SearchIndex(path)
+            index.add(corpus)
+            build = time.perf_counter() - start
+            info = index.info()
+
+            timings, scan_timings = [], []
+            texts = [doc["content"] for doc in corpus]
+            for query in QUERIES:
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    index.search(query, 10)
+                    timings.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                scan(texts, query)
+                scan_timings.append(time.perf_counter() - start)
+            timings.sort()
+            scan_timings.sort()
+            text_mb = sum(len(text) for text in texts) / 1024 / 1024
+            label = f"{len(corpus)}" + (" (real)" if name == "real" else "")
+            print(f"{label:>11} {build:>9.2f} {text_mb:>8.1f} {info['postings_mb']:>11.1f} "
+                  f"{percentile(timings, 50) * 1000:>9.2f} {percentile(timings, 99) * 1000:>9.2f} "
+                  f"{percentile(scan_timings, 50) * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
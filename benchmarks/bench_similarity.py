@@ -0,0 +1,89 @@
+"""
+Ukur latensi pencarian regulasi serupa terhadap ukuran korpus.
+
+Korpus sintetis dibuat dari potongan acak dokumen nyata di
+output_pojk.csv (sehingga distribusi term realistis), diindeks dengan
+``similarity_index.build_index``, lalu di-query dengan teks pendek
+(seperti pengaduan) dan potongan dokumen panjang. Untuk query panjang juga
+dilaporkan kecocokan top-5 pencarian dua tahap dengan perkalian penuh.
+
+    python benchmarks/bench_similarity.py --sizes 1000 5000 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.join(BASE_DIR, "benchmarks"))
+
+from corpus_io import DocumentWriter, iter_documents  # noqa: E402
+from run_benchmarks import RAW_CSV, percentile  # noqa: E402
+from similarity_index import SimilarityIndex, build_index  # noqa: E402
+
+SHORT_QUERIES = [
+    "pinjaman online ilegal menagih dengan kasar",
+    "penyelenggaraan layanan pendanaan bersama berbasis teknologi informasi",
+    "kualitas aset bank perekonomian rakyat",
+    "klaim asuransi jiwa ditolak perusahaan",
+]
+
+
+def percentile_ms(samples: list[float], q: float) -> float:
+    return percentile(sorted(samples), q) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark latensi similarity_index.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--doc-chars", type=int, default=6000, help="Panjang dokumen sintetis.")
+    parser.add_argument("--queries", type=int, default=40, help="Jumlah query per jenis.")
+    args = parser.parse_args(argv)
+
+    docs = [doc["content"] for doc in iter_documents(RAW_CSV)]
+    rng = random.Random(0)
+
+    def window(n_chars: int) -> str:
+        doc = rng.choice(docs)
+        start = rng.randrange(max(1, len(doc) - n_chars))
+        return doc[start:start + n_chars]
+
+    print(f"{'Docs':>7} {'Build (s)':>9} {'Query':<6} {'Terms':>6} {'p50 (ms)':>9} {'p99 (ms)':>9} {'Full p50':>9} {'Top-5':>6}")
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, "corpus.csv")
+        for size in args.sizes:
+            with DocumentWriter(corpus, ["filename", "content"]) as writer:
+                for i in range(size):
+                    writer.write({"filename": f"doc{i}", "content": window(args.doc_chars)})
+            stats = build_index(corpus, os.path.join(tmp, "index"))
+            index = SimilarityIndex.load(os.path.join(tmp, "index"))
+            full = SimilarityIndex.load(os.path.join(tmp, "index"), max_query_terms=None)
+
+            for kind, queries in (
+                ("short", [SHORT_QUERIES[i % len(SHORT_QUERIES)] for i in range(args.queries)]),
+                ("doc", [window(20000) for _ in range(args.queries)]),
+            ):
+                # Vectorize query di luar pengukuran: yang diukur hanya pencarian indeks
+                vectors = [index.vectorizer.transform_one(query) for query in queries]
+                timings, full_timings, overlap = [], [], 0
+                for idx, values in vectors:
+                    start = time.perf_counter()
+                    found = index.search_vector(idx, values, 5)
+                    timings.append(time.perf_counter() - start)
+                    start = time.perf_counter()
+                    expected = full.search_vector(idx, values, 5)
+                    full_timings.append(time.perf_counter() - start)
+                    overlap += len({r["filename"] for r in found} & {r["filename"] for r in expected})
+                terms = np.mean([len(idx) for idx, _ in vectors])
+                print(f"{size:>7} {stats['seconds']:>9} {kind:<6} {terms:>6.0f} "
+                      f"{percentile_ms(timings, 50):>9.2f} {percentile_ms(timings, 99):>9.2f} "
+                      f"{percentile_ms(full_timings, 50):>9.2f} {overlap / (5 * len(queries)):>6.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+"""
+Load test lokal untuk entry point Flask (app.py) dan Vercel (api/index.py).
+
+Skenario didefinisikan di file JSON (default benchmarks/load_scenarios.json)
+agar bisa diputar ulang setelah setiap perubahan model atau kode:
+
+    {
+      "defaults": {"duration": 10, "warmup": 1, "sample_interval": 0.5,
+                   "lengths": [80, 300, 1200], "env": {"OJK_PREDICTION_CACHE_SIZE": "0"}},
+      "scenarios": [
+        {"name": "form", "server": "flask", "route": "/", "concurrency": [1, 4, 16]},
+        {"name": "api-batch16", "server": "flask", "route": "/api/classify",
+         "batch_size": 16, "concurrency": [4]}
+      ]
+    }
+
+Field skenario (nilai yang tidak diisi diambil dari ``defaults``):
+``server`` (flask, vercel, prefork, asgi), ``workers`` (untuk prefork),
+``route`` (``/`` untuk form atau
+``/api/classify``), ``concurrency`` (daftar jumlah klien), ``duration``
+dan ``warmup`` (detik), ``lengths`` (panjang teks pengaduan, dipakai
+bergiliran), ``texts`` (jumlah teks berbeda), ``batch_size`` (teks per
+request JSON), ``env`` (variabel lingkungan server), ``sample_interval``.
+
+Setiap skenario menjalankan server di proses baru. Klien (thread dengan
+koneksi keep-alive) mengirim pengaduan sintetis berbahasa Indonesia.
+Sementara itu CPU dan RSS proses server beserta child-nya dibaca dari
+/proc setiap ``sample_interval`` detik. Yang dilaporkan per tingkat
+konkurensi: throughput, latensi p50/p95/p99, error rate, CPU rata-rata dan
+maksimum, serta RSS awal dan maksimum. Timeline per interval (req/s, p95,
+CPU, RSS) disimpan di file JSON hasil.
+
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --scenario form api --duration 5
+    python benchmarks/load_test.py --config my_scenarios.json --output after.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timezone
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "benchmarks"))
+
+from bench_async_serving import free_port  # noqa: E402
+from run_benchmarks import RESULTS_DIR, percentile  # noqa: E402
+
+DEFAULT_CONFIG = os.path.join(BASE_DIR, "benchmarks", "load_scenarios.json")
+DEFAULT_OUTPUT = os.path.join(RESULTS_DIR, "load_test.json")
+
+SERVERS = {
+    "flask": [sys.executable, "-c", "from app import app; app.run(port={port}, threaded=True)"],
+    "vercel": [
+        sys.executable, "-c",
+        "import runpy; app = runpy.run_path('api/index.py')['app']; app.run(port={port}, threaded=True)",
+    ],
+    "prefork": [sys.executable, "prefork.py", "--port", "{port}", "--workers", "{workers}"],
+    "asgi": [sys.executable, "-m", "uvicorn", "asgi_app:app", "--port", "{port}", "--log-level", "warning"],
+}
+
+SCENARIO_DEFAULTS = {
+    "route": "/",
+    "concurrency": [1, 4, 16],
+    "duration": 10.0,
+    "warmup": 1.0,
+    "sample_interval": 0.5,
+    "lengths": [80, 300, 1200],
+    "texts": 500,
+    "batch_size": 1,
+    "workers": 2,
+    "env": {},
+}
+
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+PAGE_KB = os.sysconf("SC_PAGE_SIZE") // 1024
+
+# Kalimat penyusun pengaduan sintetis: pembuka, inti per sektor, rincian, penutup
+OPENINGS = [
+    "Selamat siang, saya ingin melaporkan masalah.",
+    "Mohon bantuan OJK,",
+    "Saya nasabah yang merasa dirugikan.",
+    "Dengan hormat, saya sampaikan pengaduan berikut.",
+    "Min tolong dong,",
+]
+ISSUES = [
+    "Saya dihubungi terus oleh debt collector pinjol padahal tidak pernah pinjam, datanya disebar ke kontak saya.",
+    "Aplikasi pinjaman online menagih dengan kata-kata kasar dan bunga harian tidak sesuai perjanjian awal.",
+    "Saldo e-wallet saya hilang Rp750.000 setelah transaksi QRIS gagal dan belum dikembalikan.",
+    "Paylater saya tiba-tiba ada tagihan yang tidak pernah saya gunakan.",
+    "Kartu kredit saya ditagih transaksi yang tidak saya lakukan dan bank menolak pengajuan keberatan.",
+    "Rekening tabungan saya diblokir tanpa pemberitahuan sehingga gaji tidak bisa ditarik.",
+    "Pengajuan KPR sudah disetujui tetapi bank mengubah suku bunga secara sepihak.",
+    "Deposito saya jatuh tempo tapi dana belum cair sudah dua minggu.",
+    "Klaim asuransi kesehatan rawat inap saya ditolak dengan alasan penyakit bawaan yang tidak jelas.",
+    "Polis unit link yang saya beli ternyata nilai investasinya turun jauh dan agen tidak menjelaskan risikonya.",
+    "Premi asuransi jiwa terus dipotong dari rekening padahal polis sudah saya batalkan.",
+    "Motor saya ditarik paksa oleh pihak leasing di jalan padahal baru telat bayar satu bulan.",
+    "Perusahaan multifinance menolak pelunasan dipercepat kredit mobil dan meminta denda besar.",
+    "Barang gadai saya dilelang sebelum jatuh tempo tanpa konfirmasi.",
+    "Broker saham tempat saya membuka rekening efek tidak bisa dihubungi dan dana RDN tidak bisa ditarik.",
+    "Reksadana yang ditawarkan manajer investasi ternyata gagal bayar dan tidak ada kejelasan pengembalian.",
+    "Saya tertipu investasi bodong berkedok trading kripto dengan janji keuntungan 10 persen per bulan.",
+    "Koperasi simpan pinjam tidak mengembalikan simpanan anggota sejak tahun lalu.",
+    "Dana pensiun saya belum dibayarkan padahal sudah memasuki usia pensiun.",
+]
+DETAILS = [
+    "Kejadian ini terjadi pada tanggal 12/03/2024 sekitar jam 10 pagi.",
+    "Sudah saya laporkan ke call center tiga kali tapi hanya diberi nomor tiket.",
+    "Total kerugian sekitar Rp2.500.000,- dan bukti transfer sudah saya simpan.",
+    "Petugas cabang bilang itu bukan tanggung jawab mereka.",
+    "Saya sudah kirim email pengaduan tapi tidak dibalas sampai sekarang.",
+    "Keluarga saya juga ikut diteror lewat WhatsApp.",
+    "Nomor kontrak dan kronologi lengkap bisa saya kirimkan jika dibutuhkan.",
+]
+CLOSINGS = [
+    "Mohon segera ditindaklanjuti.",
+    "Terima kasih atas perhatiannya.",
+    "Saya minta uang saya dikembalikan.",
+    "Tolong perusahaan ini diberi sanksi.",
+]
+
+
+def complaint_text(n_chars: int, rng: random.Random) -> str:
+    """Pengaduan sintetis sepanjang kira-kira ``n_chars`` karakter."""
+    parts = [rng.choice(OPENINGS), rng.choice(ISSUES)]
+    while sum(len(p) + 1 for p in parts) < n_chars:
+        parts.append(rng.choice(DETAILS + ISSUES))
+    parts.append(rng.choice(CLOSINGS))
+    text = " ".join(parts)
+    if len(text) > n_chars:
+        text = text[:n_chars].rsplit(" ", 1)[0]
+    return text
+
+
+def load_scenarios(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    defaults = {**SCENARIO_DEFAULTS, **config.get("defaults", {})}
+    scenarios = []
+    for raw in config["scenarios"]:
+        scenario = {**defaults, **raw, "env": {**defaults["env"], **raw.get("env", {})}}
+        if scenario.get("server") not in SERVERS:
+            raise ValueError(f"Skenario {raw.get('name')!r}: server harus salah satu dari {list(SERVERS)}")
+        if scenario["route"] not in ("/", "/api/classify"):
+            raise ValueError(f"Skenario {raw.get('name')!r}: route harus '/' atau '/api/classify'")
+        scenarios.append(scenario)
+    return scenarios
+
+
+def start_server(name: str, port: int, env: dict, workers: int = 1) -> subprocess.Popen:
+    cmd = [part.format(port=port, workers=workers) for part in SERVERS[name]]
+    proc = subprocess.Popen(
+        cmd, cwd=BASE_DIR, env={**os.environ, **env}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server {name} berhenti saat startup (exit {proc.returncode})")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/model")
+            conn.getresponse().read()
+            conn.close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f"Server {name} tidak siap dalam 30 detik")
+
+
+def process_tree(pid: int) -> list[int]:
+    """``pid`` beserta seluruh turunannya (worker server), dibaca dari /proc."""
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return tree
+
+
+def proc_usage(pid: int) -> tuple[float, float]:
+    """(detik CPU user+system, RSS dalam MB) untuk ``pid`` dan turunannya."""
+    cpu_ticks, rss_pages = 0, 0
+    for p in process_tree(pid):
+        try:
+            with open(f"/proc/{p}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{p}/statm") as f:
+                rss_pages += int(f.read().split()[1])
+        except OSError:
+            continue
+        cpu_ticks += int(fields[11]) + int(fields[12])
+    return cpu_ticks / CLK_TCK, rss_pages * PAGE_KB / 1024
+
+
+class Sampler(threading.Thread):
+    """Catat CPU (persen satu core) dan RSS server setiap ``interval`` detik."""
+
+    def __init__(self, pid: int, interval: float):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples: list[dict] = []
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        start = time.perf_counter()
+        last_time, (last_cpu, _) = start, proc_usage(self.pid)
+        while not self._stop_event.wait(self.interval):
+            now = time.perf_counter()
+            cpu, rss = proc_usage(self.pid)
+            self.samples.append({
+                "t": round(now - start, 3),
+                "cpu_percent": round((cpu - last_cpu) / (now - last_time) * 100, 1),
+                "rss_mb": round(rss, 1),
+            })
+            last_time, last_cpu = now, cpu
+
+    def stop(self) -> list[dict]:
+        self._stop_event.set()
+        self.join()
+        return self.samples
+
+
+def build_request(route: str, texts: list[str]) -> tuple[bytes, dict]:
+    if route == "/":
+        body = urllib.parse.urlencode({"complaint": texts[0]}).encode("utf-8")
+        return body, {"Content-Type": "application/x-www-form-urlencoded"}
+    body = json.dumps({"texts": texts}).encode("utf-8")
+    return body, {"Content-Type": "application/json"}
+
+
+def drive(port: int, scenario: dict, concurrency: int, duration: float, texts: list[str]) -> tuple[list, float]:
+    """Jalankan klien selama ``duration`` detik; kembalikan (waktu selesai, latensi, sukses) per request."""
+    records: list[tuple[float, float, bool]] = []
+    batch = scenario["batch_size"]
+    start_all = time.perf_counter()
+    stop_at = start_all + duration
+
+    def client(worker: int):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        i = worker * batch
+        while time.perf_counter() < stop_at:
+            payload = [texts[(i + j) % len(texts)] for j in range(batch)]
+            body, headers = build_request(scenario["route"], payload)
+            start = time.perf_counter()
+            try:
+                conn.request("POST", scenario["route"], body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                ok = False
+            end = time.perf_counter()
+            records.append((end - start_all, end - start, ok))
+            i += concurrency * batch
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(w,)) for w in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return records, time.perf_counter() - start_all
+
+
+def summarize(records: list, elapsed: float, samples: list[dict], interval: float, batch: int) -> dict:
+    latencies = sorted(latency for _, latency, ok in records if ok)
+    errors = sum(1 for _, _, ok in records if not ok)
+    timeline = []
+    previous = 0.0
+    for sample in samples:
+        window = sorted(lat for end, lat, ok in records if ok and previous <= end < sample["t"])
+        timeline.append({
+            **sample,
+            "req_per_s": round(len(window) / interval, 1),
+            "p95_ms": round(percentile(window, 95) * 1000, 2) if window else None,
+        })
+        previous = sample["t"]
+    cpu = [s["cpu_percent"] for s in samples] or [0.0]
+    rss = [s["rss_mb"] for s in samples] or [0.0]
+    return {
+        "requests": len(records),
+        "errors": errors,
+        "error_rate": errors / len(records) if records else 0.0,
+        "throughput": len(latencies) / elapsed,
+        "texts_per_s": len(latencies) * batch / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000 if latencies else None,
+        "p95_ms": percentile(latencies, 95) * 1000 if latencies else None,
+        "p99_ms": percentile(latencies, 99) * 1000 if latencies else None,
+        "cpu_mean_percent": sum(cpu) / len(cpu),
+        "cpu_max_percent": max(cpu),
+        "rss_start_mb": rss[0],
+        "rss_max_mb": max(rss),
+        "timeline": timeline,
+    }
+
+
+def run_scenario(scenario: dict, duration: float | None = None) -> list[dict]:
+    rng = random.Random(0)
+    lengths = scenario["lengths"]
+    texts = [complaint_text(lengths[i % len(lengths)], rng) for i in range(scenario["texts"])]
+    duration = duration if duration is not None else scenario["duration"]
+    port = free_port()
+    proc = start_server(scenario["server"], port, scenario["env"], scenario["workers"])
+    results = []
+    try:
+        for concurrency in scenario["concurrency"]:
+            if scenario["warmup"]:
+                drive(port, scenario, concurrency, scenario["warmup"], texts)
+            sampler = Sampler(proc.pid, scenario["sample_interval"])
+            sampler.start()
+            records, elapsed = drive(port, scenario, concurrency, duration, texts)
+            samples = sampler.stop()
+            result = summarize(records, elapsed, samples, scenario["sample_interval"], scenario["batch_size"])
+            results.append({"scenario": scenario["name"], "server": scenario["server"],
+                            "route": scenario["route"], "concurrency": concurrency, **result})
+            print_row(results[-1])
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return results
+
+
+def fmt(value, spec: str) -> str:
+    return format(value, spec) if value is not None else "-"
+
+
+def print_header() -> None:
+    print(f"{'Scenario':<14} {'Conc':>4} {'Req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'Err %':>6} {'CPU avg':>8} {'CPU max':>8} {'RSS MB':>13}")
+    print("-" * 100)
+
+
+def print_row(r: dict) -> None:
+    print(f"{r['scenario']:<14} {r['concurrency']:>4} {r['throughput']:>8.1f} {fmt(r['p50_ms'], '8.2f'):>8} "
+          f"{fmt(r['p95_ms'], '8.2f'):>8} {fmt(r['p99_ms'], '8.2f'):>8} {r['error_rate'] * 100:>6.2f} "
+          f"{r['cpu_mean_percent']:>7.0f}% {r['cpu_max_percent']:>7.0f}% "
+          f"{r['rss_start_mb']:>6.1f}->{r['rss_max_mb']:<6.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test lokal app.py / api/index.py dari file skenario.")
+    parser.add_argument("--config", default=DEFAULT_CONFIG, help="File skenario JSON.")
+    parser.add_argument("--scenario", nargs="+", help="Hanya jalankan skenario dengan nama ini.")
+    parser.add_argument("--duration", type=float, default=None, help="Timpa durasi (detik) semua skenario.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="File JSON hasil (beserta timeline).")
+    args = parser.parse_args(argv)
+
+    scenarios = load_scenarios(args.config)
+    if args.scenario:
+        unknown = set(args.scenario) - {s["name"] for s in scenarios}
+        if unknown:
+            parser.error(f"Skenario tidak ada di {args.config}: {sorted(unknown)}")
+        scenarios = [s for s in scenarios if s["name"] in args.scenario]
+
+    print_header()
+    results = []
+    for scenario in scenarios:
+        results.extend(run_scenario(scenario, args.duration))
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "config": os.path.abspath(args.config),
+            "cpu_count": os.cpu_count(),
+            "results": results,
+        }, f, indent=2)
+    print(f"\nResults with per-interval timeline saved to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
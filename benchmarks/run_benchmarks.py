@@ -0,0 +1,382 @@
+"""
+Suite benchmark untuk seluruh tahap pipeline klasifikasi OJK.
+
+Tahap yang diukur, masing-masing dengan input sintetis dan (jika ada) input
+nyata dengan ukuran bertingkat:
+
+- extract_pdf: per halaman dan per file (butuh pdfplumber dan docs_POJK/)
+- clean_text, expand_synonyms
+- classify_department
+- TF-IDF transform dan NB predict_proba (Pipeline joblib dan model ringkas)
+- round trip POST / Flask melalui test client
+- train_model.train_and_evaluate (butuh output_pojk_classified.csv)
+
+Setiap kasus melaporkan throughput, latensi p50/p95/p99, dan peak memori
+alokasi Python (tracemalloc, diukur di putaran terpisah agar tidak
+mengganggu waktu). Hasil disimpan sebagai JSON sehingga dua run dapat
+dibandingkan:
+
+    python benchmarks/run_benchmarks.py                       # -> benchmarks/results/latest.json
+    python benchmarks/run_benchmarks.py --quick --stages clean_text expand_synonyms
+    python benchmarks/run_benchmarks.py --output after.json --compare before.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timezone
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+RESULTS_DIR = os.path.join(BASE_DIR, "benchmarks", "results")
+DOCS_DIR = os.path.join(BASE_DIR, "docs_POJK")
+RAW_CSV = os.path.join(BASE_DIR, "output_pojk.csv")
+LABELED_CSV = os.path.join(BASE_DIR, "output_pojk_classified.csv")
+
+SYNTHETIC_SIZES = [100, 1_000, 10_000, 100_000]
+
+COMPLAINT_WORDS = [
+    "saya", "mengajukan", "pengaduan", "terkait", "pinjol", "ilegal", "yang", "menagih",
+    "dengan", "kasar", "kartu", "kredit", "bank", "menolak", "klaim", "asuransi", "jiwa",
+    "reksadana", "saham", "leasing", "motor", "ditarik", "paksa", "bunga", "tinggi",
+    "e-wallet", "saldo", "hilang", "dana", "pensiun", "obligasi", "ipo", "kripto", "2024",
+    "Rp1.500.000,-", "tanggal", "12/03", "OJK", "tolong", "ditindaklanjuti",
+]
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Persentil dengan interpolasi linier (q dalam 0..100)."""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def measure(fn, *, min_samples: int, time_budget: float, max_samples: int = 10_000) -> list[float]:
+    """Jalankan fn berulang dan kembalikan daftar latensi (detik)."""
+    fn()  # warm-up
+    samples = []
+    deadline = time.perf_counter() + time_budget
+    while len(samples) < max_samples and (len(samples) < min_samples or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def peak_memory_kb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+class Suite:
+    def __init__(self, quick: bool):
+        self.quick = quick
+        self.min_samples = 3 if quick else 10
+        self.time_budget = 0.2 if quick else 1.0
+        self.results: list[dict] = []
+
+    def case(self, stage: str, input_name: str, fn, *, size: int, items: int = 1,
+             min_samples: int | None = None, time_budget: float | None = None) -> None:
+        """Ukur satu kasus; ``size`` = ukuran input (karakter/halaman), ``items`` = unit per panggilan."""
+        samples = measure(
+            fn,
+            min_samples=self.min_samples if min_samples is None else min_samples,
+            time_budget=self.time_budget if time_budget is None else time_budget,
+        )
+        peak_kb = peak_memory_kb(fn)
+        ordered = sorted(samples)
+        mean = sum(samples) / len(samples)
+        result = {
+            "stage": stage,
+            "input": input_name,
+            "size": size,
+            "samples": len(samples),
+            "mean_ms": mean * 1000,
+            "p50_ms": percentile(ordered, 50) * 1000,
+            "p95_ms": percentile(ordered, 95) * 1000,
+            "p99_ms": percentile(ordered, 99) * 1000,
+            "throughput_per_s": items / mean,
+            "size_per_s": size / mean,
+            "peak_mem_kb": peak_kb,
+        }
+        self.results.append(result)
+        print(
+            f"  {stage:<22} {input_name:<28} p50 {result['p50_ms']:>10.3f} ms"
+            f"  p99 {result['p99_ms']:>10.3f} ms  {result['throughput_per_s']:>10.1f}/s"
+            f"  peak {peak_kb:>9.1f} KB"
+        )
+
+
+def synthetic_text(n_chars: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    words = []
+    length = 0
+    while length < n_chars:
+        word = rng.choice(COMPLAINT_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:n_chars]
+
+
+def real_documents() -> list[dict]:
+    """Dokumen nyata dari output_pojk.csv (kecil, median, terbesar) jika tersedia."""
+    if not os.path.exists(RAW_CSV):
+        return []
+    from corpus_io import iter_documents
+
+    docs = sorted(
+        ({"filename": d["filename"], "content": d["content"]} for d in iter_documents(RAW_CSV) if d["content"]),
+        key=lambda d: len(d["content"]),
+    )
+    if not docs:
+        return []
+    return [docs[0], docs[len(docs) // 2], docs[-1]]
+
+
+def text_inputs(quick: bool) -> list[tuple[str, str]]:
+    sizes = SYNTHETIC_SIZES[:3] if quick else SYNTHETIC_SIZES
+    inputs = [(f"synthetic {n} chars", synthetic_text(n)) for n in sizes]
+    for doc in real_documents()[: 1 if quick else 3]:
+        inputs.append((f"real {len(doc['content'])} chars", doc["content"]))
+    return inputs
+
+
+def bench_extract(suite: Suite) -> None:
+    try:
+        import extract_pdf
+    except ImportError as e:
+        print(f"  skipped: {e}")
+        return
+    if not os.path.isdir(DOCS_DIR):
+        print(f"  skipped: '{DOCS_DIR}' not found")
+        return
+
+    pdfs = sorted(
+        (os.path.join(DOCS_DIR, f) for f in os.listdir(DOCS_DIR) if f.lower().endswith(".pdf")),
+        key=os.path.getsize,
+    )
+    chosen = pdfs[:1] if suite.quick else [pdfs[0], pdfs[len(pdfs) // 2]]
+    for path in chosen:
+        n_pages = extract_pdf.count_pages(path)
+        label = f"{os.path.basename(path)[:20]} ({n_pages}p)"
+
+        # Per halaman: latensi antar-yield dari iterator halaman
+        def per_page(path=path):
+            last = time.perf_counter()
+            latencies = []
+            for _ in extract_pdf.iter_pdf_pages(path):
+                now = time.perf_counter()
+                latencies.append(now - last)
+                last = now
+            return latencies
+
+        latencies = sorted(per_page())
+        mean = sum(latencies) / len(latencies)
+        suite.results.append({
+            "stage": "extract_pdf per page",
+            "input": label,
+            "size": 1,
+            "samples": len(latencies),
+            "mean_ms": mean * 1000,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "throughput_per_s": 1 / mean,
+            "size_per_s": 1 / mean,
+            "peak_mem_kb": None,
+        })
+        print(f"  {'extract_pdf per page':<22} {label:<28} p50 {latencies[len(latencies) // 2] * 1000:>10.3f} ms")
+
+        suite.case(
+            "extract_pdf per file", label,
+            lambda path=path: extract_pdf.extract_text_from_pdf(path),
+            size=n_pages, min_samples=1, time_budget=0,
+        )
+
+
+def bench_clean_text(suite: Suite) -> None:
+    from app import clean_text
+
+    for name, text in text_inputs(suite.quick):
+        suite.case("clean_text", name, lambda text=text: clean_text(text), size=len(text))
+
+
+def bench_expand_synonyms(suite: Suite) -> None:
+    from app import expand_synonyms
+
+    for name, text in text_inputs(suite.quick):
+        suite.case("expand_synonyms", name, lambda text=text: expand_synonyms(text), size=len(text))
+
+
+def bench_classify_department(suite: Suite) -> None:
+    from classify_department import classify_department
+
+    for name, text in text_inputs(suite.quick):
+        suite.case("classify_department", name, lambda text=text: classify_department(text), size=len(text))
+
+
+def bench_model(suite: Suite) -> None:
+    import joblib
+
+    from app import clean_text, expand_synonyms
+    from nb_inference import CompactNBModel
+
+    pipeline = joblib.load(os.path.join(BASE_DIR, "model_klasifikasi_ojk.joblib"))
+    tfidf = pipeline.named_steps["tfidf"]
+    clf = pipeline.named_steps["clf"]
+    compact = CompactNBModel.load(os.path.join(BASE_DIR, "model_klasifikasi_ojk_compact"))
+
+    for name, text in text_inputs(suite.quick):
+        cleaned = clean_text(expand_synonyms(text))
+        features = tfidf.transform([cleaned])
+        suite.case("tfidf transform", name, lambda c=cleaned: tfidf.transform([c]), size=len(text))
+        suite.case("nb predict_proba", name, lambda f=features: clf.predict_proba(f), size=len(text))
+        suite.case("compact predict_proba", name, lambda c=cleaned: compact.predict_proba([c]), size=len(text))
+
+    batch = [clean_text(expand_synonyms(synthetic_text(300, seed=i))) for i in range(64)]
+    suite.case("pipeline predict_proba", "batch 64 x 300 chars",
+               lambda: pipeline.predict_proba(batch), size=64 * 300, items=64)
+    suite.case("compact predict_proba", "batch 64 x 300 chars",
+               lambda: compact.predict_proba(batch), size=64 * 300, items=64)
+
+
+def bench_flask(suite: Suite) -> None:
+    import app
+
+    client = app.app.test_client()
+    # Jalur tanpa cache: kosongkan cache prediksi dan penjelasan lalu matikan penyimpanan
+    caches = (app.prediction_cache, app.explanation_cache)
+    saved = [cache.maxsize for cache in caches]
+    for cache in caches:
+        cache.clear()
+        cache.maxsize = 0
+    try:
+        for name, text in text_inputs(suite.quick):
+            suite.case("flask POST / (no cache)", name,
+                       lambda text=text: client.post("/", data={"complaint": text}), size=len(text))
+    finally:
+        for cache, maxsize in zip(caches, saved):
+            cache.maxsize = maxsize
+
+    text = synthetic_text(300)
+    client.post("/", data={"complaint": text})
+    suite.case("flask POST / (cached)", "synthetic 300 chars",
+               lambda: client.post("/", data={"complaint": text}), size=len(text))
+
+
+def bench_train(suite: Suite) -> None:
+    if not os.path.exists(LABELED_CSV):
+        print(f"  skipped: '{LABELED_CSV}' not found")
+        return
+    import train_model
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = train_model.load_data(LABELED_CSV)
+
+    def train():
+        with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            train_model.train_and_evaluate(df)
+
+    suite.case("train_and_evaluate", f"{len(df)} documents", train,
+               size=int(df["content"].str.len().sum()), min_samples=1 if suite.quick else 3, time_budget=0)
+
+
+STAGES = {
+    "extract_pdf": bench_extract,
+    "clean_text": bench_clean_text,
+    "expand_synonyms": bench_expand_synonyms,
+    "classify_department": bench_classify_department,
+    "model": bench_model,
+    "flask": bench_flask,
+    "train": bench_train,
+}
+
+
+def git_revision() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: list[dict], baseline_path: str, threshold: float) -> int:
+    """Bandingkan p50 dengan run sebelumnya; kembalikan jumlah regresi."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["stage"], r["input"]): r for r in json.load(f)["results"]}
+
+    print(f"\nComparison against '{baseline_path}' (regression threshold {threshold:.0%})")
+    print(f"{'Stage':<24} {'Input':<28} {'base p50':>10} {'now p50':>10} {'change':>8}")
+    print("-" * 84)
+    regressions = 0
+    for r in current:
+        base = baseline.get((r["stage"], r["input"]))
+        if base is None:
+            continue
+        change = r["p50_ms"] / base["p50_ms"] - 1 if base["p50_ms"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{r['stage']:<24} {r['input']:<28} {base['p50_ms']:>10.3f} {r['p50_ms']:>10.3f} {change:>+8.1%}{flag}")
+    print(f"\n{regressions} regression(s)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark seluruh tahap pipeline klasifikasi OJK.")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--quick", action="store_true", help="Input lebih sedikit dan waktu ukur lebih singkat.")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "latest.json"))
+    parser.add_argument("--compare", metavar="BASELINE_JSON", help="Hasil run sebelumnya untuk dibandingkan.")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Kenaikan p50 relatif yang dianggap regresi (default 0.10).")
+    args = parser.parse_args(argv)
+
+    suite = Suite(quick=args.quick)
+    for stage in args.stages:
+        print(f"[{stage}]")
+        STAGES[stage](suite)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "quick": args.quick,
+        },
+        "results": suite.results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to '{args.output}'")
+
+    if args.compare:
+        sys.exit(1 if compare(suite.results, args.compare, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
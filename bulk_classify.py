@@ -0,0 +1,255 @@
+"""
+Klasifikasi massal file pengaduan (CSV/JSONL) secara streaming.
+
+Input dibaca per chunk berukuran tetap; setiap chunk diproses worker
+dengan ``app.classify_batch`` (expand_synonyms, clean_text, satu
+predict_proba per chunk, dan keyword_override) lalu hasilnya ditulis
+berurutan ke CSV/JSONL. Chunk yang sedang diproses dibatasi
+``2 * workers``, sehingga memori tidak bergantung pada ukuran input.
+
+Setelah setiap chunk ditulis, file checkpoint (``<output>.checkpoint.json``)
+mencatat jumlah baris input yang selesai dan ukuran output. Dengan
+``--resume`` output dipotong ke ukuran tersebut (membuang chunk yang
+setengah tertulis) dan baris input yang sudah selesai dilewati.
+
+    python bulk_classify.py pengaduan.csv hasil.jsonl --text-field isi --id-field id
+    python bulk_classify.py pengaduan.csv hasil.jsonl --text-field isi --id-field id --resume
+"""
+
+import argparse
+import collections
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from corpus_io import DocumentWriter, iter_records
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_TOP_K = 3
+# Interval (detik) laporan progress
+PROGRESS_INTERVAL = 5.0
+
+
+def _load_app():
+    # Job batch memakai satu versi model dari awal sampai akhir
+    os.environ.setdefault("OJK_MODEL_RELOAD_INTERVAL", "0")
+    import app
+    return app
+
+
+def classify_chunk(texts: list[str], top_k: int) -> list[dict]:
+    """Klasifikasikan satu chunk teks (dijalankan di worker atau proses utama).
+
+    Baris dengan teks kosong tidak dikirim ke model (hasilnya hanya prior
+    kelas); hasilnya berlabel kosong dengan field ``error``, sama seperti
+    form yang menolak input kosong.
+    """
+    positions = [i for i, text in enumerate(texts) if text.strip()]
+    classified = _load_app().classify_batch([texts[i] for i in positions], top_k) if positions else []
+    results = [
+        {"label": "", "model_label": "", "confidence": None, "keyword_override": False, "top_k": [],
+         "error": "teks kosong"}
+        for _ in texts
+    ]
+    for i, result in zip(positions, classified):
+        results[i] = result
+    return results
+
+
+def iter_chunks(records, text_field: str, id_field: str | None, chunk_size: int, start: int = 0):
+    """Kelompokkan baris input menjadi (nomor baris pertama, id, teks) per chunk."""
+    row = start
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            return
+        ids = [record.get(id_field, "") for record in chunk] if id_field else None
+        texts = [str(record.get(text_field) or "") for record in chunk]
+        yield row, ids, texts
+        row += len(chunk)
+
+
+def checkpoint_path(output_path: str) -> str:
+    return f"{output_path}.checkpoint.json"
+
+
+def load_checkpoint(path: str) -> dict | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_checkpoint(path: str, state: dict) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+class Progress:
+    """Cetak baris terproses dan throughput ke stderr paling sering setiap ``interval`` detik."""
+
+    def __init__(self, start_rows: int = 0, interval: float = PROGRESS_INTERVAL):
+        self.rows = start_rows
+        self.new_rows = 0
+        self.interval = interval
+        self.started = time.perf_counter()
+        self._last = self.started
+
+    def update(self, rows: int, force: bool = False) -> None:
+        self.rows += rows
+        self.new_rows += rows
+        now = time.perf_counter()
+        if force or now - self._last >= self.interval:
+            self._last = now
+            print(f"  {self.rows:>12,} rows  {self.rate():>10,.0f} rows/s  {now - self.started:>8.1f}s",
+                  file=sys.stderr)
+
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.new_rows / elapsed if elapsed else 0.0
+
+
+def run(
+    input_path: str,
+    output_path: str,
+    text_field: str,
+    id_field: str | None = None,
+    top_k: int = DEFAULT_TOP_K,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    resume: bool = False,
+) -> dict:
+    """Klasifikasikan ``input_path`` ke ``output_path``; mengembalikan ringkasan job."""
+    app = _load_app()
+    ckpt_path = checkpoint_path(output_path)
+    state = load_checkpoint(ckpt_path) if resume else None
+    if state is not None:
+        if state["input"] != os.path.abspath(input_path):
+            raise SystemExit(f"Checkpoint {ckpt_path} belongs to input '{state['input']}'")
+        if state["model_version"] != app.model_info.get("version"):
+            print(f"Warning: checkpoint was written with model version {state['model_version']}, "
+                  f"now {app.model_info.get('version')}", file=sys.stderr)
+        with open(output_path, "r+b") as f:
+            f.truncate(state["output_bytes"])
+        print(f"Resuming after {state['rows_done']:,} rows")
+    else:
+        state = {
+            "input": os.path.abspath(input_path),
+            "model_version": app.model_info.get("version"),
+            "rows_done": 0,
+            "output_bytes": 0,
+            "complete": False,
+        }
+    if state["complete"]:
+        print(f"Nothing to do: '{output_path}' is complete ({state['rows_done']:,} rows)")
+        return {"rows": 0, "rate": 0.0, "labels": {}, "empty": 0}
+
+    fieldnames = ["row"] + ([id_field] if id_field else []) + [
+        "label", "model_label", "confidence", "keyword_override", "top_k", "error",
+    ]
+    # Kolom yang salah ketik akan menghasilkan teks kosong untuk setiap baris;
+    # cek baris pertama (untuk CSV sama dengan header) sebelum output dibuka.
+    first = next(iter_records(input_path), None)
+    if first is not None:
+        missing = [field for field in (text_field, id_field) if field and field not in first]
+        if missing:
+            raise SystemExit(
+                f"Field {', '.join(map(repr, missing))} not found in '{input_path}' "
+                f"(available: {', '.join(first)})"
+            )
+    records = itertools.islice(iter_records(input_path), state["rows_done"], None)
+    chunks = iter_chunks(records, text_field, id_field, chunk_size, start=state["rows_done"])
+    progress = Progress(state["rows_done"])
+    labels = collections.Counter()
+    empty = 0
+
+    def write(writer, row, ids, results):
+        nonlocal empty
+        for offset, result in enumerate(results):
+            record = {
+                "row": row + offset,
+                "label": result["label"],
+                "model_label": result["model_label"],
+                "confidence": result["confidence"],
+                "keyword_override": result["keyword_override"],
+                # CSV menyimpan top-k sebagai string JSON
+                "top_k": result["top_k"] if writer.jsonl else json.dumps(result["top_k"], ensure_ascii=False),
+            }
+            if id_field:
+                record[id_field] = ids[offset]
+            if "error" in result:
+                record["error"] = result["error"]
+                empty += 1
+            else:
+                labels[result["label"]] += 1
+            writer.write(record)
+        state["rows_done"] = row + len(results)
+        state["output_bytes"] = writer.flush()
+        save_checkpoint(ckpt_path, state)
+        progress.update(len(results))
+
+    with DocumentWriter(output_path, fieldnames, append=state["rows_done"] > 0) as writer:
+        try:
+            if workers <= 1:
+                for row, ids, texts in chunks:
+                    write(writer, row, ids, classify_chunk(texts, top_k))
+            else:
+                # Pool di-fork setelah model dimuat, sehingga worker berbagi halaman model
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    pending = collections.deque()
+                    for row, ids, texts in chunks:
+                        pending.append((row, ids, executor.submit(classify_chunk, texts, top_k)))
+                        if len(pending) >= 2 * workers:
+                            row, ids, future = pending.popleft()
+                            write(writer, row, ids, future.result())
+                    while pending:
+                        row, ids, future = pending.popleft()
+                        write(writer, row, ids, future.result())
+        except KeyboardInterrupt:
+            print(f"\nInterrupted after {state['rows_done']:,} rows; rerun with --resume to continue",
+                  file=sys.stderr)
+            raise SystemExit(130)
+
+    state["complete"] = True
+    save_checkpoint(ckpt_path, state)
+    progress.update(0, force=True)
+    return {"rows": progress.new_rows, "rate": progress.rate(), "labels": dict(labels), "empty": empty}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Klasifikasi massal file pengaduan CSV/JSONL secara streaming.")
+    parser.add_argument("input", help="File input (.csv atau .jsonl), satu pengaduan per baris.")
+    parser.add_argument("output", help="File hasil (.csv atau .jsonl).")
+    parser.add_argument("--text-field", default="text", help="Kolom/field teks pengaduan (default: text).")
+    parser.add_argument("--id-field", default=None, help="Kolom/field ID yang disalin ke output.")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="Jumlah departemen teratas per baris.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Jumlah baris per chunk.")
+    parser.add_argument("--workers", type=int, default=0, help="Jumlah proses worker (0 = semua core).")
+    parser.add_argument("--resume", action="store_true", help="Lanjutkan dari checkpoint output.")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1 or args.top_k < 1:
+        parser.error("--chunk-size dan --top-k harus >= 1")
+
+    workers = args.workers or os.cpu_count() or 1
+    print(f"Classifying '{args.input}' -> '{args.output}' "
+          f"(chunk size {args.chunk_size}, {workers} worker{'s' if workers > 1 else ''})")
+    summary = run(
+        args.input, args.output, args.text_field, args.id_field,
+        top_k=args.top_k, chunk_size=args.chunk_size, workers=workers, resume=args.resume,
+    )
+    if summary["rows"]:
+        print(f"\nDone! {summary['rows']:,} rows at {summary['rate']:,.0f} rows/s -> '{args.output}'")
+        for label, count in sorted(summary["labels"].items(), key=lambda item: -item[1]):
+            print(f"  {label:<20} {count:>10,}")
+        if summary["empty"]:
+            print(f"  {'(empty text)':<20} {summary['empty']:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,173 @@
-import csv
+import argparse
 import os
 import re
-import sys
 
-csv.field_size_limit(sys.maxsize)
+from corpus_io import DocumentWriter, iter_documents
+
+
+# Kata kunci per departemen, urut dari yang paling spesifik
+DEPARTMENT_KEYWORDS: dict[str, list[str]] = {
+    "ITSK": [
+        "inovasi teknologi sektor keuangan",
+        "aset keuangan digital", "aset kripto",
+        "fintech", "sandbox regulatori", "sandbox",
+        "regulatory sandbox",
+        "teknologi finansial", "agregasi jasa keuangan",
+        "urun dana", "layanan urun dana",
+        "penyelenggara sistem elektronik",
+        "penyelenggara inovasi",
+        "aset digital",
+        "perdagangan aset keuangan digital",
+        "penilaian kemampuan dan kepatutan",
+    ],
+    "PPEP": [
+        "pelindungan konsumen", "perlindungan konsumen",
+        "edukasi keuangan", "literasi keuangan",
+        "perilaku pelaku usaha", "inklusi keuangan",
+        "pengaduan konsumen", "penanganan pengaduan",
+        "satuan tugas penanganan",
+        "usaha tanpa izin",
+        "pungutan di sektor jasa keuangan",
+        "profesi penunjang",
+    ],
+    "Perasuransian": [
+        "perusahaan perasuransian",
+        "perasuransian",
+        "asuransi jiwa", "asuransi umum", "asuransi syariah",
+        "produk asuransi", "reasuransi",
+        "dana pensiun", "program pensiun",
+        "lembaga penjamin", "penjaminan",
+    ],
+    "Lembaga Pembiayaan": [
+        "lembaga pembiayaan",
+        "perusahaan pembiayaan", "pembiayaan syariah",
+        "modal ventura", "perusahaan modal ventura",
+        "lembaga keuangan mikro",
+        "sarana multi infrastruktur",
+        "konglomerasi keuangan", "perusahaan induk",
+        "kemudahan akses pembiayaan",
+        "usaha mikro kecil", "umkm",
+    ],
+    "Pasar Modal": [
+        "pasar modal",
+        "efek bersifat ekuitas", "efek bersifat utang",
+        "perusahaan efek", "penjamin emisi efek",
+        "perantara pedagang efek",
+        "reksa dana", "reksadana", "manajer investasi",
+        "emiten", "perusahaan terbuka",
+        "obligasi daerah", "sukuk daerah",
+        "efek syariah", "daftar efek syariah",
+        "bursa karbon", "derivatif keuangan",
+        "kustodian", "agen penjual efek",
+        "rapat umum pemegang saham",
+        "laporan kepemilikan",
+        "penyedia likuiditas",
+        "dematerialisasi efek",
+    ],
+    "Perbankan": [
+        "bank umum", "bank perekonomian rakyat",
+        "bank syariah", "unit usaha syariah",
+        "bpr", "bprs",
+        "perbankan",
+        "suku bunga dasar kredit",
+        "rasio kecukupan likuiditas", "liquidity coverage",
+        "rasio pendanaan stabil", "net stable funding",
+        "rasio pengungkit",
+        "rahasia bank",
+        "laporan bank", "integritas pelaporan keuangan bank",
+        "slik", "sistem layanan informasi keuangan",
+        "kualitas aset bank",
+        "tata kelola bagi bpr",
+        "perluasan kegiatan usaha perbankan",
+        "anti fraud",
+        "transparansi dan publikasi",
+        "status pengawasan",
+    ],
+}
+
+
+def _trie_pattern(keywords: list[str]) -> str:
+    """Susun regex trie dari daftar keyword; cocok dengan keyword terpanjang."""
+    root: dict = {}
+    for kw in keywords:
+        node = root
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Greedy: coba lanjutkan ke keyword yang lebih panjang lebih dulu
+            pattern = "(?:" + pattern + ")?"
+        return pattern
+
+    return build(root)
+
+
+class KeywordScanner:
+    """Pemindai multi-keyword yang menghitung seluruh keyword dalam satu lintasan.
+
+    Semantik hitungan sama dengan ``len(re.findall(re.escape(kw), text))``
+    untuk setiap keyword: kemunculan substring tanpa batas kata, tidak saling
+    tumpang tindih untuk keyword yang sama, tetapi keyword berbeda dihitung
+    secara independen (mis. "bpr" tetap terhitung di dalam "bprs").
+
+    Seluruh keyword digabung menjadi satu regex berbentuk trie. Di setiap
+    posisi regex menangkap keyword terpanjang yang dimulai di sana; keyword lain
+    yang dimulai di posisi yang sama pasti merupakan prefiks keyword
+    tersebut, sehingga daftar prefiks cukup dihitung sekali saat inisialisasi.
+    """
+
+    def __init__(self, departments: dict[str, list[str]]):
+        self.departments = departments
+        self.keywords = list(dict.fromkeys(kw for kws in departments.values() for kw in kws))
+        self.weights = {kw: len(kw.split()) for kw in self.keywords}
+
+        self._prefixes = {
+            kw: [other for other in self.keywords if kw.startswith(other)]
+            for kw in self.keywords
+        }
+
+        self.pattern = re.compile(_trie_pattern(self.keywords))
+
+    def count_hits(self, text_lower: str) -> dict[str, int]:
+        """Jumlah kemunculan setiap keyword pada teks (sudah lowercase)."""
+        hits = dict.fromkeys(self.keywords, 0)
+        next_free = dict.fromkeys(self.keywords, 0)
+        search = self.pattern.search
+        match = search(text_lower)
+        while match:
+            pos = match.start()
+            for kw in self._prefixes[match.group()]:
+                if pos >= next_free[kw]:
+                    hits[kw] += 1
+                    next_free[kw] = pos + len(kw)
+            match = search(text_lower, pos + 1)
+        return hits
+
+    def score(self, hits: dict[str, int]) -> dict[str, int]:
+        """Skor per departemen: jumlah kemunculan x jumlah kata frasa."""
+        return {
+            dept: sum(hits[kw] * self.weights[kw] for kw in keywords)
+            for dept, keywords in self.departments.items()
+        }
+
+
+_SCANNER = KeywordScanner(DEPARTMENT_KEYWORDS)
+
+
+def keyword_hits(text: str) -> dict[str, int]:
+    """Jumlah kemunculan mentah setiap keyword departemen pada teks."""
+    return _SCANNER.count_hits(text.lower())
+
+
+def department_scores(text: str) -> dict[str, int]:
+    """Skor keyword berbobot untuk setiap departemen."""
+    return _SCANNER.score(keyword_hits(text))
 
 
 def classify_department(text: str) -> str:
@@ -18,97 +182,7 @@ def classify_department(text: str) -> str:
     - Bidang 8: Pengawas Perilaku Pelaku Usaha Jasa Keuangan, Edukasi,
                 dan Pelindungan Konsumen (PPEP)
     """
-    text_lower = text.lower()
-
-    # Kata kunci per departemen, urut dari yang paling spesifik
-    departments = {
-        "ITSK": [
-            "inovasi teknologi sektor keuangan",
-            "aset keuangan digital", "aset kripto",
-            "fintech", "sandbox regulatori", "sandbox",
-            "regulatory sandbox",
-            "teknologi finansial", "agregasi jasa keuangan",
-            "urun dana", "layanan urun dana",
-            "penyelenggara sistem elektronik",
-            "penyelenggara inovasi",
-            "aset digital",
-            "perdagangan aset keuangan digital",
-            "penilaian kemampuan dan kepatutan",
-        ],
-        "PPEP": [
-            "pelindungan konsumen", "perlindungan konsumen",
-            "edukasi keuangan", "literasi keuangan",
-            "perilaku pelaku usaha", "inklusi keuangan",
-            "pengaduan konsumen", "penanganan pengaduan",
-            "satuan tugas penanganan",
-            "usaha tanpa izin",
-            "pungutan di sektor jasa keuangan",
-            "profesi penunjang",
-        ],
-        "Perasuransian": [
-            "perusahaan perasuransian",
-            "perasuransian",
-            "asuransi jiwa", "asuransi umum", "asuransi syariah",
-            "produk asuransi", "reasuransi",
-            "dana pensiun", "program pensiun",
-            "lembaga penjamin", "penjaminan",
-        ],
-        "Lembaga Pembiayaan": [
-            "lembaga pembiayaan",
-            "perusahaan pembiayaan", "pembiayaan syariah",
-            "modal ventura", "perusahaan modal ventura",
-            "lembaga keuangan mikro",
-            "sarana multi infrastruktur",
-            "konglomerasi keuangan", "perusahaan induk",
-            "kemudahan akses pembiayaan",
-            "usaha mikro kecil", "umkm",
-        ],
-        "Pasar Modal": [
-            "pasar modal",
-            "efek bersifat ekuitas", "efek bersifat utang",
-            "perusahaan efek", "penjamin emisi efek",
-            "perantara pedagang efek",
-            "reksa dana", "reksadana", "manajer investasi",
-            "emiten", "perusahaan terbuka",
-            "obligasi daerah", "sukuk daerah",
-            "efek syariah", "daftar efek syariah",
-            "bursa karbon", "derivatif keuangan",
-            "kustodian", "agen penjual efek",
-            "rapat umum pemegang saham",
-            "laporan kepemilikan",
-            "penyedia likuiditas",
-            "dematerialisasi efek",
-        ],
-        "Perbankan": [
-            "bank umum", "bank perekonomian rakyat",
-            "bank syariah", "unit usaha syariah",
-            "bpr", "bprs",
-            "perbankan",
-            "suku bunga dasar kredit",
-            "rasio kecukupan likuiditas", "liquidity coverage",
-            "rasio pendanaan stabil", "net stable funding",
-            "rasio pengungkit",
-            "rahasia bank",
-            "laporan bank", "integritas pelaporan keuangan bank",
-            "slik", "sistem layanan informasi keuangan",
-            "kualitas aset bank",
-            "tata kelola bagi bpr",
-            "perluasan kegiatan usaha perbankan",
-            "anti fraud",
-            "transparansi dan publikasi",
-            "status pengawasan",
-        ],
-    }
-
-    # Hitung kemunculan keyword per departemen (frasa panjang diberi bobot lebih)
-    scores: dict[str, int] = {}
-    for dept, keywords in departments.items():
-        count = 0
-        for kw in keywords:
-            matches = len(re.findall(re.escape(kw), text_lower))
-            word_count = len(kw.split())
-            count += matches * word_count
-        scores[dept] = count
+    scores = department_scores(text)
 
     # Departemen dengan skor tertinggi
     best_dept = max(scores, key=scores.get)  # type: ignore[arg-type]
@@ -117,32 +191,34 @@ def classify_department(text: str) -> str:
     return best_dept
 
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pelabelan departemen berbasis keyword.")
+    parser.add_argument(
+        "--format", choices=["csv", "jsonl"], default="csv",
+        help="Format input/output: output_pojk.<format> -> output_pojk_classified.<format>.",
+    )
+    args = parser.parse_args(argv)
+
     base_dir = os.path.dirname(os.path.abspath(__file__))
-    input_csv = os.path.join(base_dir, "output_pojk.csv")
-    output_csv = os.path.join(base_dir, "output_pojk_classified.csv")
+    input_path = os.path.join(base_dir, f"output_pojk.{args.format}")
+    output_path = os.path.join(base_dir, f"output_pojk_classified.{args.format}")
 
-    rows = []
-    with open(input_csv, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
+    # Dokumen dibaca dan ditulis satu per satu; hanya label yang disimpan
+    # untuk ringkasan di akhir.
+    labels: list[tuple[str, str]] = []
+    with DocumentWriter(output_path, ["filename", "content", "department"]) as writer:
+        for row in iter_documents(input_path):
             dept = classify_department(row["content"])
             row["department"] = dept
-            rows.append(row)
-
-    # Tulis output dengan kolom 'department'
-    with open(output_csv, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["filename", "content", "department"])
-        writer.writeheader()
-        writer.writerows(rows)
+            writer.write(row)
+            labels.append((row["filename"], dept))
 
     # Ringkasan
-    print(f"Classified {len(rows)} regulations -> '{output_csv}'\n")
+    print(f"Classified {len(labels)} regulations -> '{output_path}'\n")
     print(f"{'Department':<25} {'Count':>5}")
     print("-" * 32)
     dept_counts: dict[str, int] = {}
-    for row in rows:
-        d = row["department"]
+    for _, d in labels:
         dept_counts[d] = dept_counts.get(d, 0) + 1
     for dept, count in sorted(dept_counts.items(), key=lambda x: -x[1]):
         print(f"{dept:<25} {count:>5}")
@@ -150,8 +226,8 @@ def main():
     # Klasifikasi per file
     print(f"\n{'No':<4} {'Filename':<75} {'Department'}")
     print("-" * 100)
-    for i, row in enumerate(rows, 1):
-        print(f"{i:<4} {row['filename']:<75} {row['department']}")
+    for i, (filename, dept) in enumerate(labels, 1):
+        print(f"{i:<4} {filename:<75} {dept}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+"""
+Baca/tulis korpus peraturan dalam format CSV atau JSONL.
+
+Format JSONL ditulis secara streaming oleh ``extract_pdf.py --format jsonl``:
+satu baris per halaman (atau per dokumen untuk file turunan seperti hasil
+pelabelan), berurutan per dokumen. Setiap baris memuat ``filename`` dan
+``content``; baris halaman juga memuat ``page``, dan baris dengan ``error``
+menandakan ekstraksi dokumen tersebut gagal sehingga kontennya kosong.
+
+``iter_documents`` membaca kedua format secara lazy, satu dokumen per
+iterasi, sehingga pemakaian memori dibatasi oleh dokumen terbesar.
+"""
+
+import csv
+import json
+import os
+import sys
+from collections.abc import Iterator
+
+csv.field_size_limit(sys.maxsize)
+
+# Kolom yang hanya bermakna per halaman dan tidak diteruskan ke dokumen
+_PART_FIELDS = ("page", "content", "error")
+
+
+def _iter_jsonl_documents(path: str) -> Iterator[dict]:
+    doc: dict | None = None
+    parts: list[str] = []
+    failed = False
+
+    def finish() -> dict:
+        record = dict(doc)
+        record["content"] = "" if failed else " ".join(parts)
+        return record
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if doc is not None and record["filename"] != doc["filename"]:
+                yield finish()
+                doc = None
+            if doc is None:
+                doc = {k: v for k, v in record.items() if k not in _PART_FIELDS}
+                parts = []
+                failed = False
+            if record.get("error"):
+                failed = True
+            elif record.get("content"):
+                parts.append(record["content"])
+    if doc is not None:
+        yield finish()
+
+
+def iter_documents(path: str) -> Iterator[dict]:
+    """Iterasi dokumen (dict dengan minimal ``filename`` dan ``content``) dari CSV/JSONL."""
+    if path.endswith(".jsonl"):
+        yield from _iter_jsonl_documents(path)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    """Iterasi baris CSV/JSONL apa adanya, tanpa menggabungkan halaman per ``filename``.
+
+    Untuk file yang setiap barisnya berdiri sendiri (misalnya data pengaduan).
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if not path.endswith(".jsonl"):
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class DocumentWriter:
+    """Tulis dokumen satu per satu ke CSV atau JSONL sesuai ekstensi file.
+
+    Dengan ``append=True`` dokumen ditambahkan ke akhir file yang sudah ada;
+    header CSV hanya ditulis jika file masih kosong.
+    """
+
+    def __init__(self, path: str, fieldnames: list[str], append: bool = False):
+        self.path = path
+        self.fieldnames = fieldnames
+        self.jsonl = path.endswith(".jsonl")
+        mode = "a" if append else "w"
+        if self.jsonl:
+            self._file = open(path, mode, encoding="utf-8")
+        else:
+            self._file = open(path, mode, newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+            if self._file.tell() == 0:
+                self._writer.writeheader()
+
+    def write(self, record: dict) -> None:
+        if self.jsonl:
+            row = {k: record[k] for k in self.fieldnames if k in record}
+            self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        else:
+            self._writer.writerow({k: record.get(k, "") for k in self.fieldnames})
+
+    def flush(self) -> int:
+        """Tulis buffer ke disk (fsync) dan kembalikan ukuran file dalam byte."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,7 +1,161 @@
 import os
 import re
-import csv
-import pdfplumber
+import io
+import argparse
+import contextlib
+import hashlib
+import sqlite3
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from importlib import metadata
+
+from corpus_io import DocumentWriter
+
+# PDF dengan jumlah halaman di atas ini dipecah menjadi beberapa rentang
+# halaman yang diekstrak oleh worker berbeda.
+DEFAULT_PAGES_PER_TASK = 50
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(BASE_DIR, ".extract_cache.sqlite")
+
+
+class PdfBackend(ABC):
+    """Antarmuka backend ekstraksi: jumlah halaman dan teks mentah per halaman.
+
+    ``source`` berupa path atau file object biner (misalnya stream upload).
+    Library backend di-import saat dipakai sehingga modul ini tetap bisa
+    di-import tanpa library tersebut; ImportError baru muncul saat ekstraksi.
+    """
+
+    name = ""
+    # Paket yang versinya ikut menjadi kunci cache ekstraksi
+    package = ""
+    # Naikkan revisi ini setiap kali logika ekstraksi backend berubah agar
+    # entri cache lama tidak dipakai lagi.
+    revision = 1
+
+    @property
+    def version(self) -> str:
+        return f"{self.name}-{metadata.version(self.package)}/{self.revision}"
+
+    @abstractmethod
+    def count_pages(self, source) -> int:
+        """Jumlah halaman dokumen."""
+
+    @abstractmethod
+    def iter_pages(self, source, start: int = 0, stop: int | None = None) -> Iterator[str]:
+        """Iterasi teks halaman ``start`` sampai ``stop`` (indeks 0, stop eksklusif)."""
+
+
+class PdfplumberBackend(PdfBackend):
+    """Analisis layout penuh pdfplumber (``page.extract_text()``); paling lambat."""
+
+    name = "pdfplumber"
+    package = "pdfplumber"
+
+    def count_pages(self, source) -> int:
+        import pdfplumber
+
+        with pdfplumber.open(source) as pdf:
+            return len(pdf.pages)
+
+    def iter_pages(self, source, start: int = 0, stop: int | None = None) -> Iterator[str]:
+        import pdfplumber
+
+        with pdfplumber.open(source) as pdf:
+            for page in pdf.pages[start:stop]:
+                text = page.extract_text()
+                # Cache layout halaman dilepas agar memori tidak tumbuh per halaman
+                page.close()
+                yield text
+
+
+class PdfminerBackend(PdfBackend):
+    """Karakter mentah pdfminer.six tanpa analisis layout (``laparams=None``)."""
+
+    name = "pdfminer"
+    package = "pdfminer.six"
+
+    def count_pages(self, source) -> int:
+        from pdfminer.pdfpage import PDFPage
+
+        with self._open(source) as fp:
+            return sum(1 for _ in PDFPage.get_pages(fp))
+
+    def iter_pages(self, source, start: int = 0, stop: int | None = None) -> Iterator[str]:
+        from pdfminer.converter import TextConverter
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+
+        resources = PDFResourceManager(caching=True)
+        with self._open(source) as fp:
+            for index, page in enumerate(PDFPage.get_pages(fp)):
+                if index < start:
+                    continue
+                if stop is not None and index >= stop:
+                    break
+                buffer = io.StringIO()
+                device = TextConverter(resources, buffer, laparams=None)
+                PDFPageInterpreter(resources, device).process_page(page)
+                device.close()
+                yield buffer.getvalue()
+
+    @staticmethod
+    def _open(source):
+        if isinstance(source, (str, os.PathLike)):
+            return open(source, "rb")
+        # File object milik pemanggil tidak ditutup
+        return contextlib.nullcontext(source)
+
+
+class Pypdfium2Backend(PdfBackend):
+    """Teks per halaman dari PDFium (C++) lewat pypdfium2; tanpa analisis layout."""
+
+    name = "pypdfium2"
+    package = "pypdfium2"
+
+    def count_pages(self, source) -> int:
+        import pypdfium2
+
+        pdf = pypdfium2.PdfDocument(source)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def iter_pages(self, source, start: int = 0, stop: int | None = None) -> Iterator[str]:
+        import pypdfium2
+
+        pdf = pypdfium2.PdfDocument(source)
+        try:
+            for index in range(start, len(pdf) if stop is None else min(stop, len(pdf))):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                try:
+                    yield textpage.get_text_range()
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            pdf.close()
+
+
+BACKENDS: dict[str, type[PdfBackend]] = {
+    backend.name: backend for backend in (PdfplumberBackend, PdfminerBackend, Pypdfium2Backend)
+}
+# Backend default untuk CLI, training, dan upload PDF di app.py / api/index.py
+DEFAULT_BACKEND = os.environ.get("OJK_PDF_BACKEND", "pdfplumber")
+
+
+def get_backend(backend: str | PdfBackend | None = None) -> PdfBackend:
+    """Instance backend dari nama (None = ``DEFAULT_BACKEND``)."""
+    if isinstance(backend, PdfBackend):
+        return backend
+    name = backend or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{name}' (choose from: {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
 
 
 def clean_text(text: str) -> str:
@@ -15,45 +169,388 @@ def clean_text(text: str) -> str:
     return text.strip()
 
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """Ekstrak seluruh teks dari file PDF menggunakan pdfplumber."""
-    full_text = []
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                full_text.append(page_text)
-    return "\n".join(full_text)
+def iter_pdf_pages(
+    pdf_path: str, page_range: tuple[int, int] | None = None, backend: str | PdfBackend | None = None,
+) -> Iterator[tuple[int, str]]:
+    """Iterasi (nomor halaman, teks) dari file PDF; halaman kosong dilewati."""
+    start, stop = page_range if page_range else (0, None)
+    pages = get_backend(backend).iter_pages(pdf_path, start, stop)
+    try:
+        for page_no, page_text in enumerate(pages, start=start + 1):
+            if page_text and not page_text.isspace():
+                yield page_no, page_text
+    finally:
+        pages.close()
 
 
-def main():
-    input_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "docs_POJK")
-    output_csv = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output_pojk.csv")
+def extract_pages(
+    pdf_path: str, page_range: tuple[int, int] | None = None, backend: str | PdfBackend | None = None,
+) -> list[tuple[int, str]]:
+    """Daftar (nomor halaman, teks) untuk seluruh halaman atau satu rentang halaman."""
+    return list(iter_pdf_pages(pdf_path, page_range, backend))
+
+
+def extract_text_from_pdf(
+    pdf_path: str, page_range: tuple[int, int] | None = None, backend: str | PdfBackend | None = None,
+) -> str:
+    """Ekstrak seluruh teks dari file PDF dengan backend terpilih (default pdfplumber).
+
+    Jika ``page_range`` diberikan (start, stop), hanya halaman dalam rentang
+    tersebut (indeks 0, stop eksklusif) yang diekstrak.
+    """
+    return "\n".join(text for _, text in iter_pdf_pages(pdf_path, page_range, backend))
+
+
+def count_pages(pdf_path: str, backend: str | PdfBackend | None = None) -> int:
+    """Jumlah halaman pada file PDF."""
+    return get_backend(backend).count_pages(pdf_path)
+
+
+def extract_head(
+    pdf_path: str, pages_per_task: int, backend: str | PdfBackend | None = None,
+) -> tuple[list[tuple[int, str]], int]:
+    """Halaman rentang pertama ``[0, pages_per_task)`` beserta jumlah halaman dokumen.
+
+    Dijalankan di worker sebagai task pertama setiap file. Jumlah halaman
+    hanya dihitung terpisah jika rentang pertama penuh, sehingga PDF yang
+    muat dalam satu rentang cukup dibuka sekali.
+    """
+    extractor = get_backend(backend)
+    pages = []
+    seen = 0
+    for seen, page_text in enumerate(extractor.iter_pages(pdf_path, 0, pages_per_task), start=1):
+        if page_text and not page_text.isspace():
+            pages.append((seen, page_text))
+    n_pages = seen if seen < pages_per_task else extractor.count_pages(pdf_path)
+    return pages, n_pages
 
-    pdf_files = sorted(
-        [f for f in os.listdir(input_folder) if f.lower().endswith(".pdf")]
-    )
 
-    print(f"Found {len(pdf_files)} PDF file(s) in '{input_folder}'")
+def plan_page_ranges(n_pages: int, pages_per_task: int) -> list[tuple[int, int] | None]:
+    """Pecah dokumen menjadi rentang halaman; None berarti satu file utuh."""
+    if n_pages <= pages_per_task:
+        return [None]
+    return [
+        (start, min(start + pages_per_task, n_pages))
+        for start in range(0, n_pages, pages_per_task)
+    ]
 
-    rows = []
-    for i, filename in enumerate(pdf_files, start=1):
-        pdf_path = os.path.join(input_folder, filename)
-        print(f"[{i}/{len(pdf_files)}] Processing: {filename}")
+
+def extract_files_parallel(
+    pdf_paths: list[str],
+    workers: int,
+    pages_per_task: int = DEFAULT_PAGES_PER_TASK,
+    backend: str | PdfBackend | None = None,
+) -> list[list[tuple[int, str]] | None]:
+    """Ekstrak banyak PDF dengan process pool, dipecah per file dan rentang halaman.
+
+    Task pertama setiap file (``extract_head``) mengekstrak rentang pertama
+    dan menghitung halaman di worker; sisa rentang PDF besar baru dijadwalkan
+    setelah task tersebut selesai. Mengembalikan daftar (nomor halaman, teks)
+    per file dengan urutan sama seperti ``pdf_paths``; file yang gagal
+    diekstrak bernilai None. Progress dicetak setiap kali seluruh bagian
+    sebuah file selesai.
+    """
+    results: list[list[tuple[int, str]] | None] = [None] * len(pdf_paths)
+    parts: list[list[list[tuple[int, str]]]] = [[[]] for _ in pdf_paths]
+    failed = [False] * len(pdf_paths)
+    remaining = [1] * len(pdf_paths)
+    done = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(extract_head, pdf_path, pages_per_task, backend): (idx, 0)
+            for idx, pdf_path in enumerate(pdf_paths)
+        }
+        while futures:
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                idx, part_idx = futures.pop(future)
+                filename = os.path.basename(pdf_paths[idx])
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if not failed[idx]:
+                        print(f"  Error processing {filename}: {e}")
+                    failed[idx] = True
+                else:
+                    if part_idx == 0:
+                        pages, n_pages = result
+                        ranges = plan_page_ranges(n_pages, pages_per_task)[1:]
+                        parts[idx] = [pages] + [[] for _ in ranges]
+                        remaining[idx] += len(ranges)
+                        for next_idx, page_range in enumerate(ranges, start=1):
+                            next_future = executor.submit(extract_pages, pdf_paths[idx], page_range, backend)
+                            futures[next_future] = (idx, next_idx)
+                    else:
+                        parts[idx][part_idx] = result
+
+                remaining[idx] -= 1
+                if remaining[idx] == 0:
+                    done += 1
+                    print(f"[{done}/{len(pdf_paths)}] Processed: {filename}")
+                    if not failed[idx]:
+                        results[idx] = [page for part in parts[idx] for page in part]
+                    parts[idx] = []
+
+    return results
+
+
+def extract_files_sequential(
+    pdf_paths: list[str], backend: str | PdfBackend | None = None,
+) -> list[list[tuple[int, str]] | None]:
+    """Ekstrak PDF satu per satu; file yang gagal diekstrak bernilai None."""
+    results: list[list[tuple[int, str]] | None] = []
+    for i, pdf_path in enumerate(pdf_paths, start=1):
+        filename = os.path.basename(pdf_path)
+        print(f"[{i}/{len(pdf_paths)}] Processing: {filename}")
         try:
-            raw_text = extract_text_from_pdf(pdf_path)
-            cleaned = clean_text(raw_text)
-            rows.append({"filename": filename, "content": cleaned})
+            results.append(extract_pages(pdf_path, backend=backend))
         except Exception as e:
             print(f"  Error processing {filename}: {e}")
-            rows.append({"filename": filename, "content": ""})
+            results.append(None)
+    return results
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 dari isi file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Cache teks hasil ekstraksi di SQLite, dikunci hash isi file + versi extractor.
+
+    Setiap backend memiliki versi extractor sendiri sehingga teks dari
+    backend berbeda tidak tercampur. Kunci berbasis isi (bukan nama file)
+    sehingga file yang diganti namanya tidak perlu diekstrak ulang,
+    sedangkan file yang isinya berubah otomatis dianggap miss. Teks disimpan
+    per halaman agar dapat dibaca ulang secara streaming; sebuah dokumen
+    baru dianggap ada di cache setelah seluruh halamannya tersimpan,
+    sehingga ekstraksi yang gagal dicoba lagi.
+    """
+
+    def __init__(self, path: str, extractor_version: str):
+        self.path = path
+        self.extractor_version = extractor_version
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            " content_hash TEXT NOT NULL,"
+            " extractor_version TEXT NOT NULL,"
+            " PRIMARY KEY (content_hash, extractor_version))"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " content_hash TEXT NOT NULL,"
+            " extractor_version TEXT NOT NULL,"
+            " page_no INTEGER NOT NULL,"
+            " raw_text TEXT NOT NULL,"
+            " PRIMARY KEY (content_hash, extractor_version, page_no))"
+        )
+        self.conn.commit()
+
+    def has(self, content_hash: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM documents WHERE content_hash = ? AND extractor_version = ?",
+            (content_hash, self.extractor_version),
+        ).fetchone()
+        return row is not None
+
+    def iter_pages(self, content_hash: str) -> Iterator[tuple[int, str]]:
+        """Iterasi (nomor halaman, teks mentah) langsung dari cursor SQLite."""
+        yield from self.conn.execute(
+            "SELECT page_no, raw_text FROM pages"
+            " WHERE content_hash = ? AND extractor_version = ? ORDER BY page_no",
+            (content_hash, self.extractor_version),
+        )
+
+    def add_page(self, content_hash: str, page_no: int, raw_text: str) -> None:
+        """Simpan satu halaman; belum terlihat sampai ``finish`` dipanggil."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)",
+            (content_hash, self.extractor_version, page_no, raw_text),
+        )
+
+    def finish(self, content_hash: str) -> None:
+        """Tandai dokumen lengkap dan commit halaman-halamannya."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO documents VALUES (?, ?)",
+            (content_hash, self.extractor_version),
+        )
+        self.conn.commit()
+
+    def discard(self) -> None:
+        """Batalkan halaman yang belum di-commit (ekstraksi gagal di tengah jalan)."""
+        self.conn.rollback()
+
+    def put(self, content_hash: str, pages: list[tuple[int, str]]) -> None:
+        for page_no, raw_text in pages:
+            self.add_page(content_hash, page_no, raw_text)
+        self.finish(content_hash)
+
+    def prune(self, live_hashes: set[str]) -> int:
+        """Hapus entri file yang sudah tidak ada atau versi lama dari backend yang sama.
+
+        Entri backend lain tetap disimpan agar berganti ``--backend`` tidak
+        mengosongkan cache.
+        """
+        backend_prefix = self.extractor_version.split("-", 1)[0] + "-"
+        stale = [
+            (content_hash, version)
+            for content_hash, version in self.conn.execute(
+                "SELECT content_hash, extractor_version FROM documents"
+            )
+            if content_hash not in live_hashes
+            or (version != self.extractor_version and version.startswith(backend_prefix))
+        ]
+        for table in ("documents", "pages"):
+            self.conn.executemany(
+                f"DELETE FROM {table} WHERE content_hash = ? AND extractor_version = ?", stale,
+            )
+        self.conn.commit()
+        return len(stale)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ekstraksi teks PDF peraturan OJK ke CSV.")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Jumlah proses worker (default 1: ekstraksi berurutan, 0: semua core).",
+    )
+    parser.add_argument(
+        "--pages-per-task", type=int, default=DEFAULT_PAGES_PER_TASK,
+        help=f"Ukuran rentang halaman untuk memecah PDF besar (default {DEFAULT_PAGES_PER_TASK}).",
+    )
+    parser.add_argument(
+        "--format", choices=["csv", "jsonl"], default="csv",
+        help="Format output: csv (satu baris per dokumen) atau jsonl "
+             "(satu baris per halaman, memori dibatasi teks satu dokumen).",
+    )
+    parser.add_argument(
+        "--backend", choices=list(BACKENDS), default=DEFAULT_BACKEND,
+        help="Backend ekstraksi: pdfplumber (layout penuh), pdfminer, atau pypdfium2 "
+             f"(teks mentah, paling cepat). Default dari OJK_PDF_BACKEND ({DEFAULT_BACKEND}).",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help=f"Abaikan cache ekstraksi dan ekstrak ulang semua file ('{CACHE_PATH}').",
+    )
+    return parser.parse_args(argv)
+
+
+def stream_jsonl(
+    pdf_files: list[str],
+    pdf_paths: list[str],
+    hashes: list[str],
+    cache: ExtractionCache | None,
+    output_path: str,
+    backend: str | PdfBackend | None = None,
+) -> None:
+    """Ekstrak dan tulis halaman demi halaman ke JSONL.
+
+    Halaman dari cache dibaca langsung dari cursor SQLite dan halaman baru
+    masuk ke cache begitu selesai diekstrak. Halaman bersih satu dokumen
+    ditahan sampai dokumen selesai dan baru ditulis jika seluruh halamannya
+    berhasil; dokumen yang gagal di tengah jalan hanya menghasilkan baris
+    ``error``, tanpa halaman parsial sebelumnya.
+    """
+    hits = 0
+    with DocumentWriter(output_path, ["filename", "page", "content", "error"]) as writer:
+        for i, (filename, pdf_path, content_hash) in enumerate(zip(pdf_files, pdf_paths, hashes), 1):
+            cached = cache is not None and cache.has(content_hash)
+            if cached:
+                hits += 1
+                pages = cache.iter_pages(content_hash)
+            else:
+                print(f"[{i}/{len(pdf_files)}] Processing: {filename}")
+                pages = iter_pdf_pages(pdf_path, backend=backend)
+
+            records = []
+            try:
+                for page_no, raw_text in pages:
+                    if cache is not None and not cached:
+                        cache.add_page(content_hash, page_no, raw_text)
+                    content = clean_text(raw_text)
+                    if content:
+                        records.append({"filename": filename, "page": page_no, "content": content})
+                if cache is not None and not cached:
+                    cache.finish(content_hash)
+            except Exception as e:
+                print(f"  Error processing {filename}: {e}")
+                if cache is not None:
+                    cache.discard()
+                records = [{"filename": filename, "content": "", "error": str(e)}]
+
+            # Tetap catat dokumen tanpa teks agar jumlah dokumen konsisten
+            for record in records or [{"filename": filename, "content": ""}]:
+                writer.write(record)
+
+    if cache is not None:
+        print(f"Cache: {hits} hit(s), {len(pdf_files) - hits} miss(es)")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workers = args.workers or os.cpu_count() or 1
+
+    input_folder = os.path.join(BASE_DIR, "docs_POJK")
+    output_path = os.path.join(BASE_DIR, f"output_pojk.{args.format}")
+
+    pdf_files = sorted(
+        [f for f in os.listdir(input_folder) if f.lower().endswith(".pdf")]
+    )
+    pdf_paths = [os.path.join(input_folder, f) for f in pdf_files]
+
+    print(f"Found {len(pdf_files)} PDF file(s) in '{input_folder}' (backend: {args.backend})")
+
+    hashes = [file_hash(path) for path in pdf_paths]
+    cache = None if args.no_cache else ExtractionCache(CACHE_PATH, get_backend(args.backend).version)
+
+    if args.format == "jsonl":
+        if workers > 1:
+            print("Note: --format jsonl streams pages sequentially; --workers is ignored")
+        stream_jsonl(pdf_files, pdf_paths, hashes, cache, output_path, args.backend)
+    else:
+        pages_per_file: list[list[tuple[int, str]] | None] = [None] * len(pdf_files)
+        misses = []
+        for idx, content_hash in enumerate(hashes):
+            if cache is not None and cache.has(content_hash):
+                pages_per_file[idx] = list(cache.iter_pages(content_hash))
+            else:
+                misses.append(idx)
+        if cache is not None:
+            print(f"Cache: {len(pdf_files) - len(misses)} hit(s), {len(misses)} miss(es)")
+
+        miss_paths = [pdf_paths[idx] for idx in misses]
+        if workers > 1 and miss_paths:
+            print(f"Extracting with {workers} worker processes")
+            extracted = extract_files_parallel(miss_paths, workers, args.pages_per_task, args.backend)
+        else:
+            extracted = extract_files_sequential(miss_paths, args.backend)
+
+        for idx, pages in zip(misses, extracted):
+            pages_per_file[idx] = pages
+            if cache is not None and pages is not None:
+                cache.put(hashes[idx], pages)
+
+        with DocumentWriter(output_path, ["filename", "content"]) as writer:
+            for filename, pages in zip(pdf_files, pages_per_file):
+                raw_text = "\n".join(text for _, text in pages) if pages is not None else ""
+                writer.write({"filename": filename, "content": clean_text(raw_text)})
 
-    with open(output_csv, "w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=["filename", "content"])
-        writer.writeheader()
-        writer.writerows(rows)
+    if cache is not None:
+        removed = cache.prune(set(hashes))
+        if removed:
+            print(f"Cache: removed {removed} stale entr{'y' if removed == 1 else 'ies'}")
+        cache.close()
 
-    print(f"\nDone! Output saved to '{output_csv}' ({len(rows)} rows)")
+    print(f"\nDone! Output saved to '{output_path}' ({len(pdf_files)} documents)")
 
 
 if __name__ == "__main__":
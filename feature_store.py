@@ -0,0 +1,353 @@
+"""
+Feature store: hitungan n-gram per dokumen yang disimpan sekali di disk.
+
+Training, CV, dan tuning semula men-tokenisasi seluruh teks korpus setiap
+kali dijalankan. Feature store menyimpan hasil tokenisasi (hitungan n-gram
+per dokumen, analyzer sama dengan TfidfVectorizer) sebagai matriks CSR:
+
+    feature_store/
+        meta.json          analyzer, jumlah baris/nnz/term (batas data valid)
+        indptr.i64         offset baris CSR (satu baris per versi dokumen)
+        indices.i32        indeks term per nilai non-zero
+        data.i32           hitungan term
+        vocab.txt          term per indeks kolom, urutan penambahan
+        ngram.u8           panjang n-gram per term
+        docs.jsonl         indeks dokumen: {"id", "hash", "row"}; baris terakhir per id berlaku
+
+Array ditulis append-only sebagai file biner mentah dan dibaca dengan
+``np.memmap``. ``update`` hanya men-tokenisasi dokumen baru atau yang
+kontennya berubah (dideteksi lewat hash SHA-1), menambahkan barisnya ke
+akhir file, lalu mengganti ``meta.json`` secara atomik. Data di luar batas
+``meta.json`` (sisa penulisan yang terputus) dipotong saat update berikutnya.
+Baris versi lama dokumen yang berubah tidak dibaca lagi dan dibuang oleh
+``compact``.
+
+``counts(ids, ngram_range)`` mengembalikan matriks hitungan untuk dokumen
+tertentu dengan kolom terurut alfabetis seperti vocabulary CountVectorizer,
+sehingga pipeline dari ``train_model.fit_counts`` identik dengan
+``build_pipeline().fit(teks)``.
+
+    python feature_store.py build --input output_pojk_classified.csv
+    python feature_store.py info
+    python feature_store.py compact
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import time
+from collections import Counter
+
+import numpy as np
+import scipy.sparse as sp
+
+from corpus_io import iter_documents
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FEATURE_STORE_DIR = os.environ.get("OJK_FEATURE_STORE", os.path.join(BASE_DIR, "feature_store"))
+INPUT_PATH = os.path.join(BASE_DIR, "output_pojk_classified.csv")
+STORE_FORMAT_VERSION = 1
+# Cukup untuk seluruh ngram_range di PARAM_GRID train_model
+DEFAULT_NGRAM_RANGE = (1, 3)
+
+_ARRAYS = {"indptr": np.int64, "indices": np.int32, "data": np.int32, "ngram": np.uint8}
+_FILES = {"indptr": "indptr.i64", "indices": "indices.i32", "data": "data.i32", "ngram": "ngram.u8"}
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class FeatureStore:
+    """Matriks hitungan n-gram per dokumen, append-only, dibaca dengan memory-map."""
+
+    def __init__(self, path: str = FEATURE_STORE_DIR, ngram_range: tuple[int, int] = DEFAULT_NGRAM_RANGE):
+        self.path = path
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                self.meta = json.load(f)
+            if self.meta.get("format_version") != STORE_FORMAT_VERSION:
+                raise ValueError(f"Format feature store {path} tidak dikenal; bangun ulang")
+        else:
+            self.meta = {
+                "format_version": STORE_FORMAT_VERSION,
+                "ngram_range": list(ngram_range),
+                "lowercase": True,
+                "token_pattern": r"(?u)\b\w\w+\b",
+                "rows": 0,
+                "nnz": 0,
+                "terms": 0,
+                "vocab_bytes": 0,
+                "docs_bytes": 0,
+            }
+        self._index: dict[str, tuple[str, int]] | None = None
+        self._vocabulary: dict[str, int] | None = None
+        self._terms: list[str] | None = None
+
+    # -- baca ---------------------------------------------------------------
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _array(self, name: str) -> np.ndarray:
+        length = {
+            "indptr": self.meta["rows"] + 1, "indices": self.meta["nnz"],
+            "data": self.meta["nnz"], "ngram": self.meta["terms"],
+        }[name]
+        if length == 0 or not os.path.exists(self._file(_FILES[name])):
+            return np.zeros(length, dtype=_ARRAYS[name])
+        return np.memmap(self._file(_FILES[name]), dtype=_ARRAYS[name], mode="r", shape=(length,))
+
+    @property
+    def index(self) -> dict[str, tuple[str, int]]:
+        """id dokumen -> (hash konten, baris matriks)."""
+        if self._index is None:
+            self._index = {}
+            if self.meta["docs_bytes"]:
+                with open(self._file("docs.jsonl"), "rb") as f:
+                    lines = f.read(self.meta["docs_bytes"]).decode("utf-8").splitlines()
+                for line in lines:
+                    entry = json.loads(line)
+                    self._index[entry["id"]] = (entry["hash"], entry["row"])
+        return self._index
+
+    @property
+    def terms(self) -> list[str]:
+        if self._terms is None:
+            self._terms = []
+            if self.meta["terms"]:
+                with open(self._file("vocab.txt"), encoding="utf-8") as f:
+                    self._terms = [line.rstrip("\n") for line in itertools.islice(f, self.meta["terms"])]
+        return self._terms
+
+    def matrix(self) -> sp.csr_matrix:
+        """Seluruh baris (termasuk versi lama dokumen) sebagai CSR di atas memory-map."""
+        return sp.csr_matrix(
+            (self._array("data"), self._array("indices"), self._array("indptr")),
+            shape=(self.meta["rows"], self.meta["terms"]), copy=False,
+        )
+
+    def counts(self, ids, ngram_range: tuple[int, int]) -> tuple[sp.csr_matrix, np.ndarray]:
+        """Matriks hitungan dokumen ``ids`` (urutan sama) untuk ``ngram_range``.
+
+        Hanya kolom term yang muncul di dokumen tersebut yang dikembalikan,
+        terurut alfabetis. Mengembalikan (matriks, array term per kolom).
+        """
+        low, high = ngram_range
+        store_low, store_high = self.meta["ngram_range"]
+        if low < store_low or high > store_high:
+            raise ValueError(f"ngram_range {ngram_range} di luar feature store {tuple(self.meta['ngram_range'])}")
+        try:
+            rows = np.fromiter((self.index[doc_id][1] for doc_id in ids), dtype=np.int64)
+        except KeyError as exc:
+            raise KeyError(f"Dokumen {exc} belum ada di feature store; jalankan update/sync") from None
+        selected = self.matrix()[rows]
+        columns = np.unique(selected.indices)
+        ngram = np.asarray(self._array("ngram"))[columns]
+        columns = columns[(ngram >= low) & (ngram <= high)]
+        terms = np.array([self.terms[i] for i in columns], dtype=object)
+        order = np.argsort(terms)
+        columns, terms = columns[order], terms[order]
+        return selected[:, columns].tocsr(), terms
+
+    # -- tulis --------------------------------------------------------------
+
+    def _analyzer(self):
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        return CountVectorizer(
+            ngram_range=tuple(self.meta["ngram_range"]),
+            lowercase=self.meta["lowercase"],
+            token_pattern=self.meta["token_pattern"],
+        ).build_analyzer()
+
+    def _truncate(self) -> None:
+        """Buang sisa penulisan yang tidak tercatat di meta.json."""
+        sizes = {
+            _FILES["indptr"]: (self.meta["rows"] + 1) * 8 if self.meta["rows"] else 0,
+            _FILES["indices"]: self.meta["nnz"] * 4,
+            _FILES["data"]: self.meta["nnz"] * 4,
+            _FILES["ngram"]: self.meta["terms"],
+            "vocab.txt": self.meta["vocab_bytes"],
+            "docs.jsonl": self.meta["docs_bytes"],
+        }
+        for name, size in sizes.items():
+            path = self._file(name)
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+
+    def update(self, documents) -> dict:
+        """Tambahkan atau perbarui dokumen ``(id, teks)``; dokumen yang tidak berubah dilewati.
+
+        Mengembalikan jumlah dokumen ``added``, ``updated`` dan ``unchanged``.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        self._truncate()
+        try:
+            return self._append(documents)
+        except BaseException:
+            # Cache di memori mungkin memuat baris yang tidak tercatat di meta.json
+            self._index = self._vocabulary = self._terms = None
+            raise
+
+    def _append(self, documents) -> dict:
+        index = self.index
+        vocabulary = analyze = None
+        stats = {"added": 0, "updated": 0, "unchanged": 0}
+        new_terms: list[str] = []
+        new_docs: list[dict] = []
+        nnz, row = self.meta["nnz"], self.meta["rows"]
+        seen = set()
+
+        with open(self._file(_FILES["indptr"]), "ab") as indptr_f, \
+                open(self._file(_FILES["indices"]), "ab") as indices_f, \
+                open(self._file(_FILES["data"]), "ab") as data_f:
+            if row == 0:
+                np.zeros(1, dtype=np.int64).tofile(indptr_f)
+            for doc_id, text in documents:
+                if doc_id in seen:
+                    raise ValueError(f"ID dokumen ganda: {doc_id!r}")
+                seen.add(doc_id)
+                digest = content_hash(text)
+                if doc_id in index and index[doc_id][0] == digest:
+                    stats["unchanged"] += 1
+                    continue
+                stats["updated" if doc_id in index else "added"] += 1
+                if vocabulary is None:
+                    # Vocabulary hanya dimuat jika ada dokumen yang perlu ditokenisasi
+                    if self._vocabulary is None:
+                        self._vocabulary = {term: i for i, term in enumerate(self.terms)}
+                    vocabulary, analyze = self._vocabulary, self._analyzer()
+                counter = Counter()
+                for term in analyze(text):
+                    j = vocabulary.get(term)
+                    if j is None:
+                        j = vocabulary[term] = len(vocabulary)
+                        new_terms.append(term)
+                    counter[j] += 1
+                cols = np.fromiter(counter.keys(), dtype=np.int32, count=len(counter))
+                vals = np.fromiter(counter.values(), dtype=np.int32, count=len(counter))
+                order = np.argsort(cols)
+                cols[order].tofile(indices_f)
+                vals[order].tofile(data_f)
+                nnz += len(cols)
+                np.array([nnz], dtype=np.int64).tofile(indptr_f)
+                index[doc_id] = (digest, row)
+                new_docs.append({"id": doc_id, "hash": digest, "row": row})
+                row += 1
+            if not new_docs:
+                return stats
+            for f in (indptr_f, indices_f, data_f):
+                f.flush()
+                os.fsync(f.fileno())
+
+        with open(self._file("vocab.txt"), "a", encoding="utf-8") as f:
+            f.writelines(f"{term}\n" for term in new_terms)
+            vocab_bytes = f.tell()
+        with open(self._file(_FILES["ngram"]), "ab") as f:
+            np.array([term.count(" ") + 1 for term in new_terms], dtype=np.uint8).tofile(f)
+        with open(self._file("docs.jsonl"), "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(doc, ensure_ascii=False) + "\n" for doc in new_docs)
+            docs_bytes = f.tell()
+        self._terms.extend(new_terms)
+        # meta.json ditulis terakhir: baru sekarang baris baru terlihat oleh pembaca
+        self.meta.update(rows=row, nnz=nnz, terms=len(vocabulary), vocab_bytes=vocab_bytes, docs_bytes=docs_bytes)
+        self._write_meta()
+        return stats
+
+    def _write_meta(self) -> None:
+        tmp = self._file("meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._file("meta.json"))
+
+    def sync(self, dataset_path: str) -> dict:
+        """Samakan isi store dengan dataset CSV/JSONL (id = ``filename``).
+
+        Jika ``filename`` muncul lebih dari sekali, baris terakhir yang
+        dipakai; pass pertama hanya mencatat posisi terakhir setiap nama
+        agar konten tidak perlu ditahan di memori.
+        """
+        last = {doc["filename"]: i for i, doc in enumerate(iter_documents(dataset_path))}
+        return self.update(
+            (doc["filename"], doc["content"])
+            for i, doc in enumerate(iter_documents(dataset_path)) if last[doc["filename"]] == i
+        )
+
+    def compact(self) -> int:
+        """Tulis ulang store tanpa baris versi lama; mengembalikan jumlah baris yang dibuang."""
+        stale = self.meta["rows"] - len(self.index)
+        if not stale:
+            return 0
+        ids = list(self.index)
+        matrix = self.matrix()[[self.index[doc_id][1] for doc_id in ids]]
+        tmp = f"{self.path}.compact"
+        os.makedirs(tmp)
+        for name in ("indptr", "indices", "data"):
+            np.asarray(getattr(matrix, name), dtype=_ARRAYS[name]).tofile(os.path.join(tmp, _FILES[name]))
+        for name in ("vocab.txt", _FILES["ngram"]):
+            shutil.copyfile(self._file(name), os.path.join(tmp, name))
+        with open(os.path.join(tmp, "docs.jsonl"), "w", encoding="utf-8") as f:
+            for row, doc_id in enumerate(ids):
+                f.write(json.dumps({"id": doc_id, "hash": self.index[doc_id][0], "row": row}, ensure_ascii=False) + "\n")
+        meta = dict(
+            self.meta, rows=len(ids), nnz=int(matrix.nnz), docs_bytes=os.path.getsize(os.path.join(tmp, "docs.jsonl")),
+        )
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        old = f"{self.path}.old"
+        os.rename(self.path, old)
+        os.rename(tmp, self.path)
+        shutil.rmtree(old)
+        self.__init__(self.path)
+        return stale
+
+    def info(self) -> dict:
+        size = sum(os.path.getsize(self._file(name)) for name in os.listdir(self.path)) if os.path.isdir(self.path) else 0
+        return {
+            "documents": len(self.index),
+            "rows": self.meta["rows"],
+            "terms": self.meta["terms"],
+            "nnz": self.meta["nnz"],
+            "ngram_range": tuple(self.meta["ngram_range"]),
+            "size_mb": size / 1024 / 1024,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kelola feature store hitungan n-gram korpus.")
+    parser.add_argument("--store", default=FEATURE_STORE_DIR, help="Direktori feature store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Tambahkan dokumen baru/berubah dari dataset ke store.")
+    build.add_argument("--input", default=INPUT_PATH, help="Dataset .csv atau .jsonl (id = filename).")
+    build.add_argument(
+        "--ngram-max", type=int, default=DEFAULT_NGRAM_RANGE[1],
+        help="Panjang n-gram maksimum untuk store baru (default 3).",
+    )
+    sub.add_parser("info", help="Ringkasan isi store.")
+    sub.add_parser("compact", help="Buang baris versi lama dokumen yang berubah.")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        store = FeatureStore(args.store, ngram_range=(1, args.ngram_max))
+        start = time.perf_counter()
+        stats = store.sync(args.input)
+        print(f"Synced '{args.input}' in {time.perf_counter() - start:.2f}s: "
+              f"{stats['added']} added, {stats['updated']} updated, {stats['unchanged']} unchanged")
+    store = FeatureStore(args.store)
+    if args.command == "compact":
+        print(f"Removed {store.compact()} stale row(s)")
+    info = store.info()
+    print(f"{info['documents']} documents, {info['rows']} rows, {info['terms']:,} terms, "
+          f"{info['nnz']:,} non-zeros, ngram_range={info['ngram_range']}, {info['size_mb']:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
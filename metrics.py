@@ -0,0 +1,171 @@
+"""
+Instrumentasi ringan untuk jalur request klasifikasi.
+
+Mencatat jumlah request, histogram latensi per tahap (expand_synonyms,
+clean_text, vectorize, predict_proba, keyword_override, render_template),
+distribusi panjang input, dan jumlah prediksi per departemen, lalu
+menyajikannya dalam format teks Prometheus untuk endpoint /metrics.
+
+Instrumentasi diaktifkan lewat ``OJK_METRICS=1``. Saat nonaktif,
+``Metrics.stage`` mengembalikan context manager kosong yang sama setiap
+kali dan seluruh metode pencatatan langsung kembali, sehingga biayanya
+praktis nol. Metrik disimpan per proses; pada deployment multi-worker
+setiap worker melaporkan angkanya sendiri.
+"""
+
+import contextlib
+import threading
+import time
+from bisect import bisect_left
+
+# Batas bucket histogram (detik) untuk latensi tahap dan request
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# Batas bucket histogram panjang input (karakter)
+INPUT_LENGTH_BUCKETS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000, 100000)
+
+_NOOP = contextlib.nullcontext()
+
+
+class Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class _StageTimer:
+    __slots__ = ("metrics", "stage", "start")
+
+    def __init__(self, metrics: "Metrics", stage: str):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe_stage(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    """Registry metrik in-process dengan ekspor format teks Prometheus."""
+
+    def __init__(self, enabled: bool = False, prefix: str = "ojk"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._requests: dict[tuple, int] = {}
+        self._request_latency: dict[str, Histogram] = {}
+        self._stages: dict[str, Histogram] = {}
+        self._input_length = Histogram(INPUT_LENGTH_BUCKETS)
+        self._predictions: dict[str, int] = {}
+        self._overrides = 0
+        self._collectors: list = []
+
+    def stage(self, name: str):
+        """Context manager pengukur waktu satu tahap; no-op saat nonaktif."""
+        if not self.enabled:
+            return _NOOP
+        return _StageTimer(self, name)
+
+    def observe_stage(self, name: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            hist = self._stages.get(name)
+            if hist is None:
+                hist = self._stages[name] = Histogram(LATENCY_BUCKETS)
+            hist.observe(seconds)
+
+    def observe_request(self, endpoint: str, method: str, status: int, seconds: float) -> None:
+        if not self.enabled:
+            return
+        key = (endpoint, method, str(status))
+        with self._lock:
+            self._requests[key] = self._requests.get(key, 0) + 1
+            hist = self._request_latency.get(endpoint)
+            if hist is None:
+                hist = self._request_latency[endpoint] = Histogram(LATENCY_BUCKETS)
+            hist.observe(seconds)
+
+    def observe_input(self, n_chars: int) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._input_length.observe(n_chars)
+
+    def observe_prediction(self, label: str, overridden: bool) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._predictions[label] = self._predictions.get(label, 0) + 1
+            if overridden:
+                self._overrides += 1
+
+    def add_collector(self, fn) -> None:
+        """Daftarkan fungsi yang mengembalikan [(nama, tipe, help, nilai)] saat /metrics dibaca."""
+        self._collectors.append(fn)
+
+    def _histogram_lines(self, name: str, help_text: str, series: dict[str, Histogram], label: str) -> list[str]:
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for key, hist in sorted(series.items()):
+            base = {label: key} if label else {}
+            cumulative = 0
+            for bound, count in zip(hist.buckets, hist.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels({**base, 'le': repr(float(bound))})} {cumulative}")
+            lines.append(f"{name}_bucket{_labels({**base, 'le': '+Inf'})} {hist.count}")
+            lines.append(f"{name}_sum{_labels(base)} {hist.sum!r}")
+            lines.append(f"{name}_count{_labels(base)} {hist.count}")
+        return lines
+
+    def render(self) -> str:
+        """Seluruh metrik dalam format eksposisi teks Prometheus."""
+        p = self.prefix
+        with self._lock:
+            lines = [f"# HELP {p}_requests_total Jumlah request HTTP.", f"# TYPE {p}_requests_total counter"]
+            for (endpoint, method, status), count in sorted(self._requests.items()):
+                labels = _labels({"endpoint": endpoint, "method": method, "status": status})
+                lines.append(f"{p}_requests_total{labels} {count}")
+            lines += self._histogram_lines(
+                f"{p}_request_duration_seconds", "Latensi request HTTP per endpoint.",
+                self._request_latency, "endpoint",
+            )
+            lines += self._histogram_lines(
+                f"{p}_stage_duration_seconds", "Latensi per tahap jalur klasifikasi.",
+                self._stages, "stage",
+            )
+            lines += self._histogram_lines(
+                f"{p}_input_length_chars", "Panjang teks input (karakter).",
+                {"": self._input_length}, "",
+            )
+            lines += [f"# HELP {p}_predictions_total Jumlah prediksi per departemen.",
+                      f"# TYPE {p}_predictions_total counter"]
+            for label, count in sorted(self._predictions.items()):
+                lines.append(f"{p}_predictions_total{_labels({'department': label})} {count}")
+            lines += [f"# HELP {p}_keyword_overrides_total Prediksi yang diubah oleh keyword_override.",
+                      f"# TYPE {p}_keyword_overrides_total counter",
+                      f"{p}_keyword_overrides_total {self._overrides}"]
+
+        for collect in self._collectors:
+            for name, kind, help_text, value in collect():
+                lines += [f"# HELP {p}_{name} {help_text}", f"# TYPE {p}_{name} {kind}", f"{p}_{name} {value}"]
+        return "\n".join(lines) + "\n"
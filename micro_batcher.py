@@ -0,0 +1,134 @@
+"""
+Penggabungan request klasifikasi konkuren menjadi satu batch (micro-batching).
+
+Setiap request ke server async hanya membawa satu atau beberapa teks,
+sehingga memanggil ``predict_proba`` per request membayar overhead
+vectorizer dan NumPy berulang kali. ``MicroBatcher`` menampung request di
+antrean asyncio dan mengirimkannya sebagai satu panggilan ke fungsi batch
+ketika jumlah teks mencapai ``max_batch_size`` atau request tertua sudah
+menunggu ``max_wait_ms`` milidetik. Hasil dipecah kembali sesuai urutan teks
+dan dikembalikan ke masing-masing pemanggil.
+
+Fungsi batch dijalankan di satu thread terpisah agar event loop tetap bisa
+menerima request baru selama model bekerja; selama itu antrean terus terisi
+sehingga batch berikutnya otomatis lebih besar saat beban tinggi.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _trim(result: dict, top_k: int) -> dict:
+    """Potong daftar ``top_k`` hasil batch ke jumlah yang diminta satu pemanggil."""
+    return dict(result, top_k=result["top_k"][:top_k])
+
+
+class MicroBatcher:
+    """Antrean asyncio yang menggabungkan ``submit`` konkuren ke satu panggilan ``handler``.
+
+    ``handler(texts, top_k, explain)`` harus mengembalikan satu hasil per teks
+    dengan urutan yang sama. ``explain`` berupa daftar jumlah term per teks
+    sehingga penjelasan hanya dihitung untuk teks yang memintanya. ``top_k``
+    memakai nilai terbesar dalam batch lalu dipotong per pemanggil.
+    """
+
+    def __init__(self, handler, max_batch_size: int = 64, max_wait_ms: float = 0.0):
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="micro-batcher")
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+        self.largest_batch = 0
+
+    def start(self) -> None:
+        """Mulai worker di event loop yang sedang berjalan (idempoten)."""
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, texts: list[str], top_k: int, explain: int = 0) -> list[dict]:
+        """Masukkan teks ke antrean dan tunggu hasilnya."""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, top_k, explain, future))
+        return await future
+
+    async def _collect(self) -> list[tuple]:
+        """Ambil satu batch: tunggu request pertama, lalu kumpulkan sampai penuh atau waktu habis."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        size = len(batch[0][0])
+        deadline = loop.time() + self.max_wait
+        while size < self.max_batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Pemanggil yang sudah membatalkan request tidak perlu diprediksi
+            batch = [item for item in batch if not item[3].done()]
+            if not batch:
+                continue
+            texts = [text for item in batch for text in item[0]]
+            top_k = max(item[1] for item in batch)
+            explain = [item[2] for item in batch for _ in item[0]]
+            try:
+                results = await loop.run_in_executor(self._executor, self.handler, texts, top_k, explain)
+            except Exception as exc:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            self.batches += 1
+            self.requests += len(batch)
+            self.texts += len(texts)
+            self.largest_batch = max(self.largest_batch, len(texts))
+
+            start = 0
+            for item_texts, item_top_k, _, future in batch:
+                part = results[start:start + len(item_texts)]
+                start += len(item_texts)
+                if item_top_k < top_k:
+                    part = [_trim(result, item_top_k) for result in part]
+                if not future.done():
+                    future.set_result(part)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "texts": self.texts,
+            "mean_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
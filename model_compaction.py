@@ -0,0 +1,194 @@
+"""
+Pemadatan Pipeline TF-IDF + Multinomial NB hasil training untuk serving.
+
+Pipeline yang disimpan train_model.py membawa atribut yang hanya dibutuhkan
+saat training: ``feature_count_`` dan ``class_count_`` MultinomialNB
+(sebesar ``feature_log_prob_`` sendiri, dipakai ``partial_fit``) serta
+array float64. ``compact_pipeline`` membuat salinan yang:
+
+- membuang atribut yang tidak dipakai saat inference (``stop_words_`` juga
+  dibuang jika versi scikit-learn masih menyimpannya),
+- opsional memangkas term dengan daya pembeda kecil, yaitu selisih
+  log-probabilitas terbesar dan terkecil antar kelas di bawah ``prune``
+  (term seperti itu menambah skor hampir sama besar ke semua kelas),
+- menurunkan ``idf_``, ``feature_log_prob_`` dan ``class_log_prior_`` ke
+  float32 (vectorizer juga menghasilkan matriks float32),
+- menyimpan indeks ``vocabulary_`` sebagai int Python, bukan skalar NumPy
+  yang masing-masing di-unpickle sebagai objek terpisah,
+
+lalu disimpan sebagai joblib terkompresi. Model hasil pemadatan tidak dapat
+di-update inkremental (``--add``); gunakan model asli untuk itu.
+
+    python model_compaction.py                      # -> model_klasifikasi_ojk.slim.joblib
+    python model_compaction.py --prune 0.5 --export-compact
+"""
+
+import argparse
+import copy
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import joblib
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SLIM_MODEL_PATH = os.path.join(BASE_DIR, "model_klasifikasi_ojk.slim.joblib")
+INPUT_CSV = os.path.join(BASE_DIR, "output_pojk_classified.csv")
+COMPRESS = ("zlib", 3)
+
+# Atribut yang hanya dibutuhkan untuk training / partial_fit
+TRAINING_ONLY_ATTRS = {
+    "tfidf": ("stop_words_", "_stop_words_id"),
+    "clf": ("feature_count_", "class_count_"),
+}
+
+PROBE = r"""
+import json, sys, time
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+
+sys.path.insert(0, {base_dir!r})
+import joblib, sklearn.naive_bayes, sklearn.feature_extraction.text, sklearn.pipeline
+before = rss_kb()
+start = time.perf_counter()
+model = joblib.load({path!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "rss_kb": rss_kb() - before}}))
+"""
+
+
+def compact_pipeline(pipeline, prune: float | None = None, dtype=np.float32):
+    """Salinan ``pipeline`` tanpa atribut training, opsional dipangkas dan diturunkan ke ``dtype``.
+
+    Mengembalikan (pipeline, jumlah term dipertahankan, jumlah term semula).
+    """
+    pipeline = copy.deepcopy(pipeline)
+    tfidf = pipeline.named_steps["tfidf"]
+    clf = pipeline.named_steps["clf"]
+    for step, attrs in (("tfidf", tfidf), ("clf", clf)):
+        for name in TRAINING_ONLY_ATTRS[step]:
+            if hasattr(attrs, name):
+                delattr(attrs, name)
+
+    flp = clf.feature_log_prob_
+    n_features = flp.shape[1]
+    keep = np.arange(n_features)
+    if prune is not None:
+        keep = np.flatnonzero(flp.max(axis=0) - flp.min(axis=0) >= prune)
+        if not len(keep):
+            raise ValueError(f"prune={prune} membuang seluruh vocabulary")
+    remap = np.full(n_features, -1)
+    remap[keep] = np.arange(len(keep))
+    tfidf.vocabulary_ = {
+        term: int(remap[i]) for term, i in tfidf.vocabulary_.items() if remap[i] >= 0
+    }
+    flp = flp[:, keep]
+    clf.n_features_in_ = len(keep)
+    tfidf._tfidf.n_features_in_ = len(keep)
+
+    tfidf.idf_ = np.asarray(tfidf.idf_[keep], dtype=dtype)
+    tfidf.dtype = dtype
+    clf.feature_log_prob_ = np.ascontiguousarray(flp, dtype=dtype)
+    clf.class_log_prior_ = clf.class_log_prior_.astype(dtype)
+    return pipeline, len(keep), n_features
+
+
+def save_compacted(pipeline, path: str = SLIM_MODEL_PATH) -> None:
+    """Simpan pipeline terkompresi secara atomik."""
+    tmp = f"{path}.tmp"
+    joblib.dump(pipeline, tmp, compress=COMPRESS)
+    os.replace(tmp, path)
+    print(f"Compacted model saved to '{path}'")
+
+
+def measure_load(path: str, repeats: int = 5) -> dict:
+    """Median waktu ``joblib.load`` dan tambahan RSS, masing-masing di proses Python baru.
+
+    Modul scikit-learn di-import sebelum pengukuran agar yang terukur hanya
+    unpickle model.
+    """
+    runs = []
+    for _ in range(repeats):
+        code = PROBE.format(base_dir=BASE_DIR, path=path)
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        runs.append(json.loads(out.stdout))
+    return {
+        "size_kb": os.path.getsize(path) / 1024,
+        "load_ms": statistics.median(r["seconds"] for r in runs) * 1000,
+        "rss_mb": statistics.median(r["rss_kb"] for r in runs) / 1024,
+    }
+
+
+def agreement(original, compacted, texts: list[str]) -> dict:
+    """Kecocokan label dan selisih probabilitas maksimum kedua model pada ``texts``."""
+    expected = original.predict_proba(texts)
+    actual = compacted.predict_proba(texts)
+    same = expected.argmax(axis=1) == actual.argmax(axis=1)
+    return {
+        "documents": len(texts),
+        "agreement": float(same.mean()),
+        "max_proba_diff": float(np.abs(expected - actual).max()),
+    }
+
+
+def print_report(original_path: str, compacted_path: str, stats: dict, kept: int, total: int) -> None:
+    before = measure_load(original_path)
+    after = measure_load(compacted_path)
+    print("=" * 60)
+    print("Model Compaction Report")
+    print("=" * 60)
+    print(f"{'':<18} {'Original':>12} {'Compacted':>12} {'Change':>9}")
+    for key, label in (("size_kb", "Size (KB)"), ("load_ms", "Load time (ms)"), ("rss_mb", "RSS (MB)")):
+        change = (after[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+        print(f"{label:<18} {before[key]:>12.1f} {after[key]:>12.1f} {change:>+8.1f}%")
+    print(f"{'Vocabulary':<18} {total:>12} {kept:>12} {(kept - total) / total * 100:>+8.1f}%")
+    print(f"\nAgreement on {stats['documents']} training documents: {stats['agreement']:.2%} "
+          f"(max probability difference {stats['max_proba_diff']:.2e})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Padatkan model hasil training untuk serving.")
+    parser.add_argument(
+        "--model", default=None,
+        help="Pipeline joblib sumber (default: versi aktif di model store, atau model_klasifikasi_ojk.joblib).",
+    )
+    parser.add_argument("--output", default=SLIM_MODEL_PATH, help="File joblib hasil pemadatan.")
+    parser.add_argument("--input", default=INPUT_CSV, help="Korpus training untuk mengukur kecocokan prediksi.")
+    parser.add_argument(
+        "--prune", type=float, default=None,
+        help="Buang term dengan selisih log-probabilitas antar kelas di bawah nilai ini (nat).",
+    )
+    parser.add_argument(
+        "--export-compact", metavar="DIR", nargs="?", const=os.path.join(BASE_DIR, "model_klasifikasi_ojk_compact"),
+        help="Ekspor juga model hasil pemadatan ke format ringkas nb_inference (default: direktori serving).",
+    )
+    args = parser.parse_args(argv)
+
+    from corpus_io import iter_documents
+    from train_model import active_model_path
+
+    if args.model is None:
+        args.model = active_model_path()
+    original = joblib.load(args.model)
+    try:
+        compacted, kept, total = compact_pipeline(original, prune=args.prune)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    save_compacted(compacted, args.output)
+    texts = [doc["content"] for doc in iter_documents(args.input)]
+    print_report(args.model, args.output, agreement(original, compacted, texts), kept, total)
+
+    if args.export_compact:
+        from train_model import export_compact_model
+        export_compact_model(compacted, args.export_compact)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Penyimpanan model berversi dan hot reload tanpa downtime.
+
+Setiap training menghasilkan satu direktori versi baru di ``model_store/``:
+
+    model_store/
+        v0001/
+            model.joblib      # Pipeline scikit-learn
+            compact/          # Format ringkas nb_inference (jika diekspor)
+            metadata.json     # Tanggal training, hash korpus, skor CV, ...
+        v0002/
+        ACTIVE                # {"version": "v0002", "history": ["v0001"]}
+
+Versi ditulis ke direktori sementara lalu di-``rename`` ke namanya, dan
+penunjuk ``ACTIVE`` diganti dengan ``os.replace``; keduanya atomik sehingga
+server tidak pernah melihat versi yang setengah tertulis. ``history``
+menyimpan versi-versi yang sebelumnya aktif untuk rollback.
+
+``ModelReloader`` dipakai aplikasi serving: thread latar memeriksa penunjuk
+``ACTIVE`` secara berkala, memuat dan memanaskan versi baru di luar jalur
+request, lalu menukar model yang dipakai dengan satu assignment.
+
+Perintah:
+    python model_store.py list
+    python model_store.py rollback
+    python model_store.py activate v0002
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_STORE_DIR = os.environ.get("OJK_MODEL_STORE", os.path.join(BASE_DIR, "model_store"))
+
+
+def file_sha256(path: str) -> str:
+    """Hash SHA-256 isi file (dibaca per blok), untuk mencatat korpus training."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_json_atomic(path: str, data: dict) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class ModelStore:
+    """Direktori versi model dengan penunjuk versi aktif."""
+
+    def __init__(self, root: str = MODEL_STORE_DIR):
+        self.root = root
+        self.pointer_path = os.path.join(root, "ACTIVE")
+
+    def versions(self) -> list[str]:
+        """Nama versi yang sudah lengkap tertulis, terurut dari yang terlama."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if name.startswith("v") and name[1:].isdigit() and os.path.isdir(self.path(name))
+        )
+
+    def path(self, version: str) -> str:
+        return os.path.join(self.root, version)
+
+    def metadata(self, version: str) -> dict:
+        with open(os.path.join(self.path(version), "metadata.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+    def _pointer(self) -> dict:
+        try:
+            with open(self.pointer_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"version": None, "history": []}
+
+    def active(self) -> str | None:
+        """Versi aktif, atau None jika store kosong."""
+        return self._pointer()["version"]
+
+    def save(self, pipeline, metadata: dict, export_compact=None, activate: bool = True) -> str:
+        """Tulis pipeline sebagai versi baru dan (secara default) aktifkan.
+
+        ``export_compact(pipeline, path)`` opsional untuk menyertakan format
+        ringkas nb_inference di dalam versi.
+        """
+        import joblib
+
+        os.makedirs(self.root, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=self.root)
+        try:
+            joblib.dump(pipeline, os.path.join(tmp, "model.joblib"))
+            if export_compact is not None:
+                export_compact(pipeline, os.path.join(tmp, "compact"))
+            existing = self.versions()
+            number = int(existing[-1][1:]) + 1 if existing else 1
+            while True:
+                version = f"v{number:04d}"
+                meta = {
+                    "version": version,
+                    "trained_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    **metadata,
+                }
+                _write_json_atomic(os.path.join(tmp, "metadata.json"), meta)
+                try:
+                    # rename gagal jika direktori tujuan sudah ada (training paralel)
+                    os.rename(tmp, self.path(version))
+                    break
+                except OSError:
+                    if not os.path.isdir(self.path(version)):
+                        raise
+                    number += 1
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        print(f"Model version '{version}' saved to '{self.path(version)}'")
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version: str) -> None:
+        """Jadikan ``version`` aktif; versi aktif sebelumnya masuk ke history."""
+        if version not in self.versions():
+            raise ValueError(f"Versi '{version}' tidak ada di {self.root}")
+        pointer = self._pointer()
+        if pointer["version"] == version:
+            return
+        history = pointer["history"] + ([pointer["version"]] if pointer["version"] else [])
+        _write_json_atomic(self.pointer_path, {"version": version, "history": history})
+        print(f"Active model version: {version}")
+
+    def rollback(self) -> str:
+        """Aktifkan kembali versi yang aktif sebelum versi sekarang."""
+        pointer = self._pointer()
+        history = [v for v in pointer["history"] if v in self.versions()]
+        if not history:
+            raise ValueError("Tidak ada versi sebelumnya untuk rollback")
+        version = history.pop()
+        _write_json_atomic(self.pointer_path, {"version": version, "history": history})
+        print(f"Rolled back {pointer['version']} -> {version}")
+        return version
+
+    def load(self, version: str):
+        """Muat model serving sebuah versi: format ringkas jika ada, jika tidak Pipeline joblib."""
+        compact = os.path.join(self.path(version), "compact")
+        if os.path.isdir(compact):
+            from nb_inference import CompactNBModel
+            return CompactNBModel.load(compact)
+        import joblib
+        return joblib.load(os.path.join(self.path(version), "model.joblib"))
+
+
+class ModelReloader:
+    """Muat, panaskan, dan tukar model di thread latar saat sumber model berubah.
+
+    ``load()`` mengembalikan ``(model, info)``, ``fingerprint()`` nilai apa pun
+    yang berubah ketika model baru tersedia, dan ``swap(model, info)``
+    memasang model baru. Request yang sedang berjalan tetap memakai model
+    lama sampai selesai; request berikutnya memakai model baru.
+    """
+
+    def __init__(self, load, fingerprint, swap, warmup_texts=(), interval: float = 2.0):
+        self.load = load
+        self.fingerprint = fingerprint
+        self.swap = swap
+        self.warmup_texts = list(warmup_texts)
+        self.interval = interval
+        self._fingerprint = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: str | None = None
+        self.loaded_at: float | None = None
+
+    def reload(self) -> None:
+        """Muat model sekarang juga; exception diteruskan ke pemanggil."""
+        with self._lock:
+            fingerprint = self.fingerprint()
+            model, info = self.load()
+            if self.warmup_texts:
+                model.predict_proba(self.warmup_texts)
+            self.swap(model, info)
+            self._fingerprint = fingerprint
+            self.reloads += 1
+            self.loaded_at = time.time()
+
+    def check(self) -> bool:
+        """Reload jika sumber model berubah. Kegagalan dicatat dan model lama tetap dipakai."""
+        fingerprint = self.fingerprint()
+        if fingerprint == self._fingerprint:
+            return False
+        try:
+            self.reload()
+            return True
+        except Exception as exc:
+            # Versi yang sama tidak dicoba ulang sampai sumber model berubah lagi
+            self._fingerprint = fingerprint
+            self.failures += 1
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            print(f"Model reload failed: {self.last_error}", file=sys.stderr)
+            return False
+
+    def start(self) -> None:
+        """Mulai thread pemeriksa (no-op jika ``interval`` <= 0 atau sudah berjalan)."""
+        if self.interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="model-reloader", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def stats(self) -> dict:
+        return {
+            "reloads": self.reloads,
+            "reload_failures": self.failures,
+            "last_error": self.last_error,
+            "loaded_at": (
+                datetime.fromtimestamp(self.loaded_at, timezone.utc).isoformat(timespec="seconds")
+                if self.loaded_at else None
+            ),
+        }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Kelola versi model di model store.")
+    parser.add_argument("--store", default=MODEL_STORE_DIR, help="Direktori model store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Daftar versi beserta metadata ringkas.")
+    sub.add_parser("rollback", help="Aktifkan kembali versi sebelumnya.")
+    activate = sub.add_parser("activate", help="Aktifkan versi tertentu.")
+    activate.add_argument("version")
+    args = parser.parse_args(argv)
+
+    store = ModelStore(args.store)
+    try:
+        if args.command == "rollback":
+            store.rollback()
+        elif args.command == "activate":
+            store.activate(args.version)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+
+    if args.command == "list":
+        active = store.active()
+        for version in store.versions():
+            meta = store.metadata(version)
+            cv = f"{meta['cv_mean']:.4f}" if meta.get("cv_mean") is not None else "-"
+            print(f"{'*' if version == active else ' '} {version}  {meta.get('trained_at', '-')}  "
+                  f"{meta.get('mode', '-'):<11}  cv={cv}  docs={meta.get('n_documents', '-')}  "
+                  f"corpus={str(meta.get('corpus_hash', '-'))[:12]}")
+        if active is None:
+            print("(store kosong)" if not store.versions() else "(tidak ada versi aktif)")
+
+
+if __name__ == "__main__":
+    main()
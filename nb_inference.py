@@ -0,0 +1,154 @@
+"""
+Inference TF-IDF + Multinomial Naive Bayes tanpa scikit-learn.
+
+Cold start di Vercel sebelumnya harus meng-import scikit-learn dan
+meng-unpickle seluruh Pipeline sebelum request pertama dilayani. Modul ini
+hanya membutuhkan NumPy: parameter hasil training (vocabulary, bobot IDF,
+pengaturan n-gram, dan log-probabilitas NB) diekspor oleh
+``train_model.export_compact_model`` ke sebuah direktori:
+
+    vocab.txt               satu term per baris, urut sesuai indeks fitur
+    idf.npy                 bobot IDF (n_features,)
+    feature_log_prob.npy    log P(term | kelas) (n_classes, n_features)
+    class_log_prior.npy     log P(kelas) (n_classes,)
+    meta.json               label kelas dan pengaturan vectorizer
+
+File .npy dimuat dengan memory-map sehingga halaman memori dibagi antar
+proses dan hanya dibaca saat dibutuhkan. ``CompactNBModel`` menyediakan
+``classes_``, ``predict_proba`` dan ``predict`` dengan hasil yang sama
+(dalam toleransi numerik) dengan Pipeline aslinya. Bagian vectorizer-nya
+(``CompactVectorizer``) juga dipakai similarity_index.py.
+"""
+
+import json
+import os
+import re
+
+import numpy as np
+
+COMPACT_FORMAT_VERSION = 1
+
+
+def save_compact_model(
+    path: str,
+    vocabulary: list[str],
+    idf: np.ndarray,
+    feature_log_prob: np.ndarray,
+    class_log_prior: np.ndarray,
+    meta: dict,
+) -> None:
+    """Tulis parameter model ke direktori format ringkas."""
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, "vocab.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(vocabulary))
+    np.save(os.path.join(path, "idf.npy"), np.ascontiguousarray(idf))
+    np.save(os.path.join(path, "feature_log_prob.npy"), np.ascontiguousarray(feature_log_prob))
+    np.save(os.path.join(path, "class_log_prior.npy"), np.ascontiguousarray(class_log_prior))
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"format_version": COMPACT_FORMAT_VERSION, **meta}, f, ensure_ascii=False, indent=2)
+
+
+class CompactVectorizer:
+    """Pengganti TfidfVectorizer (analyzer 'word') untuk vocabulary dan IDF yang sudah dihitung."""
+
+    def __init__(self, vocabulary: list[str], idf: np.ndarray, meta: dict):
+        # Indeks fitur -> term (vocabulary terbalik) dan sebaliknya
+        self.terms = vocabulary
+        self.vocabulary = {term: i for i, term in enumerate(vocabulary)}
+        self.idf = idf
+        self.ngram_range = tuple(meta["ngram_range"])
+        self.lowercase = meta["lowercase"]
+        self.sublinear_tf = meta["sublinear_tf"]
+        self.norm = meta["norm"]
+        self.token_pattern = re.compile(meta["token_pattern"])
+
+    def _ngrams(self, text: str) -> list[str]:
+        """Tokenisasi dan n-gram kata, sama dengan analyzer 'word' TfidfVectorizer."""
+        if self.lowercase:
+            text = text.lower()
+        tokens = self.token_pattern.findall(text)
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+        grams = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), max_n + 1):
+            grams.extend(map(" ".join, zip(*(tokens[i:] for i in range(n)))))
+        return grams
+
+    def transform_one(self, text: str) -> tuple[np.ndarray, np.ndarray]:
+        """Vektor TF-IDF satu teks dalam bentuk sparse (indeks fitur, nilai)."""
+        vocabulary = self.vocabulary
+        indices = [vocabulary[g] for g in self._ngrams(text) if g in vocabulary]
+        if not indices:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+        idx, counts = np.unique(np.array(indices, dtype=np.intp), return_counts=True)
+        values = counts.astype(np.float64)
+        if self.sublinear_tf:
+            values = np.log(values) + 1.0
+        values *= self.idf[idx]
+        if self.norm == "l2":
+            values /= np.sqrt(np.dot(values, values))
+        elif self.norm == "l1":
+            values /= np.abs(values).sum()
+        return idx, values
+
+    def transform(self, texts: list[str]) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Vektor TF-IDF sparse untuk setiap teks."""
+        return [self.transform_one(text) for text in texts]
+
+
+class CompactNBModel(CompactVectorizer):
+    """Pengganti Pipeline TF-IDF + MultinomialNB berbasis NumPy saja."""
+
+    def __init__(
+        self,
+        vocabulary: list[str],
+        idf: np.ndarray,
+        feature_log_prob: np.ndarray,
+        class_log_prior: np.ndarray,
+        meta: dict,
+    ):
+        super().__init__(vocabulary, idf, meta)
+        self.feature_log_prob = feature_log_prob
+        self.class_log_prior = class_log_prior
+        self.classes_ = np.array(meta["classes"])
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "CompactNBModel":
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format_version") != COMPACT_FORMAT_VERSION:
+            raise ValueError(f"Versi format model ringkas tidak didukung: {meta.get('format_version')}")
+        with open(os.path.join(path, "vocab.txt"), encoding="utf-8") as f:
+            vocabulary = f.read().split("\n")
+        mmap_mode = "r" if mmap else None
+        return cls(
+            vocabulary,
+            np.load(os.path.join(path, "idf.npy"), mmap_mode=mmap_mode),
+            np.load(os.path.join(path, "feature_log_prob.npy"), mmap_mode=mmap_mode),
+            np.load(os.path.join(path, "class_log_prior.npy"), mmap_mode=mmap_mode),
+            meta,
+        )
+
+    def joint_log_proba_features(self, features: list[tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        jll = np.empty((len(features), len(self.classes_)), dtype=np.float64)
+        for row, (idx, values) in enumerate(features):
+            jll[row] = self.feature_log_prob[:, idx] @ values + self.class_log_prior
+        return jll
+
+    def predict_proba_features(self, features: list[tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        """predict_proba dari vektor hasil ``transform``."""
+        jll = self.joint_log_proba_features(features)
+        jll -= jll.max(axis=1, keepdims=True)
+        proba = np.exp(jll)
+        proba /= proba.sum(axis=1, keepdims=True)
+        return proba
+
+    def predict_joint_log_proba(self, texts: list[str]) -> np.ndarray:
+        return self.joint_log_proba_features(self.transform(texts))
+
+    def predict_proba(self, texts: list[str]) -> np.ndarray:
+        return self.predict_proba_features(self.transform(texts))
+
+    def predict(self, texts: list[str]) -> np.ndarray:
+        return self.classes_[self.predict_joint_log_proba(texts).argmax(axis=1)]
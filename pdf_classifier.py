@@ -0,0 +1,103 @@
+"""
+Klasifikasi PDF peraturan secara inkremental dengan penghentian dini.
+
+Halaman dari ``extract_pdf.iter_pdf_pages`` diklasifikasikan satu per satu
+begitu diekstrak. Probabilitas dokumen adalah rata-rata probabilitas
+halaman berbobot panjang teks. Ekstraksi berhenti lebih awal ketika label
+dokumen tidak berubah dan confidence-nya bertahan di atas ``threshold``
+selama ``patience`` halaman berturut-turut. Ekstraksi juga berhenti saat
+batas halaman atau batas waktu tercapai, sehingga regulasi 200 halaman
+tidak perlu diekstrak seluruhnya.
+
+Batas waktu diperiksa di antara halaman; satu halaman yang sangat lambat
+tetap diselesaikan.
+"""
+
+import time
+from collections.abc import Iterable
+
+import numpy as np
+
+# Confidence dokumen (persen) yang harus dipertahankan untuk berhenti dini
+DEFAULT_THRESHOLD = 80.0
+# Jumlah halaman berturut-turut dengan label stabil di atas threshold
+DEFAULT_PATIENCE = 3
+DEFAULT_MAX_PAGES = 60
+DEFAULT_TIME_LIMIT = 20.0
+
+
+def classify_pages(
+    model,
+    pages: Iterable[tuple[int, str]],
+    preprocess=None,
+    threshold: float = DEFAULT_THRESHOLD,
+    patience: int = DEFAULT_PATIENCE,
+    max_pages: int = DEFAULT_MAX_PAGES,
+    time_limit: float = DEFAULT_TIME_LIMIT,
+    top_k: int = 3,
+) -> dict:
+    """Klasifikasikan dokumen dari iterator (nomor halaman, teks) dengan penghentian dini.
+
+    ``stopped`` pada hasil berisi alasan berhenti: ``confident``,
+    ``max_pages``, ``time_limit``, atau ``end`` (semua halaman terbaca).
+    """
+    start = time.perf_counter()
+    classes = model.classes_
+    total = np.zeros(len(classes))
+    weight = 0.0
+    pages_read = 0
+    last_page = 0
+    streak = 0
+    label = None
+    stopped = "end"
+
+    iterator = iter(pages)
+    try:
+        for page_no, text in iterator:
+            pages_read += 1
+            last_page = page_no
+            if preprocess is not None:
+                text = preprocess(text)
+            if text:
+                total += len(text) * model.predict_proba([text])[0]
+                weight += len(text)
+                proba = total / weight
+                best = int(proba.argmax())
+                confident = proba[best] * 100 >= threshold
+                streak = streak + 1 if confident and classes[best] == label else int(confident)
+                label = classes[best]
+
+            if streak >= patience:
+                stopped = "confident"
+                break
+            if pages_read >= max_pages:
+                stopped = "max_pages"
+                break
+            if time.perf_counter() - start >= time_limit:
+                stopped = "time_limit"
+                break
+    finally:
+        # Tutup generator agar file PDF dilepas walaupun berhenti di tengah
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+    result = {
+        "label": None,
+        "confidence": None,
+        "top_k": [],
+        "pages_read": pages_read,
+        "last_page": last_page,
+        "stopped": stopped,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+    if weight:
+        proba = total / weight
+        best = int(proba.argmax())
+        result["label"] = str(classes[best])
+        result["confidence"] = round(float(proba[best]) * 100, 1)
+        result["top_k"] = [
+            {"department": str(classes[i]), "probability": round(float(proba[i]), 4)}
+            for i in proba.argsort()[::-1][:top_k]
+        ]
+    return result
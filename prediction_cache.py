@@ -0,0 +1,80 @@
+"""
+Cache LRU in-process untuk hasil prediksi model.
+
+Banyak pengaduan berupa template yang hampir identik ("pinjol ilegal",
+"klaim asuransi ditolak"). Setelah ekspansi sinonim dan pembersihan teks,
+input-input tersebut menjadi string yang sama persis, sehingga hasil
+vectorizer + predict_proba cukup dihitung sekali.
+
+Cache dikunci teks ternormalisasi ``clean_text(expand_synonyms(text))`` dan
+dikosongkan oleh pemanggil (``clear()``) ketika model baru dipasang.
+Penghitung hit, miss, dan eviction tersedia melalui ``stats()``.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+
+def file_fingerprint(paths: list[str]) -> tuple:
+    """Sidik jari (path, mtime, ukuran) dari daftar file; file hilang bernilai None."""
+    fingerprint = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            fingerprint.append((path, st.st_mtime_ns, st.st_size))
+        except OSError:
+            fingerprint.append((path, None, None))
+    return tuple(fingerprint)
+
+
+class PredictionCache:
+    """LRU thread-safe dengan penghitung hit/miss/eviction/invalidasi."""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str):
+        """Nilai untuk ``key`` atau None; entri yang ditemukan menjadi paling baru."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,269 @@
+"""
+Launcher produksi: app.py dilayani beberapa worker hasil fork dari satu proses induk.
+
+``app.run(debug=True)`` hanya satu proses, dan menjalankan beberapa server
+terpisah berarti setiap proses memuat modelnya sendiri. Launcher ini:
+
+1. meng-import app.py sekali di proses induk (model, SynonymExpander,
+   regex, tabel departemen) lalu memanaskannya lewat test client agar
+   cache lazy seperti regex ``re``, template Jinja, dan analyzer vectorizer
+   sudah terisi,
+2. menghentikan thread hot reload, menjalankan ``gc.collect()`` dan
+   ``gc.freeze()`` sehingga objek yang sudah ada tidak lagi disentuh
+   garbage collector di worker (pemindaian GC menulis ke header objek dan
+   memaksa copy-on-write halaman memori),
+3. membuka socket listen lalu mem-fork N worker yang berbagi halaman memori
+   tersebut; setiap worker menerima koneksi dari socket yang sama. Worker
+   tidak menjalankan hot reload; versi model baru hanya dipasang lewat
+   restart bertahap SIGHUP agar model tetap dibagi bersama.
+
+Sinyal ke proses induk:
+    SIGHUP          restart bertahap: induk memeriksa versi model baru,
+                    lalu worker diganti satu per satu; worker lama
+                    menyelesaikan request yang sedang berjalan
+    SIGUSR1         cetak RSS, PSS, dan memori bersama/privat per worker
+    SIGTERM/SIGINT  berhenti dengan graceful
+
+Worker yang mati tiba-tiba langsung diganti. Hanya untuk Linux (fork dan
+/proc/<pid>/smaps_rollup).
+
+    python prefork.py --workers 4 --port 8000
+    kill -HUP <pid induk>      # setelah train_model.py menyimpan versi baru
+    kill -USR1 <pid induk>
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+
+DEFAULT_WORKERS = int(os.environ.get("OJK_WORKERS", "0")) or os.cpu_count() or 1
+# Batas waktu (detik) worker menyelesaikan request sebelum dihentikan paksa
+GRACEFUL_TIMEOUT = 30.0
+# Interval worker memeriksa sinyal berhenti saat tidak ada koneksi masuk
+POLL_INTERVAL = 0.5
+
+
+def load_application():
+    """Import dan panaskan app.py di proses induk."""
+    import app as application
+
+    client = application.app.test_client()
+    client.get("/")
+    for text in application.MODEL_WARMUP_TEXTS:
+        client.post("/", data={"complaint": text})
+    client.post("/api/classify", json={"texts": application.MODEL_WARMUP_TEXTS, "top_k": 3, "explain": True})
+    application.prediction_cache.clear()
+    application.model_reloader.stop()
+    return application
+
+
+def memory_info(pid: int) -> dict[str, float]:
+    """RSS, PSS, memori bersama dan privat (MB) dari /proc/<pid>/smaps_rollup."""
+    values: dict[str, int] = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss_mb": values.get("Rss", 0) / 1024,
+        "pss_mb": values.get("Pss", 0) / 1024,
+        "shared_mb": (values.get("Shared_Clean", 0) + values.get("Shared_Dirty", 0)) / 1024,
+        "private_mb": (values.get("Private_Clean", 0) + values.get("Private_Dirty", 0)) / 1024,
+    }
+
+
+def print_memory_report(master_pid: int, worker_pids: list[int]) -> None:
+    print(f"{'Process':<16} {'RSS MB':>8} {'PSS MB':>8} {'Shared MB':>10} {'Private MB':>11}", flush=True)
+    total_pss = 0.0
+    for label, pid in [("master", master_pid)] + [("worker", pid) for pid in worker_pids]:
+        try:
+            info = memory_info(pid)
+        except OSError:
+            continue
+        total_pss += info["pss_mb"]
+        print(f"{label + ' ' + str(pid):<16} {info['rss_mb']:>8.1f} {info['pss_mb']:>8.1f} "
+              f"{info['shared_mb']:>10.1f} {info['private_mb']:>11.1f}")
+    print(f"{'total (PSS)':<16} {'':>8} {total_pss:>8.1f}", flush=True)
+
+
+class Worker:
+    """Loop server satu proses worker; request yang sedang diproses selalu diselesaikan."""
+
+    def __init__(self, application, sock: socket.socket, master_pid: int):
+        self.application = application
+        self.sock = sock
+        self.master_pid = master_pid
+        self.stopping = False
+
+    def _stop(self, signum, frame) -> None:
+        self.stopping = True
+
+    def run(self) -> None:
+        from werkzeug.serving import make_server
+
+        signal.signal(signal.SIGTERM, self._stop)
+        # Ctrl-C ditangani induk, yang meneruskan SIGTERM ke worker
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        for signum in (signal.SIGHUP, signal.SIGUSR1, signal.SIGCHLD):
+            signal.signal(signum, signal.SIG_DFL)
+        # Hot reload sengaja tidak dinyalakan: model baru dimuat sekali di
+        # induk saat SIGHUP lalu dibagikan ke worker baru lewat fork, bukan
+        # di-unpickle ulang oleh setiap worker.
+
+        server = make_server("", 0, self.application.app, fd=self.sock.fileno())
+        server.timeout = POLL_INTERVAL
+        while not self.stopping and os.getppid() == self.master_pid:
+            server.handle_request()
+        server.server_close()
+
+
+class Arbiter:
+    """Proses induk: fork, pantau, restart bertahap, dan hentikan worker."""
+
+    def __init__(
+        self, application, sock: socket.socket, workers: int,
+        graceful_timeout: float = GRACEFUL_TIMEOUT, gc_freeze: bool = True,
+    ):
+        self.application = application
+        self.sock = sock
+        self.n_workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.gc_freeze = gc_freeze
+        self.workers: set[int] = set()
+        # Worker yang sedang diminta berhenti dan worker yang keluar tanpa diminta
+        self._retiring: set[int] = set()
+        self._lost: list[int] = []
+        self.pid = os.getpid()
+        self._signals: list[int] = []
+
+    def _queue_signal(self, signum, frame) -> None:
+        self._signals.append(signum)
+
+    def spawn(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                Worker(self.application, self.sock, self.pid).run()
+            except BaseException:
+                import traceback
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        self.workers.add(pid)
+        return pid
+
+    def freeze(self) -> None:
+        """Bekukan objek induk sebelum fork agar GC worker tidak menyalin halamannya."""
+        gc.collect()
+        if self.gc_freeze:
+            gc.freeze()
+
+    def reap(self) -> None:
+        """Kumpulkan worker yang sudah keluar; yang keluar tanpa diminta dicatat di ``_lost``."""
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if pid in self.workers:
+                self.workers.discard(pid)
+                if pid in self._retiring:
+                    self._retiring.discard(pid)
+                else:
+                    self._lost.append(pid)
+
+    def stop_workers(self, pids, timeout: float) -> None:
+        """SIGTERM ke ``pids``, tunggu sampai ``timeout`` detik, lalu SIGKILL yang tersisa."""
+        pids = set(pids)
+        self._retiring |= pids
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + timeout
+        while pids & self.workers and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.05)
+        for pid in pids & self.workers:
+            os.kill(pid, signal.SIGKILL)
+        while pids & self.workers:
+            self.reap()
+            time.sleep(0.01)
+
+    def restart(self) -> None:
+        """Ganti worker satu per satu dengan model terbaru; layanan tidak pernah kosong."""
+        reloaded = self.application.model_reloader.check()
+        info = self.application.model_info
+        print(f"[prefork] graceful restart (model {info.get('version') or info.get('source')}"
+              f"{', reloaded' if reloaded else ''})", flush=True)
+        gc.unfreeze()
+        self.freeze()
+        for old in list(self.workers):
+            self.spawn()
+            self.stop_workers([old], self.graceful_timeout)
+
+    def run(self) -> None:
+        for signum in (signal.SIGHUP, signal.SIGUSR1, signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self._queue_signal)
+        self.freeze()
+        for _ in range(self.n_workers):
+            self.spawn()
+        print(f"[prefork] master {self.pid}, workers {sorted(self.workers)}", flush=True)
+
+        while True:
+            while self._signals:
+                signum = self._signals.pop(0)
+                if signum in (signal.SIGTERM, signal.SIGINT):
+                    print("[prefork] shutting down", flush=True)
+                    self.stop_workers(list(self.workers), self.graceful_timeout)
+                    return
+                if signum == signal.SIGHUP:
+                    self.restart()
+                elif signum == signal.SIGUSR1:
+                    print_memory_report(self.pid, sorted(self.workers))
+            self.reap()
+            while self._lost:
+                print(f"[prefork] worker {self._lost.pop()} exited unexpectedly, respawning", flush=True)
+                self.spawn()
+            time.sleep(0.1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Jalankan app.py dengan beberapa worker hasil fork.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Jumlah worker (default: jumlah core).")
+    parser.add_argument(
+        "--graceful-timeout", type=float, default=GRACEFUL_TIMEOUT,
+        help="Detik menunggu worker menyelesaikan request saat restart/berhenti.",
+    )
+    parser.add_argument("--no-gc-freeze", action="store_true", help="Tanpa gc.freeze (untuk perbandingan memori).")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers harus >= 1")
+
+    start = time.perf_counter()
+    application = load_application()
+    print(f"[prefork] application loaded and warmed up in {time.perf_counter() - start:.2f}s", flush=True)
+
+    sock = socket.create_server((args.host, args.port), backlog=2048)
+    sock.set_inheritable(True)
+    print(f"[prefork] listening on http://{args.host}:{args.port}", flush=True)
+    try:
+        Arbiter(application, sock, args.workers, args.graceful_timeout, gc_freeze=not args.no_gc_freeze).run()
+    finally:
+        sock.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,565 @@
+"""
+Pencarian full-text regulasi: inverted index dengan ranking BM25 dan query frasa.
+
+Berbeda dengan ``similarity_index.py`` (kemiripan dokumen dengan dokumen),
+indeks ini menjawab "regulasi mana yang menyebut istilah X". Indeks terdiri
+dari segmen yang tidak pernah diubah setelah ditulis:
+
+    search_index/
+        meta.json               segmen aktif dan dokumen terhapus per segmen
+        seg-000001/
+            terms.txt           term terurut alfabetis
+            term_ptr.npy        offset posting per term (jumlah term + 1)
+            doc_deltas.npy      ID dokumen lokal per posting, delta-encoded per term
+            tfs.npy             frekuensi term per posting
+            term_pos_ptr.npy    offset posisi per term (jumlah term + 1)
+            pos_deltas.npy      posisi token per posting, delta-encoded per posting
+            doc_lengths.npy     jumlah token per dokumen
+            text.bin, text_ptr.npy
+                                teks dokumen (UTF-8) untuk snippet
+            anchors.npy, anchor_ptr.npy
+                                offset byte setiap token ke-64 per dokumen
+            docs.jsonl          filename, hash konten, departemen prediksi model
+
+Array disimpan dengan tipe unsigned terkecil yang cukup (delta biasanya
+muat di uint8/uint16) dan dimuat dengan memory-map; posting satu term
+di-decode dengan ``np.cumsum`` tanpa loop Python. Query frasa dicocokkan
+dari posisi token: pasangan (dokumen, posisi - offset kata) setiap kata
+frasa diiriskan dengan ``np.intersect1d``.
+
+``add`` menulis dokumen baru atau yang kontennya berubah sebagai segmen
+baru; versi lama dokumen ditandai terhapus di ``meta.json``, yang diganti
+secara atomik. ``merge`` menulis ulang semua dokumen aktif menjadi satu
+segmen. Statistik BM25 (jumlah dokumen, panjang rata-rata, df) dihitung
+dari dokumen aktif saja.
+
+Sintaks query: kata dipisah spasi dicari dengan OR dan diranking BM25;
+teks dalam tanda kutip adalah frasa yang wajib muncul utuh.
+
+    python search_index.py build                             # output_pojk.csv -> search_index/
+    python search_index.py add --input output_pojk_baru.csv  # hanya dokumen baru/berubah
+    python search_index.py search "suku bunga dasar kredit"
+    python search_index.py search '"bursa karbon"'
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from corpus_io import iter_documents
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INPUT_PATH = os.path.join(BASE_DIR, "output_pojk.csv")
+INDEX_DIR = os.environ.get("OJK_SEARCH_INDEX", os.path.join(BASE_DIR, "search_index"))
+INDEX_FORMAT_VERSION = 1
+DEFAULT_TOP_K = 10
+# Parameter BM25 standar
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+# Jarak antar-anchor (token) untuk memulai tokenisasi snippet di tengah dokumen
+ANCHOR_EVERY = 64
+SNIPPET_TOKENS = 30
+
+# Token sama dengan karakter yang disisakan extract_pdf.clean_text
+TOKEN_RE = re.compile(rb"[A-Za-z]+")
+_QUERY_RE = re.compile(r'"([^"]*)"?|(\S+)')
+_ARRAYS = (
+    "term_ptr", "doc_deltas", "tfs", "term_pos_ptr", "pos_deltas",
+    "doc_lengths", "text_ptr", "anchors", "anchor_ptr",
+)
+# Posisi token < 2**32, sehingga (dokumen, posisi) muat dalam satu int64
+_POSITION_BITS = 32
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def tokenize(text: str) -> list[str]:
+    """Token huruf lowercase, sama dengan tokenisasi saat indexing."""
+    return [token.lower().decode("ascii") for token in TOKEN_RE.findall(text.encode("utf-8"))]
+
+
+def parse_query(query: str) -> tuple[list[str], list[list[str]]]:
+    """Pisahkan query menjadi kata bebas dan frasa (teks dalam tanda kutip)."""
+    terms: list[str] = []
+    phrases: list[list[str]] = []
+    for match in _QUERY_RE.finditer(query):
+        if match.group(1) is not None:
+            phrase = tokenize(match.group(1))
+            if phrase:
+                phrases.append(phrase)
+        else:
+            terms.extend(tokenize(match.group(2)))
+    return terms, phrases
+
+
+def _narrow(values: np.ndarray) -> np.ndarray:
+    """Cast ke tipe unsigned terkecil yang memuat nilai maksimum."""
+    return values.astype(np.min_scalar_type(int(values.max()) if len(values) else 0))
+
+
+def write_segment(path: str, documents: list[dict]) -> dict:
+    """Tulis dokumen ``{"filename", "content", "department"}`` sebagai satu segmen di ``path``."""
+    vocabulary: dict[bytes, int] = {}
+    doc_terms: list[np.ndarray] = []
+    doc_lengths = np.zeros(len(documents), dtype=np.int64)
+    text_ptr = np.zeros(len(documents) + 1, dtype=np.int64)
+    anchors: list[np.ndarray] = []
+    anchor_ptr = np.zeros(len(documents) + 1, dtype=np.int64)
+
+    os.makedirs(path)
+    with open(os.path.join(path, "text.bin"), "wb") as text_file, \
+            open(os.path.join(path, "docs.jsonl"), "w", encoding="utf-8") as docs_file:
+        for doc_id, doc in enumerate(documents):
+            data = doc["content"].encode("utf-8")
+            matches = list(TOKEN_RE.finditer(data))
+            ids = [vocabulary.setdefault(m.group().lower(), len(vocabulary)) for m in matches]
+            doc_terms.append(np.array(ids, dtype=np.int64))
+            doc_lengths[doc_id] = len(ids)
+            anchors.append(np.array([matches[i].start() for i in range(0, len(matches), ANCHOR_EVERY)], dtype=np.int64))
+            anchor_ptr[doc_id + 1] = anchor_ptr[doc_id] + len(anchors[-1])
+            text_file.write(data)
+            text_ptr[doc_id + 1] = text_ptr[doc_id] + len(data)
+            docs_file.write(json.dumps({
+                "filename": doc["filename"],
+                "hash": content_hash(doc["content"]),
+                "department": doc.get("department") or "",
+            }, ensure_ascii=False) + "\n")
+
+    terms = sorted(vocabulary)
+    remap = np.empty(len(terms), dtype=np.int64)
+    remap[[vocabulary[term] for term in terms]] = np.arange(len(terms))
+    n_tokens = int(doc_lengths.sum())
+    token_terms = remap[np.concatenate(doc_terms)] if n_tokens else np.zeros(0, dtype=np.int64)
+    token_docs = np.repeat(np.arange(len(documents)), doc_lengths)
+    token_positions = np.arange(n_tokens) - np.repeat(np.cumsum(doc_lengths) - doc_lengths, doc_lengths)
+
+    # Urutkan per term; sort stabil mempertahankan urutan dokumen dan posisi
+    order = np.argsort(token_terms, kind="stable")
+    token_terms, token_docs, token_positions = token_terms[order], token_docs[order], token_positions[order]
+    new_posting = np.ones(n_tokens, dtype=bool)
+    new_posting[1:] = (token_terms[1:] != token_terms[:-1]) | (token_docs[1:] != token_docs[:-1])
+    starts = np.flatnonzero(new_posting)
+    posting_terms = token_terms[starts]
+    posting_docs = token_docs[starts]
+    tfs = np.diff(np.append(starts, n_tokens))
+    term_ptr = np.searchsorted(posting_terms, np.arange(len(terms) + 1))
+    term_pos_ptr = np.append(starts, n_tokens)[term_ptr]
+
+    doc_deltas = posting_docs.copy()
+    doc_deltas[1:] -= posting_docs[:-1]
+    doc_deltas[term_ptr[:-1]] = posting_docs[term_ptr[:-1]]
+    pos_deltas = token_positions.copy()
+    pos_deltas[1:] -= token_positions[:-1]
+    pos_deltas[starts] = token_positions[starts]
+
+    with open(os.path.join(path, "terms.txt"), "w", encoding="ascii") as f:
+        f.write("\n".join(term.decode("ascii") for term in terms))
+    arrays = {
+        "term_ptr": term_ptr, "doc_deltas": doc_deltas, "tfs": tfs,
+        "term_pos_ptr": term_pos_ptr, "pos_deltas": pos_deltas, "doc_lengths": doc_lengths,
+        "text_ptr": text_ptr, "anchors": np.concatenate(anchors) if anchors else np.zeros(0, dtype=np.int64),
+        "anchor_ptr": anchor_ptr,
+    }
+    for name, values in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), _narrow(values))
+    return {"documents": len(documents), "terms": len(terms), "postings": len(starts), "tokens": n_tokens}
+
+
+class Segment:
+    """Satu segmen indeks yang dibaca dengan memory-map."""
+
+    def __init__(self, path: str, deleted=()):
+        self.path = path
+        for name in _ARRAYS:
+            setattr(self, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r"))
+        with open(os.path.join(path, "terms.txt"), encoding="ascii") as f:
+            self.vocabulary = {term: i for i, term in enumerate(f.read().split("\n")) if term}
+        with open(os.path.join(path, "docs.jsonl"), encoding="utf-8") as f:
+            self.docs = [json.loads(line) for line in f]
+        self.text = np.memmap(os.path.join(path, "text.bin"), dtype=np.uint8, mode="r") \
+            if self.text_ptr[-1] else np.zeros(0, dtype=np.uint8)
+        self.live = np.ones(len(self.docs), dtype=bool)
+        self.live[list(deleted)] = False
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def postings(self, term: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(dokumen, tf, posisi) untuk ``term``; posisi berurutan per dokumen, panjang = tf."""
+        t = self.vocabulary.get(term)
+        if t is None:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty
+        lo, hi = int(self.term_ptr[t]), int(self.term_ptr[t + 1])
+        docs = np.cumsum(self.doc_deltas[lo:hi], dtype=np.int64)
+        tfs = self.tfs[lo:hi].astype(np.int64)
+        deltas = self.pos_deltas[int(self.term_pos_ptr[t]):int(self.term_pos_ptr[t + 1])].astype(np.int64)
+        running = np.cumsum(deltas)
+        first = np.cumsum(tfs) - tfs
+        positions = running - np.repeat(running[first] - deltas[first], tfs)
+        return docs, tfs, positions
+
+    def phrase_counts(self, phrase: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(dokumen, jumlah kemunculan, posisi awal) frasa di segmen ini."""
+        keys = None
+        for offset, term in enumerate(phrase):
+            docs, tfs, positions = self.postings(term)
+            term_keys = (np.repeat(docs, tfs) << _POSITION_BITS) + positions - offset
+            keys = term_keys if keys is None else np.intersect1d(keys, term_keys, assume_unique=True)
+            if not len(keys):
+                break
+        docs, counts = np.unique(keys >> _POSITION_BITS, return_counts=True)
+        return docs, counts, keys & ((1 << _POSITION_BITS) - 1)
+
+    def snippet(self, doc: int, positions: np.ndarray, length: int = SNIPPET_TOKENS) -> str:
+        """Potongan teks ``length`` token di sekitar kumpulan posisi query terpadat."""
+        positions = np.sort(positions)
+        if len(positions):
+            window_hits = np.searchsorted(positions, positions + length // 2) - np.arange(len(positions))
+            start = max(0, int(positions[int(np.argmax(window_hits))]) - length // 4)
+        else:
+            start = 0
+        text_start, text_end = int(self.text_ptr[doc]), int(self.text_ptr[doc + 1])
+        anchor = int(self.anchor_ptr[doc]) + start // ANCHOR_EVERY
+        offset = text_start + int(self.anchors[anchor]) if anchor < int(self.anchor_ptr[doc + 1]) else text_end
+        skip = start % ANCHOR_EVERY
+        spans: list[tuple[int, int]] = []
+        # Tokenisasi bertahap dari anchor sampai token terakhir snippet
+        chunk = 4096
+        while len(spans) < skip + length and offset < text_end:
+            end = min(offset + chunk, text_end)
+            matches = list(TOKEN_RE.finditer(bytes(self.text[offset:end])))
+            if end < text_end and matches and matches[-1].end() == end - offset:
+                # Token terakhir mungkin terpotong batas chunk
+                matches.pop()
+            if not matches:
+                if end == text_end:
+                    break
+                chunk *= 2
+                continue
+            spans.extend((offset + m.start(), offset + m.end()) for m in matches)
+            offset += matches[-1].end()
+        spans = spans[skip:skip + length]
+        if not spans:
+            return ""
+        text = bytes(self.text[spans[0][0]:spans[-1][1]]).decode("utf-8", errors="ignore")
+        prefix = "..." if start > 0 else ""
+        suffix = "..." if spans[-1][1] < text_end else ""
+        return f"{prefix}{text}{suffix}"
+
+
+class SearchIndex:
+    """Inverted index tersegmen dengan ranking BM25 dan query frasa."""
+
+    def __init__(self, path: str = INDEX_DIR, k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                self.meta = json.load(f)
+            if self.meta.get("format_version") != INDEX_FORMAT_VERSION:
+                raise ValueError(f"Format indeks {path} tidak dikenal; bangun ulang")
+        else:
+            self.meta = {"format_version": INDEX_FORMAT_VERSION, "next_segment": 1, "segments": []}
+        self.segments = [
+            Segment(os.path.join(path, entry["name"]), entry["deleted"]) for entry in self.meta["segments"]
+        ]
+        # filename -> (segmen, dokumen lokal) untuk versi aktif setiap dokumen
+        self._documents: dict[str, tuple[int, int]] = {}
+        for s, segment in enumerate(self.segments):
+            for d, doc in enumerate(segment.docs):
+                if segment.live[d]:
+                    self._documents[doc["filename"]] = (s, d)
+
+    @classmethod
+    def load(cls, path: str = INDEX_DIR, **kwargs) -> "SearchIndex":
+        """Buka indeks yang sudah dibangun; FileNotFoundError jika belum ada."""
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            raise FileNotFoundError(os.path.join(path, "meta.json"))
+        return cls(path, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    # -- tulis --------------------------------------------------------------
+
+    def _write_meta(self) -> None:
+        tmp = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(self.path, "meta.json"))
+
+    def add(self, documents, predict=None) -> dict:
+        """Tambahkan dokumen ``{"filename", "content"}`` baru atau yang berubah sebagai segmen baru.
+
+        ``predict(texts) -> labels`` mengisi departemen prediksi model untuk
+        dokumen yang ditulis. Mengembalikan jumlah dokumen ``added``,
+        ``updated`` dan ``unchanged``.
+        """
+        stats = {"added": 0, "updated": 0, "unchanged": 0}
+        pending: dict[str, dict] = {}
+        for doc in documents:
+            current = self._documents.get(doc["filename"])
+            if current is not None:
+                s, d = current
+                if self.segments[s].docs[d]["hash"] == content_hash(doc["content"]):
+                    stats["unchanged"] += 1
+                    continue
+            if doc["filename"] in pending:
+                raise ValueError(f"Nama file ganda: {doc['filename']!r}")
+            stats["updated" if current is not None else "added"] += 1
+            pending[doc["filename"]] = {"filename": doc["filename"], "content": doc["content"]}
+        if not pending:
+            return stats
+
+        new_docs = list(pending.values())
+        if predict is not None:
+            for doc, label in zip(new_docs, predict([doc["content"] for doc in new_docs])):
+                doc["department"] = label
+        os.makedirs(self.path, exist_ok=True)
+        name = f"seg-{self.meta['next_segment']:06d}"
+        tmp = os.path.join(self.path, f".{name}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        write_segment(tmp, new_docs)
+        os.rename(tmp, os.path.join(self.path, name))
+
+        for filename in pending:
+            if filename in self._documents:
+                s, d = self._documents[filename]
+                self.meta["segments"][s]["deleted"].append(d)
+        self.meta["segments"].append({"name": name, "documents": len(new_docs), "deleted": []})
+        self.meta["next_segment"] += 1
+        # meta.json ditulis terakhir: baru sekarang segmen baru terlihat oleh pembaca
+        self._write_meta()
+        self.__init__(self.path, self.k1, self.b)
+        return stats
+
+    def sync(self, input_path: str, predict=None) -> dict:
+        """Samakan isi indeks dengan korpus CSV/JSONL (kolom ``filename``, ``content``)."""
+        return self.add(iter_documents(input_path), predict=predict)
+
+    def merge(self) -> int:
+        """Gabungkan semua segmen menjadi satu tanpa dokumen terhapus; mengembalikan jumlah segmen lama."""
+        if len(self.segments) <= 1 and not any(entry["deleted"] for entry in self.meta["segments"]):
+            return 0
+        documents = []
+        for s, d in sorted(self._documents.values()):
+            segment = self.segments[s]
+            text = bytes(segment.text[int(segment.text_ptr[d]):int(segment.text_ptr[d + 1])]).decode("utf-8")
+            documents.append({**segment.docs[d], "content": text})
+        name = f"seg-{self.meta['next_segment']:06d}"
+        tmp = os.path.join(self.path, f".{name}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        write_segment(tmp, documents)
+        os.rename(tmp, os.path.join(self.path, name))
+
+        old = [entry["name"] for entry in self.meta["segments"]]
+        self.meta["segments"] = [{"name": name, "documents": len(documents), "deleted": []}]
+        self.meta["next_segment"] += 1
+        self._write_meta()
+        # Pembaca yang masih memegang memory-map segmen lama tidak terganggu (Linux)
+        for entry in old:
+            shutil.rmtree(os.path.join(self.path, entry), ignore_errors=True)
+        self.__init__(self.path, self.k1, self.b)
+        return len(old)
+
+    # -- cari ---------------------------------------------------------------
+
+    def search(self, query: str, top_k: int = DEFAULT_TOP_K) -> dict:
+        """Dokumen teratas untuk ``query``: ``{"total", "results"}``.
+
+        Setiap hasil memuat ``filename``, ``department`` (prediksi model saat
+        dokumen diindeks), ``score`` BM25, dan ``snippet``.
+        """
+        terms, phrases = parse_query(query)
+        terms = list(dict.fromkeys(terms))
+        n_docs = len(self)
+        if not n_docs or not (terms or phrases):
+            return {"total": 0, "results": []}
+        lengths = [segment.doc_lengths.astype(np.float64) for segment in self.segments]
+        avgdl = sum(float(length[segment.live].sum()) for length, segment in zip(lengths, self.segments)) / n_docs
+
+        # Posting per segmen: (dokumen, tf, posisi); dokumen terhapus dibuang
+        matches: list[tuple[list, list]] = []
+        for segment in self.segments:
+            term_postings = [segment.postings(term) for term in terms]
+            phrase_postings = [segment.phrase_counts(phrase) for phrase in phrases]
+            matches.append((
+                [self._live(segment, *posting) for posting in term_postings],
+                [self._live(segment, *posting) for posting in phrase_postings],
+            ))
+
+        def idf(df: int) -> float:
+            return float(np.log(1 + (n_docs - df + 0.5) / (df + 0.5)))
+
+        term_idf = [idf(sum(len(m[0][i][0]) for m in matches)) for i in range(len(terms))]
+        phrase_idf = [idf(sum(len(m[1][i][0]) for m in matches)) for i in range(len(phrases))]
+
+        candidates = []
+        total = 0
+        for s, (segment, (term_matches, phrase_matches)) in enumerate(zip(self.segments, matches)):
+            scores = np.zeros(len(segment))
+            # Dokumen harus memuat semua frasa; tanpa frasa cukup salah satu kata
+            required = np.ones(len(segment), dtype=bool) if phrases else np.zeros(len(segment), dtype=bool)
+            norm = self.k1 * (1 - self.b + self.b * lengths[s] / avgdl)
+            for (docs, tfs, _), weight in zip(term_matches, term_idf):
+                scores[docs] += weight * tfs * (self.k1 + 1) / (tfs + norm[docs])
+                if not phrases:
+                    required[docs] = True
+            for (docs, counts, _), weight in zip(phrase_matches, phrase_idf):
+                scores[docs] += weight * counts * (self.k1 + 1) / (counts + norm[docs])
+                mask = np.zeros(len(segment), dtype=bool)
+                mask[docs] = True
+                required &= mask
+            matching = np.flatnonzero(required & segment.live)
+            total += len(matching)
+            if len(matching) > top_k:
+                matching = matching[np.argpartition(-scores[matching], top_k - 1)[:top_k]]
+            candidates.extend((float(scores[d]), s, int(d)) for d in matching)
+
+        best = sorted(candidates, key=lambda c: (-c[0], c[1], c[2]))[:top_k]
+        results = []
+        for score, s, d in best:
+            segment = self.segments[s]
+            term_matches, phrase_matches = matches[s]
+            positions = [
+                positions[np.repeat(docs, tfs) == d]
+                for docs, tfs, positions in term_matches + phrase_matches
+            ]
+            doc = segment.docs[d]
+            results.append({
+                "filename": doc["filename"],
+                "department": doc["department"],
+                "score": round(score, 4),
+                "snippet": segment.snippet(d, np.concatenate(positions) if positions else np.zeros(0, dtype=np.int64)),
+            })
+        return {"total": total, "results": results}
+
+    @staticmethod
+    def _live(segment: Segment, docs: np.ndarray, counts: np.ndarray, positions: np.ndarray):
+        """Buang posting dokumen terhapus dari (dokumen, jumlah, posisi)."""
+        if segment.live.all():
+            return docs, counts, positions
+        keep = segment.live[docs]
+        return docs[keep], counts[keep], positions[np.repeat(keep, counts)]
+
+    def info(self) -> dict:
+        size = 0
+        for entry in self.meta["segments"]:
+            directory = os.path.join(self.path, entry["name"])
+            size += sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        postings_size = sum(
+            getattr(segment, name).nbytes
+            for segment in self.segments
+            for name in ("term_ptr", "doc_deltas", "tfs", "term_pos_ptr", "pos_deltas")
+        )
+        return {
+            "documents": len(self),
+            "deleted": sum(len(entry["deleted"]) for entry in self.meta["segments"]),
+            "segments": len(self.segments),
+            "terms": sum(len(segment.vocabulary) for segment in self.segments),
+            "postings": sum(len(segment.doc_deltas) for segment in self.segments),
+            "tokens": sum(int(segment.doc_lengths.sum()) for segment in self.segments),
+            "postings_mb": postings_size / 1024 / 1024,
+            "size_mb": size / 1024 / 1024,
+        }
+
+
+def build_index(input_path: str, path: str = INDEX_DIR, predict=None) -> dict:
+    """Bangun indeks baru dari korpus di direktori sementara lalu ganti ``path``.
+
+    Indeks lama tetap bisa dibaca selama build; jika build gagal, indeks
+    lama tidak tersentuh. Mengembalikan statistik ``SearchIndex.add``.
+    """
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=".search-", dir=parent)
+    try:
+        stats = SearchIndex(tmp).sync(input_path, predict=predict)
+        # Rename direktori bersifat atomik, sama dengan similarity_index.build_index
+        old = None
+        if os.path.isdir(path):
+            old = tempfile.mkdtemp(prefix=".search-old-", dir=parent)
+            os.rename(path, os.path.join(old, "index"))
+        os.rename(tmp, path)
+        if old is not None:
+            shutil.rmtree(old, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return stats
+
+
+def model_predictor():
+    """Fungsi prediksi departemen dari model versi aktif (train_model.load_active_pipeline)."""
+    from train_model import load_active_pipeline
+
+    pipeline = load_active_pipeline()
+    return lambda texts: pipeline.predict(texts).tolist()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pencarian full-text BM25 atas korpus regulasi.")
+    parser.add_argument("--index", default=INDEX_DIR, help="Direktori indeks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Bangun ulang indeks dari korpus CSV/JSONL.")
+    build.add_argument("--input", default=INPUT_PATH, help="Korpus (kolom filename, content).")
+    add = sub.add_parser("add", help="Tambahkan dokumen baru/berubah dari korpus sebagai segmen baru.")
+    add.add_argument("--input", default=INPUT_PATH, help="Korpus (kolom filename, content).")
+    search = sub.add_parser("search", help='Cari dokumen; gunakan tanda kutip untuk frasa: \'"bursa karbon"\'.')
+    search.add_argument("query")
+    search.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    search.add_argument("--json", action="store_true", help="Cetak hasil sebagai JSON.")
+    sub.add_parser("merge", help="Gabungkan segmen dan buang dokumen terhapus.")
+    sub.add_parser("info", help="Ringkasan isi indeks.")
+    args = parser.parse_args(argv)
+
+    if args.command in ("build", "add"):
+        start = time.perf_counter()
+        if args.command == "build":
+            stats = build_index(args.input, args.index, predict=model_predictor())
+        else:
+            stats = SearchIndex(args.index).sync(args.input, predict=model_predictor())
+        print(f"{stats['added']} added, {stats['updated']} updated, {stats['unchanged']} unchanged "
+              f"in {time.perf_counter() - start:.2f}s -> '{args.index}'")
+        return
+    try:
+        index = SearchIndex.load(args.index)
+    except FileNotFoundError:
+        sys.exit(f"Indeks belum dibangun: python search_index.py build --index {args.index}")
+
+    if args.command == "merge":
+        merged = index.merge()
+        print(f"Merged {merged} segment(s)" if merged else "Nothing to merge")
+    elif args.command == "info":
+        for key, value in index.info().items():
+            print(f"{key:<12} {value:.2f}" if isinstance(value, float) else f"{key:<12} {value}")
+    else:
+        start = time.perf_counter()
+        found = index.search(args.query, args.top_k)
+        elapsed = (time.perf_counter() - start) * 1000
+        if args.json:
+            print(json.dumps(found, ensure_ascii=False, indent=2))
+            return
+        print(f"{found['total']} of {len(index)} documents match ({elapsed:.1f} ms)\n")
+        for rank, result in enumerate(found["results"], 1):
+            print(f"{rank:<3} {result['score']:>7.3f}  {result['filename']}  [{result['department']}]")
+            print(f"    {result['snippet']}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""
+Klasifikasi dokumen peraturan per bagian (BAB, Pasal, Penjelasan, Lampiran).
+
+Satu POJK bisa berisi ratusan ribu karakter dan sebagian besar berupa
+boilerplate (konsiderans, penjelasan "Cukup jelas", lampiran format
+laporan). Memvektorisasi seluruh dokumen sebagai satu string membuat
+boilerplate tersebut mendominasi dan transformasinya lambat.
+
+Modul ini memecah teks hasil ekstraksi (yang sudah melalui ``clean_text``,
+sehingga nomor Pasal sudah hilang) di penanda struktural:
+
+- ``BAB <romawi> <Judul>`` membuka bagian batang tubuh baru,
+- ``PENJELASAN`` dan ``LAMPIRAN [romawi]`` membuka bagian penjelasan/lampiran,
+- judul ``Pasal`` (bukan rujukan seperti "dalam Pasal") menjadi batas chunk
+  di dalam bagian; Pasal berurutan digabung sampai sekitar ``chunk_chars``.
+
+Chunk diklasifikasikan per batch dengan satu panggilan ``predict_proba``
+(satu matriks sparse per batch), lalu probabilitasnya dirata-rata dengan
+bobot panjang chunk x bobot jenis bagian menjadi label dokumen beserta
+rincian per bagian. Teks diproses secara streaming dari iterable potongan
+(mis. per halaman), sehingga memori dibatasi oleh ukuran batch, bukan
+panjang dokumen.
+
+    python section_classifier.py                 # output_pojk.csv -> output_pojk_sections.csv
+    python section_classifier.py --format jsonl
+"""
+
+import argparse
+import itertools
+import json
+import os
+import re
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+
+from corpus_io import DocumentWriter, iter_records
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Target panjang chunk (karakter); Pasal digabung sampai mencapai target ini
+CHUNK_CHARS = 4000
+# Chunk tanpa batas Pasal dipotong paksa di spasi setelah melewati batas ini
+MAX_CHUNK_CHARS = 2 * CHUNK_CHARS
+# Jumlah chunk per panggilan predict_proba
+BATCH_SIZE = 64
+
+# Bobot kontribusi tiap jenis bagian ke label dokumen
+SECTION_WEIGHTS = {
+    "pembukaan": 0.5,
+    "bab": 1.0,
+    "penjelasan": 0.5,
+    "lampiran": 0.5,
+}
+# Urutan jenis bagian; penanda jenis yang lebih awal diabaikan setelah
+# bagian berikutnya dimulai (mis. "BAB XII" yang dikutip di lampiran).
+_KIND_ORDER = {"pembukaan": 0, "bab": 1, "penjelasan": 2, "lampiran": 3}
+
+_MARKER = re.compile(
+    r"\b(?:"
+    r"BAB\s+(?P<bab>[IVXLC]+)\b(?P<title>(?:\s+(?!Pasal\b|Bagian\b|Paragraf\b)(?:[A-Z][A-Za-z]+|dan)\b){1,10})"
+    r"|(?P<penjelasan>PENJELASAN)\b"
+    r"|LAMPIRAN(?P<lampiran>(?:\s+[IVXLC]+\b)?)"
+    r"|(?P<pasal>Pasal)(?=\s+[A-Z][A-Za-z])"
+    r")"
+)
+# Kata sebelum "Pasal"/"BAB" yang menandakan rujukan, bukan judul
+_REFERENCE_WORDS = frozenset({
+    "dalam", "dan", "atau", "danatau", "ketentuan", "sebagaimana", "dimaksud",
+    "pada", "ayat", "dengan", "berdasarkan", "terhadap", "melaksanakan", "Pasal",
+    "huruf", "angka", "menurut", "sesuai", "oleh", "bahwa", "dari", "di",
+})
+# Sisa buffer yang belum diproses agar penanda yang terpotong antar potongan
+# teks (dan judul BAB sesudahnya) tetap dikenali utuh
+_LOOKAHEAD = 200
+
+
+def load_model():
+    """Pipeline versi aktif di model store (``train_model.load_active_pipeline``)."""
+    # Di-import saat dipakai agar app.py tidak ikut memuat pandas/sklearn
+    from train_model import load_active_pipeline
+    return load_active_pipeline()
+
+
+def iter_document_pages(path: str) -> Iterator[tuple[str, Iterator[str]]]:
+    """Iterasi (filename, iterator teks halaman) dari CSV/JSONL tanpa menggabungkan halaman.
+
+    Baris JSONL ``extract_pdf.py`` berurutan per dokumen, sehingga halaman
+    cukup dikelompokkan per ``filename`` yang berurutan; baris ``error``
+    tidak memiliki teks. Iterator halaman harus habis dibaca sebelum
+    dokumen berikutnya diambil.
+    """
+    records = iter_records(path)
+    for filename, group in itertools.groupby(records, key=lambda record: record["filename"]):
+        yield filename, (record.get("content") or "" for record in group if not record.get("error"))
+
+
+def _preceding_word(text: str, pos: int) -> str:
+    start = text.rfind(" ", 0, max(pos - 1, 0))
+    return text[start + 1:pos].strip()
+
+
+def iter_chunks(
+    pieces: Iterable[str],
+    chunk_chars: int = CHUNK_CHARS,
+    max_chunk_chars: int = MAX_CHUNK_CHARS,
+) -> Iterator[tuple[str, str, str]]:
+    """Iterasi (jenis bagian, judul bagian, teks chunk) dari potongan teks berurutan.
+
+    ``pieces`` adalah teks yang sudah dibersihkan, misalnya satu string per
+    halaman; potongan digabung dengan spasi.
+    """
+    kind, title = "pembukaan", "PEMBUKAAN"
+    parts: list[str] = []
+    size = 0
+    buffer = ""
+
+    def take(text: str) -> Iterator[tuple[str, str, str]]:
+        nonlocal size
+        text = text.strip()
+        if not text:
+            return
+        parts.append(text)
+        size += len(text) + 1
+        while size > max_chunk_chars:
+            joined = " ".join(parts)
+            cut = joined.rfind(" ", 0, chunk_chars)
+            if cut <= 0:
+                cut = chunk_chars
+            yield kind, title, joined[:cut]
+            rest = joined[cut:].strip()
+            parts[:] = [rest] if rest else []
+            size = len(rest) + 1 if rest else 0
+
+    def flush() -> Iterator[tuple[str, str, str]]:
+        nonlocal size
+        if parts:
+            yield kind, title, " ".join(parts)
+        parts.clear()
+        size = 0
+
+    def process(final: bool) -> Iterator[tuple[str, str, str]]:
+        nonlocal buffer, kind, title
+        limit = len(buffer) if final else len(buffer) - _LOOKAHEAD
+        last = 0
+        for match in _MARKER.finditer(buffer):
+            pos = match.start()
+            if pos >= limit:
+                break
+            if match.group("pasal"):
+                if _preceding_word(buffer, pos) in _REFERENCE_WORDS:
+                    continue
+                yield from take(buffer[last:pos])
+                last = pos
+                if size >= chunk_chars:
+                    yield from flush()
+                continue
+
+            if match.group("bab"):
+                if _preceding_word(buffer, pos) in _REFERENCE_WORDS:
+                    continue
+                new_kind = "bab"
+                new_title = f"BAB {match.group('bab')}{match.group('title')}".strip().removesuffix(" dan")
+            elif match.group("penjelasan"):
+                new_kind, new_title = "penjelasan", "PENJELASAN"
+            else:
+                new_kind = "lampiran"
+                new_title = f"LAMPIRAN{match.group('lampiran')}".strip()
+            # Penanda bagian yang sudah lewat atau judul lampiran yang diulang
+            # di setiap halaman tidak membuka bagian baru
+            if _KIND_ORDER[new_kind] < _KIND_ORDER[kind] or (new_kind != "bab" and new_title == title):
+                continue
+            if new_kind == "penjelasan" and kind == "penjelasan":
+                continue
+            yield from take(buffer[last:pos])
+            yield from flush()
+            kind, title = new_kind, new_title
+            last = pos
+
+        if final:
+            yield from take(buffer[last:])
+            yield from flush()
+            buffer = ""
+            return
+        # Teks tanpa penanda diteruskan sampai spasi terakhir sebelum limit
+        cut = buffer.rfind(" ", last, limit)
+        if cut > last:
+            yield from take(buffer[last:cut])
+            last = cut
+        buffer = buffer[last:]
+
+    for piece in pieces:
+        if not piece:
+            continue
+        buffer = f"{buffer} {piece}" if buffer else piece
+        if len(buffer) > _LOOKAHEAD:
+            yield from process(final=False)
+    yield from process(final=True)
+
+
+def _summary(classes: np.ndarray, proba: np.ndarray) -> dict:
+    best = int(proba.argmax())
+    return {
+        "label": str(classes[best]),
+        "confidence": round(float(proba[best]) * 100, 1),
+    }
+
+
+def classify_document(
+    model,
+    pieces: Iterable[str] | str,
+    preprocess=None,
+    chunk_chars: int = CHUNK_CHARS,
+    batch_size: int = BATCH_SIZE,
+    section_weights: dict[str, float] = SECTION_WEIGHTS,
+) -> dict:
+    """Klasifikasikan satu dokumen panjang per chunk dan gabungkan hasilnya.
+
+    ``pieces`` berupa string atau iterable potongan teks (mis. per halaman);
+    ``preprocess`` (mis. ``clean_text``) diterapkan per potongan sebelum
+    dipecah. Probabilitas dokumen dan per bagian adalah rata-rata
+    probabilitas chunk berbobot panjang chunk x ``section_weights``.
+    """
+    if isinstance(pieces, str):
+        pieces = [pieces]
+    if preprocess is not None:
+        pieces = (preprocess(piece) for piece in pieces)
+
+    classes = model.classes_
+    doc_sum = np.zeros(len(classes))
+    doc_weight = 0.0
+    sections: dict[str, dict] = {}
+    n_chunks = 0
+    n_chars = 0
+
+    def consume(batch: list[tuple[str, str, str]]) -> None:
+        nonlocal doc_weight, n_chunks, n_chars
+        proba = model.predict_proba([text for _, _, text in batch])
+        for (kind, title, text), row in zip(batch, proba):
+            weight = len(text) * section_weights.get(kind, 1.0)
+            doc_sum[:] += weight * row
+            doc_weight += weight
+            section = sections.get(title)
+            if section is None:
+                section = sections[title] = {
+                    "kind": kind, "chunks": 0, "chars": 0, "sum": np.zeros(len(classes)),
+                }
+            section["chunks"] += 1
+            section["chars"] += len(text)
+            section["sum"] += len(text) * row
+            n_chunks += 1
+            n_chars += len(text)
+
+    batch: list[tuple[str, str, str]] = []
+    for chunk in iter_chunks(pieces, chunk_chars, 2 * chunk_chars):
+        batch.append(chunk)
+        if len(batch) >= batch_size:
+            consume(batch)
+            batch = []
+    if batch:
+        consume(batch)
+
+    if n_chunks == 0:
+        return {"label": None, "confidence": None, "probabilities": {}, "chunks": 0, "chars": 0, "sections": []}
+
+    doc_proba = doc_sum / doc_weight if doc_weight else doc_sum
+    return {
+        **_summary(classes, doc_proba),
+        "probabilities": {str(c): round(float(p), 4) for c, p in zip(classes, doc_proba)},
+        "chunks": n_chunks,
+        "chars": n_chars,
+        "sections": [
+            {
+                "section": title,
+                "kind": section["kind"],
+                "chunks": section["chunks"],
+                "chars": section["chars"],
+                **_summary(classes, section["sum"] / section["chars"]),
+            }
+            for title, section in sections.items()
+        ],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Klasifikasi dokumen peraturan per bagian (BAB/Pasal/Penjelasan).")
+    parser.add_argument(
+        "--format", choices=["csv", "jsonl"], default="csv",
+        help="Format input/output: output_pojk.<format> -> output_pojk_sections.<format>.",
+    )
+    parser.add_argument("--chunk-chars", type=int, default=CHUNK_CHARS, help="Target panjang chunk (karakter).")
+    args = parser.parse_args(argv)
+
+    input_path = os.path.join(BASE_DIR, f"output_pojk.{args.format}")
+    output_path = os.path.join(BASE_DIR, f"output_pojk_sections.{args.format}")
+    model = load_model()
+
+    labels: list[tuple[str, str, float, int]] = []
+    fieldnames = ["filename", "department", "confidence", "chunks", "sections"]
+    with DocumentWriter(output_path, fieldnames) as writer:
+        for filename, pages in iter_document_pages(input_path):
+            result = classify_document(model, pages, chunk_chars=args.chunk_chars)
+            sections = [
+                {k: s[k] for k in ("section", "label", "confidence", "chunks")} for s in result["sections"]
+            ]
+            writer.write({
+                "filename": filename,
+                "department": result["label"],
+                "confidence": result["confidence"],
+                "chunks": result["chunks"],
+                # CSV menyimpan rincian bagian sebagai string JSON
+                "sections": sections if writer.jsonl else json.dumps(sections, ensure_ascii=False),
+            })
+            labels.append((filename, result["label"], result["confidence"], result["chunks"]))
+
+    print(f"Classified {len(labels)} regulations by section -> '{output_path}'\n")
+    print(f"{'No':<4} {'Filename':<70} {'Chunks':>6} {'Conf':>6}  {'Department'}")
+    print("-" * 110)
+    for i, (filename, dept, conf, chunks) in enumerate(labels, 1):
+        print(f"{i:<4} {filename[:70]:<70} {chunks:>6} {conf if conf is not None else '-':>6}  {dept}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""
+Pencarian regulasi serupa berbasis indeks vektor TF-IDF.
+
+Matriks TF-IDF korpus (ternormalisasi L2, sehingga dot product = cosine
+similarity) disimpan di disk bersama daftar nama file:
+
+    similarity_index/
+        vocab.txt, idf.npy, meta.json   vectorizer (dimuat sebagai CompactVectorizer)
+        term_indptr.npy, term_docs.npy, term_data.npy
+                                        matriks per term (CSC): posting
+                                        term_indptr[t]:term_indptr[t+1] berisi
+                                        dokumen yang memuat term t dan bobotnya
+        doc_indptr.npy, doc_terms.npy, doc_data.npy
+                                        matriks yang sama per dokumen (CSR)
+        filenames.txt                   nama file per dokumen (urutan baris matriks)
+        departments.txt                 label per dokumen (jika input berlabel)
+
+Array .npy dimuat dengan memory-map. Karena matriks disimpan per term,
+skor query adalah satu perkalian sparse vektor-matriks yang hanya membaca
+posting term yang ada di query (``np.bincount`` atas posting tersebut),
+bukan seluruh matriks, sehingga latensi tetap beberapa milidetik walaupun
+korpus berisi puluhan ribu dokumen.
+
+Query berupa dokumen utuh memuat ribuan term yang banyak di antaranya umum
+dengan posting panjang. Untuk query seperti itu perkalian hanya memakai
+``max_query_terms`` term berbobot tertinggi untuk memilih ``candidates``
+dokumen, lalu skor kandidat dihitung ulang secara eksak dari baris CSR-nya.
+Pada korpus sintetis 20.000 dokumen, query dokumen 20.000 karakter turun
+dari sekitar 60 ms menjadi 5 ms dengan 98% top-5 yang sama
+(benchmarks/bench_similarity.py).
+
+    python similarity_index.py build                        # output_pojk.csv -> similarity_index/
+    python similarity_index.py query "penyelenggaraan layanan pinjam meminjam"
+    python similarity_index.py query --file "docs_POJK/POJK 1 Tahun 2024 ....pdf"
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from corpus_io import iter_documents
+from nb_inference import CompactVectorizer
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INPUT_PATH = os.path.join(BASE_DIR, "output_pojk.csv")
+INDEX_DIR = os.path.join(BASE_DIR, "similarity_index")
+INDEX_FORMAT_VERSION = 1
+DEFAULT_TOP_K = 5
+# Query dengan term lebih banyak dari ini dicari dua tahap (kandidat lalu
+# skor eksak); query pendek (pengaduan, judul) selalu dihitung langsung
+DEFAULT_MAX_QUERY_TERMS = 256
+DEFAULT_CANDIDATES = 200
+
+
+def build_index(
+    input_path: str = INPUT_PATH,
+    path: str = INDEX_DIR,
+    ngram_range: tuple[int, int] = (1, 2),
+    min_df: int | float = 1,
+    max_df: int | float = 0.95,
+) -> dict:
+    """Bangun indeks dari korpus CSV/JSONL (kolom ``filename``, ``content``, opsional ``department``).
+
+    Korpus dibaca secara streaming. Indeks ditulis ke direktori sementara
+    lalu menggantikan indeks lama, sehingga server yang sedang membaca
+    indeks lama tidak melihat file setengah tertulis.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    filenames: list[str] = []
+    departments: list[str] = []
+
+    def contents():
+        for doc in iter_documents(input_path):
+            filenames.append(doc["filename"])
+            departments.append(doc.get("department") or "")
+            yield doc["content"]
+
+    vectorizer = TfidfVectorizer(
+        ngram_range=ngram_range, min_df=min_df, max_df=max_df, sublinear_tf=True, dtype=np.float32,
+    )
+    start = time.perf_counter()
+    rows = vectorizer.fit_transform(contents())
+    rows.sort_indices()
+    columns = rows.tocsc()
+    columns.sort_indices()
+
+    parent = os.path.dirname(os.path.abspath(path))
+    tmp = tempfile.mkdtemp(prefix=".similarity-", dir=parent)
+    try:
+        vocabulary = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+        with open(os.path.join(tmp, "vocab.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(vocabulary))
+        np.save(os.path.join(tmp, "idf.npy"), vectorizer.idf_)
+        for prefix, matrix, indices in (("term", columns, "docs"), ("doc", rows, "terms")):
+            np.save(os.path.join(tmp, f"{prefix}_indptr.npy"), matrix.indptr.astype(np.int64))
+            np.save(os.path.join(tmp, f"{prefix}_{indices}.npy"), matrix.indices.astype(np.int32))
+            np.save(os.path.join(tmp, f"{prefix}_data.npy"), matrix.data.astype(np.float32))
+        with open(os.path.join(tmp, "filenames.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(filenames))
+        if any(departments):
+            with open(os.path.join(tmp, "departments.txt"), "w", encoding="utf-8") as f:
+                f.write("\n".join(departments))
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "format_version": INDEX_FORMAT_VERSION,
+                "n_documents": len(filenames),
+                "n_features": len(vocabulary),
+                "nnz": int(rows.nnz),
+                "ngram_range": list(ngram_range),
+                "lowercase": vectorizer.lowercase,
+                "token_pattern": vectorizer.token_pattern,
+                "sublinear_tf": vectorizer.sublinear_tf,
+                "norm": vectorizer.norm,
+                "source": os.path.basename(input_path),
+            }, f, indent=2)
+
+        # Ganti indeks lama: rename direktori bersifat atomik, jeda di antara
+        # dua rename hanya membuat request yang memuat indeks saat itu gagal
+        old = None
+        if os.path.isdir(path):
+            old = tempfile.mkdtemp(prefix=".similarity-old-", dir=parent)
+            os.rename(path, os.path.join(old, "index"))
+        os.rename(tmp, path)
+        if old is not None:
+            shutil.rmtree(old, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    return {
+        "documents": len(filenames),
+        "features": len(vocabulary),
+        "nnz": int(rows.nnz),
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+
+
+class SimilarityIndex:
+    """Indeks cosine similarity atas matriks TF-IDF korpus yang di-memory-map."""
+
+    def __init__(
+        self,
+        vectorizer: CompactVectorizer,
+        term_matrix: tuple[np.ndarray, np.ndarray, np.ndarray],
+        doc_matrix: tuple[np.ndarray, np.ndarray, np.ndarray],
+        filenames: list[str],
+        departments: list[str] | None = None,
+        max_query_terms: int | None = DEFAULT_MAX_QUERY_TERMS,
+        candidates: int = DEFAULT_CANDIDATES,
+    ):
+        self.vectorizer = vectorizer
+        # Masing-masing (indptr, indices, data)
+        self.term_matrix = term_matrix
+        self.doc_matrix = doc_matrix
+        self.filenames = filenames
+        self.departments = departments
+        self.max_query_terms = max_query_terms
+        self.candidates = candidates
+        self._positions: dict[str, list[int]] = {}
+        for i, name in enumerate(filenames):
+            self._positions.setdefault(name, []).append(i)
+
+    @classmethod
+    def load(cls, path: str = INDEX_DIR, mmap: bool = True, **kwargs) -> "SimilarityIndex":
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format_version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Versi format indeks tidak didukung: {meta.get('format_version')}")
+
+        def read_lines(name: str) -> list[str] | None:
+            if not os.path.exists(os.path.join(path, name)):
+                return None
+            with open(os.path.join(path, name), encoding="utf-8") as f:
+                return f.read().split("\n")
+
+        mmap_mode = "r" if mmap else None
+        vectorizer = CompactVectorizer(
+            read_lines("vocab.txt"), np.load(os.path.join(path, "idf.npy"), mmap_mode=mmap_mode), meta,
+        )
+
+        def read_matrix(prefix: str, indices: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+            return tuple(
+                np.load(os.path.join(path, f"{prefix}_{name}.npy"), mmap_mode=mmap_mode)
+                for name in ("indptr", indices, "data")
+            )
+
+        return cls(
+            vectorizer,
+            read_matrix("term", "docs"),
+            read_matrix("doc", "terms"),
+            read_lines("filenames.txt"),
+            read_lines("departments.txt"),
+            **kwargs,
+        )
+
+    def __len__(self) -> int:
+        return len(self.filenames)
+
+    @staticmethod
+    def _gather(indptr: np.ndarray, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Posisi semua elemen baris ``rows`` pada array indices/data, tanpa loop Python.
+
+        Mengembalikan (posisi, panjang per baris).
+        """
+        starts = indptr[rows]
+        lengths = indptr[rows + 1] - starts
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return np.arange(int(lengths.sum())) + offsets, lengths
+
+    def scores(self, idx: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Cosine similarity vektor query (indeks term, bobot) dengan setiap dokumen."""
+        indptr, docs, data = self.term_matrix
+        positions, lengths = self._gather(indptr, idx)
+        weights = data[positions] * np.repeat(values, lengths)
+        return np.bincount(docs[positions], weights=weights, minlength=len(self))
+
+    def exact_scores(self, idx: np.ndarray, values: np.ndarray, doc_ids: np.ndarray) -> np.ndarray:
+        """Cosine similarity eksak query dengan dokumen ``doc_ids`` dari baris CSR."""
+        indptr, terms, data = self.doc_matrix
+        dense = np.zeros(len(self.vectorizer.vocabulary))
+        dense[idx] = values
+        positions, lengths = self._gather(indptr, doc_ids)
+        products = data[positions] * dense[terms[positions]]
+        return np.bincount(np.repeat(np.arange(len(doc_ids)), lengths), weights=products, minlength=len(doc_ids))
+
+    def search(self, text: str, top_k: int = DEFAULT_TOP_K, exclude=()) -> list[dict]:
+        """Dokumen paling mirip dengan ``text``; nama file di ``exclude`` dilewati."""
+        return self.search_vector(*self.vectorizer.transform_one(text), top_k=top_k, exclude=exclude)
+
+    def search_vector(
+        self, idx: np.ndarray, values: np.ndarray, top_k: int = DEFAULT_TOP_K, exclude=(),
+    ) -> list[dict]:
+        """Seperti ``search`` untuk vektor query yang sudah dihitung."""
+        excluded = [i for name in exclude for i in self._positions.get(name, [])]
+        if self.max_query_terms and len(idx) > self.max_query_terms:
+            keep = np.argpartition(values, -self.max_query_terms)[-self.max_query_terms:]
+            scores = self.scores(idx[keep], values[keep])
+            scores[excluded] = -1.0
+            k = min(max(self.candidates, top_k), len(scores))
+            doc_ids = np.argpartition(scores, -k)[-k:]
+            doc_ids = doc_ids[scores[doc_ids] > 0]
+            doc_scores = self.exact_scores(idx, values, doc_ids)
+        else:
+            scores = self.scores(idx, values)
+            scores[excluded] = -1.0
+            doc_ids = np.arange(len(scores))
+            doc_scores = scores
+
+        k = min(top_k, len(doc_ids))
+        best = np.argpartition(doc_scores, -k)[-k:] if k else np.empty(0, dtype=np.intp)
+        best = best[np.argsort(doc_scores[best])[::-1]]
+        results = []
+        for i in best:
+            if doc_scores[i] <= 0:
+                break
+            doc = int(doc_ids[i])
+            result = {"filename": self.filenames[doc], "score": round(float(doc_scores[i]), 4)}
+            if self.departments is not None:
+                result["department"] = self.departments[doc]
+            results.append(result)
+        return results
+
+
+def read_query_file(path: str) -> str:
+    """Teks query dari file .pdf (via extract_pdf) atau file teks biasa."""
+    if path.lower().endswith(".pdf"):
+        from extract_pdf import clean_text, extract_text_from_pdf
+        return clean_text(extract_text_from_pdf(path))
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cari regulasi serupa dengan indeks TF-IDF.")
+    parser.add_argument("--index", default=INDEX_DIR, help="Direktori indeks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Bangun indeks dari korpus CSV/JSONL.")
+    build.add_argument("--input", default=INPUT_PATH, help="Korpus (kolom filename, content, opsional department).")
+    build.add_argument("--max-ngram", type=int, default=2, help="N-gram kata terpanjang.")
+
+    query = sub.add_parser("query", help="Cari dokumen paling mirip dengan teks atau file.")
+    query.add_argument("text", nargs="?", help="Teks query.")
+    query.add_argument("--file", help="File .pdf atau teks sebagai query (file itu sendiri dikecualikan).")
+    query.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        stats = build_index(args.input, args.index, ngram_range=(1, args.max_ngram))
+        print(f"Indexed {stats['documents']} documents ({stats['features']} terms, "
+              f"{stats['nnz']} non-zeros) in {stats['seconds']}s -> '{args.index}'")
+        return
+
+    if (args.text is None) == (args.file is None):
+        parser.error("query membutuhkan teks atau --file (salah satu)")
+    try:
+        index = SimilarityIndex.load(args.index)
+    except FileNotFoundError:
+        sys.exit(f"Indeks belum dibangun: python similarity_index.py build --index {args.index}")
+
+    text = read_query_file(args.file) if args.file else args.text
+    exclude = [os.path.basename(args.file)] if args.file else []
+    start = time.perf_counter()
+    results = index.search(text, args.top_k, exclude=exclude)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"Top {args.top_k} of {len(index)} documents ({elapsed:.1f} ms)\n")
+    for rank, result in enumerate(results, 1):
+        dept = f"  [{result['department']}]" if result.get("department") else ""
+        print(f"{rank:<3} {result['score']:.4f}  {result['filename']}{dept}")
+
+
+if __name__ == "__main__":
+    main()
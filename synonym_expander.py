@@ -0,0 +1,134 @@
+"""
+Mesin ekspansi sinonim satu lintasan untuk SYNONYM_MAP.
+
+Implementasi awal menerapkan satu re.sub per entri peta, sehingga teks
+dipindai ulang sebanyak jumlah entri dan setiap pola dibangun ulang di
+setiap request. Modul ini mengompilasi seluruh peta menjadi satu regex
+alternation saat import, lalu menulis ulang teks dalam satu lintasan
+kiri-ke-kanan.
+
+Hasilnya dijaga identik dengan loop berurutan lama:
+- batas kata \\b tetap berlaku untuk setiap istilah,
+- jika dua istilah tumpang tindih, istilah yang lebih dulu muncul di peta
+  menang (mis. "kredit macet" mengalahkan "kartu kredit"),
+- efek berantai (penggantian yang memunculkan istilah lain di urutan
+  berikutnya, termasuk yang melintasi batas penggantian seperti
+  "kpr motor") dihitung sekali saat kompilasi.
+"""
+
+import re
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+def _is_word(ch: str) -> bool:
+    return bool(_WORD_CHAR.match(ch))
+
+
+def expand_sequential(text: str, items: list[tuple[str, str]]) -> str:
+    """Terapkan penggantian satu per satu secara berurutan (perilaku referensi)."""
+    for colloquial, formal in items:
+        text = re.sub(r"\b" + re.escape(colloquial) + r"\b", formal, text)
+    return text
+
+
+def _word_starts(literal: str) -> list[int]:
+    """Offset di dalam literal tempat sebuah kata dimulai (tanpa offset 0)."""
+    return [
+        o for o in range(1, len(literal))
+        if _is_word(literal[o]) and not _is_word(literal[o - 1])
+    ]
+
+
+class SynonymExpander:
+    """Ekspansi sinonim berbasis satu regex yang dikompilasi sekali."""
+
+    def __init__(self, synonym_map: dict[str, str]):
+        self.items = list(synonym_map.items())
+        rules: list[tuple[int, int, str, str]] = []
+
+        for i, (key, formal) in enumerate(self.items):
+            later = self.items[i + 1:]
+            resolved = expand_sequential(formal, later)
+
+            for other, _ in later:
+                # Istilah berikutnya yang diawali ekor hasil penggantian,
+                # mis. "kpr" -> "... kredit" diikuti "motor" -> "kredit motor".
+                for o in range(1, len(other)):
+                    if _is_word(other[o]) or not _is_word(other[o - 1]):
+                        continue
+                    head = other[:o]
+                    if resolved.endswith(head) and (
+                        len(resolved) == len(head) or not _is_word(resolved[-len(head) - 1])
+                    ):
+                        tail = other[o:]
+                        rules.append((i, 0, key + tail, expand_sequential(formal + tail, later)))
+
+                # Istilah berikutnya yang diakhiri kepala hasil penggantian.
+                for o in range(1, len(other)):
+                    if _is_word(other[o - 1]) or not _is_word(other[o]):
+                        continue
+                    tail = other[o:]
+                    if resolved.startswith(tail) and (
+                        len(resolved) == len(tail) or not _is_word(resolved[len(tail)])
+                    ):
+                        head = other[:o]
+                        rules.append((i, 0, head + key, expand_sequential(head + formal, later)))
+
+            rules.append((i, 1, key, resolved))
+
+        # Kelompokkan alternatif per huruf pertama agar regex tidak mencoba
+        # seluruh istilah di setiap batas kata. Urutan prioritas di dalam
+        # kelompok tetap dipertahankan; istilah dengan huruf pertama berbeda
+        # tidak mungkin cocok di posisi yang sama.
+        rules.sort(key=lambda r: (r[0], r[1]))
+        by_first_char: dict[str, list[tuple[int, str, str]]] = {}
+        for priority, _, literal, replacement in rules:
+            by_first_char.setdefault(literal[0], []).append((priority, literal, replacement))
+
+        # Nomor grup capture mengikuti urutan kemunculan di pola, sehingga
+        # daftar pengganti disusun mengikuti urutan cabang.
+        self._replacements: list[str] = []
+        branches = []
+        for first_char, group in by_first_char.items():
+            alternatives = []
+            for priority, literal, replacement in group:
+                guarded = self._guarded(literal, priority)
+                alternatives.append("(" + guarded[len(re.escape(first_char)):] + ")")
+                self._replacements.append(replacement)
+            branches.append(re.escape(first_char) + "(?:" + "|".join(alternatives) + ")")
+
+        self.pattern = re.compile(r"\b(?:" + "|".join(branches) + r")\b")
+
+    def _guarded(self, literal: str, priority: int) -> str:
+        """Escape literal dan sisipkan lookahead negatif untuk istilah prioritas lebih tinggi.
+
+        Jika istilah yang lebih dulu di peta dapat dimulai di tengah literal
+        ini, loop berurutan akan menggantinya lebih dulu sehingga literal ini
+        tidak lagi cocok. Lookahead mereplikasi aturan tersebut.
+        """
+        guards: dict[int, list[str]] = {}
+        for o in _word_starts(literal):
+            rest = literal[o:]
+            for key, _ in self.items[:priority]:
+                contained = rest.startswith(key) and (
+                    len(rest) == len(key) or not _is_word(rest[len(key)])
+                )
+                if contained or key.startswith(rest):
+                    guards.setdefault(o, []).append(re.escape(key) + r"\b")
+
+        parts = []
+        prev = 0
+        for o in sorted(guards):
+            parts.append(re.escape(literal[prev:o]))
+            parts.append("(?!" + "|".join(guards[o]) + ")")
+            prev = o
+        parts.append(re.escape(literal[prev:]))
+        return "".join(parts)
+
+    def _replace(self, match: re.Match) -> str:
+        return self._replacements[match.lastindex - 1]
+
+    def expand(self, text: str) -> str:
+        """Ganti istilah populer dengan terminologi formal dalam satu lintasan."""
+        return self.pattern.sub(self._replace, text.lower())
@@ -5,68 +5,182 @@ memprediksi label departemen (Perbankan, Pasar Modal, IKNB, ITSK)
 berdasarkan isi dokumen.
 """
 
+import argparse
 import csv
+import itertools
+import json
 import os
+import random
 import sys
+import time
+from numbers import Integral
 
 import joblib
+import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics import classification_report, confusion_matrix
-from sklearn.model_selection import cross_val_score, train_test_split
+from joblib import Parallel, delayed
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from sklearn.model_selection import StratifiedKFold, cross_val_score, train_test_split
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.pipeline import Pipeline
 
+from corpus_io import DocumentWriter, iter_documents
+from feature_store import FEATURE_STORE_DIR, FeatureStore
+from model_store import ModelStore, file_sha256
+from nb_inference import save_compact_model
+
 csv.field_size_limit(sys.maxsize)
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 INPUT_CSV = os.path.join(BASE_DIR, "output_pojk_classified.csv")
 MODEL_PATH = os.path.join(BASE_DIR, "model_klasifikasi_ojk.joblib")
+COMPACT_MODEL_DIR = os.path.join(BASE_DIR, "model_klasifikasi_ojk_compact")
+# Setiap model yang disimpan juga ditulis sebagai versi baru di model store
+MODEL_STORE_DIR = os.environ.get("OJK_MODEL_STORE", os.path.join(BASE_DIR, "model_store"))
+# Jumlah update inkremental sejak full rebuild terakhir
+INCREMENTAL_STATE_PATH = os.path.join(BASE_DIR, "model_klasifikasi_ojk.incremental.json")
+# Full rebuild otomatis setelah sekian update inkremental agar vocabulary
+# dan IDF ikut diperbarui
+DEFAULT_REBUILD_EVERY = 50
+
+# Parameter default build_pipeline
+DEFAULT_PARAMS = {
+    "ngram_range": (1, 2),
+    "max_features": 5000,
+    "min_df": 1,
+    "max_df": 0.95,
+    "sublinear_tf": True,
+    "alpha": 0.1,
+}
+
+# Ruang pencarian untuk --tune
+PARAM_GRID = {
+    "ngram_range": [(1, 1), (1, 2), (1, 3)],
+    "max_features": [2000, 5000, 10000, None],
+    "min_df": [1, 2],
+    "max_df": [0.8, 0.95, 1.0],
+    "sublinear_tf": [True, False],
+    "alpha": [0.01, 0.03, 0.1, 0.3, 1.0],
+}
 
 
 def load_data(csv_path: str) -> pd.DataFrame:
-    """Muat CSV berlabel ke DataFrame."""
-    df = pd.read_csv(csv_path, encoding="utf-8")
+    """Muat CSV atau JSONL berlabel ke DataFrame.
+
+    File JSONL dibaca dokumen demi dokumen melalui ``corpus_io.iter_documents``.
+    """
+    if csv_path.endswith(".jsonl"):
+        df = pd.DataFrame.from_records(
+            ({"filename": doc["filename"], "content": doc["content"], "department": doc["department"]}
+             for doc in iter_documents(csv_path)),
+            columns=["filename", "content", "department"],
+        )
+    else:
+        df = pd.read_csv(csv_path, encoding="utf-8")
     print(f"Loaded {len(df)} documents from '{csv_path}'")
     print(f"\nLabel distribution:\n{df['department'].value_counts()}\n")
     return df
 
 
-def build_pipeline() -> Pipeline:
-    """Buat pipeline TF-IDF + Multinomial Naive Bayes."""
+def build_pipeline(**params) -> Pipeline:
+    """Buat pipeline TF-IDF + Multinomial Naive Bayes.
+
+    ``params`` menimpa nilai di ``DEFAULT_PARAMS`` (mis. hasil --tune).
+    """
+    params = {**DEFAULT_PARAMS, **params}
     pipeline = Pipeline([
         ("tfidf", TfidfVectorizer(
-            max_features=5000,
-            ngram_range=(1, 2),
-            sublinear_tf=True,
-            min_df=1,
-            max_df=0.95,
+            max_features=params["max_features"],
+            ngram_range=tuple(params["ngram_range"]),
+            sublinear_tf=params["sublinear_tf"],
+            min_df=params["min_df"],
+            max_df=params["max_df"],
         )),
-        ("clf", MultinomialNB(alpha=0.1)),
+        ("clf", MultinomialNB(alpha=params["alpha"])),
     ])
     return pipeline
 
 
-def train_and_evaluate(df: pd.DataFrame) -> Pipeline:
-    """Training model, cross-validation, dan evaluasi pada test split."""
+def fit_counts(counts, terms: np.ndarray, y, **params) -> tuple[Pipeline, np.ndarray]:
+    """Pipeline ``build_pipeline(**params)`` yang di-fit dari matriks hitungan feature store.
+
+    ``counts`` adalah hitungan n-gram dokumen training untuk ``ngram_range``
+    pipeline dengan kolom terurut alfabetis (``FeatureStore.counts``) dan
+    ``terms`` term per kolom. Vocabulary, IDF, dan NB yang dihasilkan sama
+    dengan ``build_pipeline(**params).fit(teks, y)`` tanpa tokenisasi ulang.
+    Mengembalikan pipeline dan indeks kolom ``counts`` yang menjadi fiturnya.
+    """
+    params = {**DEFAULT_PARAMS, **params}
+    # Vocabulary CountVectorizer hanya memuat term yang muncul di data training
+    present = np.flatnonzero(np.bincount(counts.indices, minlength=counts.shape[1]))
+    kept = _select_features(counts[:, present], params["min_df"], params["max_df"], params["max_features"])
+    if kept is None:
+        raise ValueError("Tidak ada term tersisa setelah min_df/max_df/max_features")
+    columns = present[kept]
+
+    pipeline = build_pipeline(**params)
+    tfidf, clf = pipeline.named_steps["tfidf"], pipeline.named_steps["clf"]
+    transformer = TfidfTransformer(
+        norm=tfidf.norm, use_idf=tfidf.use_idf, smooth_idf=tfidf.smooth_idf, sublinear_tf=tfidf.sublinear_tf,
+    )
+    X = transformer.fit_transform(counts[:, columns].astype(tfidf.dtype))
+    # Atribut yang sama dengan yang diisi TfidfVectorizer.fit
+    tfidf.vocabulary_ = {str(term): i for i, term in enumerate(terms[columns])}
+    tfidf.fixed_vocabulary_ = False
+    tfidf._tfidf = transformer
+    clf.fit(X, y)
+    return pipeline, columns
+
+
+def predict_counts(pipeline: Pipeline, counts) -> np.ndarray:
+    """Prediksi dari matriks hitungan yang kolomnya sudah dipilih ``fit_counts``."""
+    tfidf = pipeline.named_steps["tfidf"]
+    return pipeline.named_steps["clf"].predict(tfidf._tfidf.transform(counts.astype(tfidf.dtype)))
+
+
+def train_and_evaluate(df: pd.DataFrame, store: FeatureStore | None = None) -> tuple[Pipeline, np.ndarray]:
+    """Training model, cross-validation, dan evaluasi pada test split.
+
+    Mengembalikan pipeline final (dilatih pada seluruh dataset) dan skor
+    akurasi 5-fold CV. Dengan ``store`` hitungan n-gram dibaca dari feature
+    store (lihat ``fit_counts``) alih-alih men-tokenisasi teks di setiap fit.
+    """
     X = df["content"]
     y = df["department"]
 
-    pipeline = build_pipeline()
-    cv_scores = cross_val_score(pipeline, X, y, cv=5, scoring="accuracy")
+    if store is not None:
+        counts, terms = store.counts(df["filename"], DEFAULT_PARAMS["ngram_range"])
+        y_array = y.to_numpy()
+
+        def fit_predict(train_idx, test_idx):
+            pipeline, columns = fit_counts(counts[train_idx], terms, y_array[train_idx])
+            return predict_counts(pipeline, counts[test_idx][:, columns])
+
+        # Fold sama dengan cross_val_score(cv=5) untuk classifier
+        cv_scores = np.array([
+            accuracy_score(y_array[test_idx], fit_predict(train_idx, test_idx))
+            for train_idx, test_idx in StratifiedKFold(n_splits=5).split(counts, y_array)
+        ])
+    else:
+        cv_scores = cross_val_score(build_pipeline(), X, y, cv=5, scoring="accuracy")
     print("=" * 60)
     print("5-Fold Cross-Validation")
     print("=" * 60)
     print(f"  Accuracy per fold : {cv_scores}")
     print(f"  Mean accuracy     : {cv_scores.mean():.4f} +/- {cv_scores.std():.4f}\n")
 
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y,
+    train_idx, test_idx = train_test_split(
+        np.arange(len(df)), test_size=0.2, random_state=42, stratify=y,
     )
-    print(f"Train size: {len(X_train)}  |  Test size: {len(X_test)}\n")
+    y_test = y.iloc[test_idx]
+    print(f"Train size: {len(train_idx)}  |  Test size: {len(test_idx)}\n")
 
-    pipeline.fit(X_train, y_train)
-    y_pred = pipeline.predict(X_test)
+    if store is not None:
+        y_pred = fit_predict(train_idx, test_idx)
+    else:
+        pipeline = build_pipeline().fit(X.iloc[train_idx], y.iloc[train_idx])
+        y_pred = pipeline.predict(X.iloc[test_idx])
 
     print("=" * 60)
     print("Classification Report (Test Set)")
@@ -81,16 +195,462 @@ def train_and_evaluate(df: pd.DataFrame) -> Pipeline:
     print()
 
     print("Training ulang pada seluruh dataset untuk model final...")
-    final_pipeline = build_pipeline()
-    final_pipeline.fit(X, y)
+    if store is not None:
+        final_pipeline, _ = fit_counts(counts, terms, y.to_numpy())
+    else:
+        final_pipeline = build_pipeline().fit(X, y)
+
+    return final_pipeline, cv_scores
+
+
+def _select_features(counts, min_df, max_df, max_features) -> np.ndarray | None:
+    """Indeks kolom yang dipertahankan TfidfVectorizer untuk pengaturan ini.
+
+    Sama persis dengan ``CountVectorizer._limit_features`` yang dijalankan
+    pada vocabulary terurut; None jika pengaturan tidak valid atau tidak
+    ada term tersisa.
+    """
+    n_docs = counts.shape[0]
+    max_doc_count = max_df if isinstance(max_df, Integral) else max_df * n_docs
+    min_doc_count = min_df if isinstance(min_df, Integral) else min_df * n_docs
+    if max_doc_count < min_doc_count:
+        return None
+    dfs = np.bincount(counts.indices, minlength=counts.shape[1])
+    mask = (dfs <= max_doc_count) & (dfs >= min_doc_count)
+    if max_features is not None and mask.sum() > max_features:
+        tfs = np.asarray(counts.sum(axis=0)).ravel()
+        mask_inds = (-tfs[mask]).argsort()[:max_features]
+        new_mask = np.zeros(len(dfs), dtype=bool)
+        new_mask[np.where(mask)[0][mask_inds]] = True
+        mask = new_mask
+    kept = np.where(mask)[0]
+    return kept if len(kept) else None
+
+
+def _score_fold(texts, y, train_idx, test_idx, ngram_range, combos, counts=None) -> list[float | None]:
+    """Akurasi satu fold untuk semua kombinasi dengan ``ngram_range`` yang sama.
+
+    Fold ditokenisasi sekali (atau, dengan ``counts`` dari feature store,
+    tidak sama sekali). Setiap pengaturan vectorizer lain cukup memilih kolom
+    dan menghitung IDF dari matriks hitungan ini, dan hasil TF-IDF dipakai
+    ulang untuk semua nilai ``alpha``.
+    """
+    if counts is not None:
+        train_counts = counts[train_idx]
+        present = np.flatnonzero(np.bincount(train_counts.indices, minlength=counts.shape[1]))
+        train_counts = train_counts[:, present].astype(np.float64)
+        test_counts = counts[test_idx][:, present].astype(np.float64)
+    else:
+        counter = CountVectorizer(ngram_range=ngram_range)
+        train_counts = counter.fit_transform([texts[i] for i in train_idx])
+        test_counts = counter.transform([texts[i] for i in test_idx])
+    y_train, y_test = y[train_idx], y[test_idx]
+
+    scores: list[float | None] = [None] * len(combos)
+    cache: dict[tuple, tuple] = {}
+    for i, params in enumerate(combos):
+        key = (params["min_df"], params["max_df"], params["max_features"], params["sublinear_tf"])
+        if key not in cache:
+            kept = _select_features(train_counts, params["min_df"], params["max_df"], params["max_features"])
+            if kept is None:
+                cache[key] = None
+            else:
+                tfidf = TfidfTransformer(sublinear_tf=params["sublinear_tf"])
+                cache[key] = (
+                    tfidf.fit_transform(train_counts[:, kept]),
+                    tfidf.transform(test_counts[:, kept]),
+                )
+        if cache[key] is None:
+            continue
+        X_train, X_test = cache[key]
+        clf = MultinomialNB(alpha=params["alpha"]).fit(X_train, y_train)
+        scores[i] = accuracy_score(y_test, clf.predict(X_test))
+    return scores
+
+
+def tune_hyperparameters(
+    df: pd.DataFrame,
+    param_grid: dict[str, list] = PARAM_GRID,
+    n_iter: int | None = None,
+    cv: int = 5,
+    n_jobs: int = -1,
+    seed: int = 42,
+    store: FeatureStore | None = None,
+) -> list[dict]:
+    """Grid search (atau random search jika ``n_iter`` diisi) dengan fitur TF-IDF di-cache.
 
-    return final_pipeline
+    Fold sama dengan ``cross_val_score(cv=5)`` di ``train_and_evaluate``
+    (StratifiedKFold tanpa shuffle) sehingga skornya dapat dibandingkan.
+    Pekerjaan dipecah per (fold, ngram_range) dan dijalankan paralel di
+    semua core. Dengan ``store`` setiap ``ngram_range`` dibaca sekali dari
+    feature store dan fold hanya memilih baris matriks hitungan. Mengembalikan
+    daftar hasil terurut dari skor terbaik.
+    """
+    keys = list(param_grid)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*param_grid.values())]
+    if n_iter is not None and n_iter < len(combos):
+        combos = random.Random(seed).sample(combos, n_iter)
+    if DEFAULT_PARAMS not in combos:
+        combos.append(dict(DEFAULT_PARAMS))
 
+    texts = df["content"].tolist()
+    y = df["department"].to_numpy()
+    folds = list(StratifiedKFold(n_splits=cv).split(texts, y))
+    groups: dict[tuple, list[int]] = {}
+    for i, params in enumerate(combos):
+        groups.setdefault(tuple(params["ngram_range"]), []).append(i)
 
-def save_model(pipeline: Pipeline, path: str) -> None:
-    """Simpan pipeline ke disk menggunakan joblib."""
-    joblib.dump(pipeline, path)
+    if store is not None:
+        print(f"Tuning {len(combos)} combinations x {cv} folds (counts from feature store, n_jobs={n_jobs})...")
+    else:
+        print(f"Tuning {len(combos)} combinations x {cv} folds "
+              f"({len(groups)} tokenization(s) per fold, n_jobs={n_jobs})...")
+    start = time.perf_counter()
+    counts = {
+        ngram: store.counts(df["filename"], ngram)[0] if store is not None else None for ngram in groups
+    }
+    tasks = [(fold, ngram) for fold in range(len(folds)) for ngram in groups]
+    outputs = Parallel(n_jobs=n_jobs)(
+        delayed(_score_fold)(
+            texts, y, folds[fold][0], folds[fold][1], ngram,
+            [combos[i] for i in groups[ngram]], counts[ngram],
+        )
+        for fold, ngram in tasks
+    )
+    elapsed = time.perf_counter() - start
+
+    fold_scores: list[list[float | None]] = [[] for _ in combos]
+    for (fold, ngram), scores in zip(tasks, outputs):
+        for i, score in zip(groups[ngram], scores):
+            fold_scores[i].append(score)
+
+    results = []
+    for params, scores in zip(combos, fold_scores):
+        if any(score is None for score in scores):
+            continue
+        results.append({
+            "params": params,
+            "mean": float(np.mean(scores)),
+            "std": float(np.std(scores)),
+            "scores": scores,
+        })
+    # Skor sama: utamakan std lebih kecil, lalu vocabulary lebih kecil
+    results.sort(key=lambda r: (-r["mean"], r["std"], r["params"]["max_features"] or float("inf")))
+    print(f"Finished in {elapsed:.1f}s\n")
+    return results
+
+
+def print_tuning_results(results: list[dict], top: int = 15) -> None:
+    """Cetak tabel peringkat hasil tuning, ditambah posisi parameter default."""
+    header = (f"{'Rank':<5} {'Mean acc':>8} {'Std':>7}  {'ngram':<7} {'max_feat':>8} "
+              f"{'min_df':>6} {'max_df':>6} {'sublin':>6} {'alpha':>6}")
+    print("=" * len(header))
+    print("Hyperparameter Search Results")
+    print("=" * len(header))
+    print(header)
+    print("-" * len(header))
+    for rank, r in enumerate(results, 1):
+        p = r["params"]
+        is_default = p == DEFAULT_PARAMS
+        if rank > top and not is_default:
+            continue
+        print(
+            f"{rank:<5} {r['mean']:>8.4f} {r['std']:>7.4f}  {str(tuple(p['ngram_range'])):<7} "
+            f"{str(p['max_features']):>8} {p['min_df']:>6} {p['max_df']:>6} {str(p['sublinear_tf']):>6} "
+            f"{p['alpha']:>6}{'  (default)' if is_default else ''}"
+        )
+    print()
+
+
+def training_metadata(
+    pipeline: Pipeline, mode: str, dataset_path: str, cv_scores=None,
+) -> dict:
+    """Metadata versi model: mode training, hash korpus, parameter, dan skor CV."""
+    tfidf = pipeline.named_steps["tfidf"]
+    clf = pipeline.named_steps["clf"]
+    scores = [float(score) for score in cv_scores] if cv_scores is not None else None
+    return {
+        "mode": mode,
+        "corpus": os.path.basename(dataset_path),
+        "corpus_hash": file_sha256(dataset_path),
+        "n_documents": int(clf.class_count_.sum()),
+        "classes": [str(c) for c in clf.classes_],
+        "params": {
+            "ngram_range": list(tfidf.ngram_range),
+            "max_features": tfidf.max_features,
+            "min_df": tfidf.min_df,
+            "max_df": tfidf.max_df,
+            "sublinear_tf": tfidf.sublinear_tf,
+            "alpha": clf.alpha,
+        },
+        "cv_scores": scores,
+        "cv_mean": float(np.mean(scores)) if scores else None,
+        "cv_std": float(np.std(scores)) if scores else None,
+    }
+
+
+def save_model(pipeline: Pipeline, path: str, metadata: dict | None = None) -> str:
+    """Simpan pipeline ke ``path`` dan sebagai versi baru di model store.
+
+    File di ``path`` diganti secara atomik (tulis ke file sementara lalu
+    ``os.replace``). Versi di model store menyertakan format ringkas dan
+    ``metadata`` lalu langsung diaktifkan, sehingga server yang berjalan
+    memuatnya tanpa restart. Mengembalikan nama versi.
+    """
+    tmp = f"{path}.tmp"
+    joblib.dump(pipeline, tmp)
+    os.replace(tmp, path)
     print(f"Model saved to '{path}'")
+    return ModelStore(MODEL_STORE_DIR).save(pipeline, metadata or {}, export_compact=export_compact_model)
+
+
+def save_slim_model(pipeline: Pipeline, prune: float | None = None, texts: list[str] | None = None) -> None:
+    """Tulis versi padat pipeline (lihat model_compaction.py) dan cetak kecocokan prediksinya."""
+    from model_compaction import SLIM_MODEL_PATH, agreement, compact_pipeline, save_compacted
+
+    compacted, kept, total = compact_pipeline(pipeline, prune=prune)
+    save_compacted(compacted, SLIM_MODEL_PATH)
+    print(f"  Vocabulary: {kept}/{total} terms, size {os.path.getsize(SLIM_MODEL_PATH) / 1024:.1f} KB")
+    if texts:
+        stats = agreement(pipeline, compacted, texts)
+        print(f"  Agreement on {stats['documents']} training documents: {stats['agreement']:.2%}")
+
+
+def active_model_path() -> str:
+    """File joblib versi aktif di model store, atau ``MODEL_PATH`` jika store kosong."""
+    store = ModelStore(MODEL_STORE_DIR)
+    version = store.active()
+    if version is None:
+        return MODEL_PATH
+    return os.path.join(store.path(version), "model.joblib")
+
+
+def load_active_pipeline() -> Pipeline:
+    """Pipeline versi aktif di model store, atau ``MODEL_PATH`` jika store kosong."""
+    return load_model(active_model_path())
+
+
+def export_compact_model(pipeline: Pipeline, path: str) -> None:
+    """Ekspor pipeline ke format ringkas yang dimuat nb_inference tanpa sklearn."""
+    tfidf = pipeline.named_steps["tfidf"]
+    clf = pipeline.named_steps["clf"]
+
+    # nb_inference hanya mereproduksi analyzer 'word' bawaan
+    unsupported = {
+        "analyzer": tfidf.analyzer != "word",
+        "tokenizer": tfidf.tokenizer is not None,
+        "preprocessor": tfidf.preprocessor is not None,
+        "strip_accents": tfidf.strip_accents is not None,
+        "stop_words": tfidf.stop_words is not None,
+        "binary": tfidf.binary,
+        "use_idf": not tfidf.use_idf,
+    }
+    bad = [name for name, flag in unsupported.items() if flag]
+    if bad:
+        raise ValueError(f"Pengaturan TfidfVectorizer tidak didukung format ringkas: {bad}")
+
+    vocabulary = sorted(tfidf.vocabulary_, key=tfidf.vocabulary_.get)
+    save_compact_model(
+        path,
+        vocabulary=vocabulary,
+        idf=tfidf.idf_,
+        feature_log_prob=clf.feature_log_prob_,
+        class_log_prior=clf.class_log_prior_,
+        meta={
+            "classes": [str(c) for c in clf.classes_],
+            "ngram_range": list(tfidf.ngram_range),
+            "lowercase": tfidf.lowercase,
+            "token_pattern": tfidf.token_pattern,
+            "sublinear_tf": tfidf.sublinear_tf,
+            "norm": tfidf.norm,
+        },
+    )
+    print(f"Compact model exported to '{path}'")
+
+
+def incremental_update(pipeline: Pipeline, texts: list[str], labels: list[str]) -> Pipeline:
+    """Tambahkan dokumen berlabel ke model tanpa training ulang.
+
+    Vocabulary dan IDF TfidfVectorizer dibekukan dari training terakhir;
+    hanya hitungan fitur per kelas MultinomialNB yang diperbarui lewat
+    ``partial_fit``, sehingga waktunya sebanding dengan panjang dokumen
+    baru. Term yang belum ada di vocabulary diabaikan sampai full rebuild.
+    """
+    clf = pipeline.named_steps["clf"]
+    unknown = sorted(set(labels) - set(clf.classes_))
+    if unknown:
+        raise ValueError(f"Label baru {unknown} membutuhkan full rebuild (--rebuild)")
+    clf.partial_fit(pipeline.named_steps["tfidf"].transform(texts), labels)
+    return pipeline
+
+
+def load_incremental_state() -> dict:
+    if not os.path.exists(INCREMENTAL_STATE_PATH):
+        return {"updates_since_rebuild": 0}
+    with open(INCREMENTAL_STATE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_incremental_state(state: dict) -> None:
+    with open(INCREMENTAL_STATE_PATH, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+
+
+def read_document(path: str) -> str:
+    """Teks bersih dari file .pdf (via extract_pdf) atau file teks biasa."""
+    from extract_pdf import clean_text, extract_text_from_pdf
+
+    if path.lower().endswith(".pdf"):
+        return clean_text(extract_text_from_pdf(path))
+    with open(path, encoding="utf-8") as f:
+        return clean_text(f.read())
+
+
+def remove_document(dataset_path: str, filename: str) -> int:
+    """Hapus semua baris ``filename`` dari dataset; mengembalikan jumlah baris yang dihapus.
+
+    File ditulis ulang ke file sementara lalu diganti dengan ``os.replace``,
+    sehingga dataset tidak pernah setengah tertulis.
+    """
+    if not os.path.exists(dataset_path):
+        return 0
+    tmp = f"{dataset_path}.tmp"
+    removed = 0
+    with open(dataset_path, "r", encoding="utf-8", newline="") as src, \
+            open(tmp, "w", encoding="utf-8", newline="") as dst:
+        if dataset_path.endswith(".jsonl"):
+            for line in src:
+                if line.strip() and json.loads(line)["filename"] == filename:
+                    removed += 1
+                else:
+                    dst.write(line)
+        else:
+            reader = csv.DictReader(src)
+            writer = csv.DictWriter(dst, fieldnames=reader.fieldnames or ["filename", "content", "department"])
+            writer.writeheader()
+            for row in reader:
+                if row["filename"] == filename:
+                    removed += 1
+                else:
+                    writer.writerow(row)
+    if removed:
+        os.replace(tmp, dataset_path)
+    else:
+        os.remove(tmp)
+    return removed
+
+
+def add_document(
+    path: str, label: str, dataset_path: str, rebuild_every: int = DEFAULT_REBUILD_EVERY,
+    store: FeatureStore | None = None,
+) -> Pipeline:
+    """Tambahkan satu dokumen berlabel ke dataset dan model tersimpan.
+
+    Dokumen selalu ditambahkan ke dataset agar ikut di full rebuild
+    berikutnya. Model diperbarui secara inkremental, kecuali label baru
+    atau jumlah update sudah mencapai ``rebuild_every`` (0 = tidak pernah);
+    dalam kedua kasus itu model dilatih ulang penuh dari dataset.
+
+    Jika ``filename`` sudah ada di dataset, baris lamanya diganti (dianggap
+    update) dan model dilatih ulang penuh, karena ``partial_fit`` tidak bisa
+    mengurangi hitungan dokumen versi lama.
+    """
+    content = read_document(path)
+    filename = os.path.basename(path)
+    replaced = remove_document(dataset_path, filename) > 0
+    with DocumentWriter(dataset_path, ["filename", "content", "department"], append=True) as writer:
+        writer.write({"filename": filename, "content": content, "department": label})
+    print(f"{'Replaced' if replaced else 'Appended'} '{filename}' ({label}) in '{dataset_path}'")
+
+    pipeline = load_active_pipeline()
+    state = load_incremental_state()
+    needs_rebuild = replaced or label not in pipeline.named_steps["clf"].classes_ or (
+        rebuild_every > 0 and state["updates_since_rebuild"] + 1 >= rebuild_every
+    )
+    start = time.perf_counter()
+    if needs_rebuild:
+        print("Full rebuild (vocabulary dan IDF diperbarui)...")
+        pipeline = rebuild_model(dataset_path, store)
+    else:
+        incremental_update(pipeline, [content], [label])
+        state["updates_since_rebuild"] += 1
+        save_incremental_state(state)
+        print(f"Incremental update #{state['updates_since_rebuild']} in "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms")
+    mode = "rebuild" if needs_rebuild else "incremental"
+    save_model(pipeline, MODEL_PATH, training_metadata(pipeline, mode, dataset_path))
+    export_compact_model(pipeline, COMPACT_MODEL_DIR)
+    return pipeline
+
+
+def rebuild_model(dataset_path: str, store: FeatureStore | None = None) -> Pipeline:
+    """Full retrain tanpa CV pada seluruh dataset; reset hitungan update inkremental.
+
+    Dengan ``store`` hanya dokumen baru yang ditokenisasi (``FeatureStore.sync``).
+    """
+    df = load_data(dataset_path)
+    if store is not None:
+        store.sync(dataset_path)
+        counts, terms = store.counts(df["filename"], DEFAULT_PARAMS["ngram_range"])
+        pipeline, _ = fit_counts(counts, terms, df["department"].to_numpy())
+    else:
+        pipeline = build_pipeline().fit(df["content"], df["department"])
+    save_incremental_state({"updates_since_rebuild": 0})
+    return pipeline
+
+
+def compare_incremental(df: pd.DataFrame, base_fraction: float = 0.5, seed: int = 42) -> dict:
+    """Bandingkan model inkremental dengan full retrain pada held-out split.
+
+    Data training dibagi dua: model dasar dilatih pada ``base_fraction``
+    pertama, lalu sisa dokumen ditambahkan satu per satu dengan
+    ``incremental_update``. Akurasinya pada test split dibandingkan dengan
+    pipeline yang dilatih penuh pada seluruh data training.
+    """
+    X_train, X_test, y_train, y_test = train_test_split(
+        df["content"], df["department"], test_size=0.2, random_state=seed, stratify=df["department"],
+    )
+    X_base, X_new, y_base, y_new = train_test_split(
+        X_train, y_train, train_size=base_fraction, random_state=seed, stratify=y_train,
+    )
+    # Model dasar harus mengenal semua kelas agar partial_fit bisa dipakai
+    missing = set(y_train) - set(y_base)
+    if missing:
+        raise ValueError(f"Split dasar tidak memuat kelas {sorted(missing)}; naikkan base_fraction")
+
+    incremental = build_pipeline().fit(X_base, y_base)
+    base_acc = accuracy_score(y_test, incremental.predict(X_test))
+    start = time.perf_counter()
+    for text, label in zip(X_new, y_new):
+        incremental_update(incremental, [text], [label])
+    per_update = (time.perf_counter() - start) / max(len(X_new), 1)
+    incremental_acc = accuracy_score(y_test, incremental.predict(X_test))
+
+    start = time.perf_counter()
+    full = build_pipeline().fit(X_train, y_train)
+    full_time = time.perf_counter() - start
+    full_acc = accuracy_score(y_test, full.predict(X_test))
+
+    result = {
+        "base_docs": len(X_base),
+        "added_docs": len(X_new),
+        "test_docs": len(X_test),
+        "base_accuracy": base_acc,
+        "incremental_accuracy": incremental_acc,
+        "full_retrain_accuracy": full_acc,
+        "incremental_ms_per_doc": per_update * 1000,
+        "full_retrain_ms": full_time * 1000,
+        "agreement": float(np.mean(incremental.predict(X_test) == full.predict(X_test))),
+    }
+    print("=" * 60)
+    print("Incremental vs Full Retrain (held-out test split)")
+    print("=" * 60)
+    print(f"  Base model ({result['base_docs']} docs)      : {base_acc:.4f}")
+    print(f"  + {result['added_docs']} docs via partial_fit : {incremental_acc:.4f}"
+          f"  ({result['incremental_ms_per_doc']:.1f} ms/doc)")
+    print(f"  Full retrain               : {full_acc:.4f}  ({result['full_retrain_ms']:.0f} ms)")
+    print(f"  Prediction agreement       : {result['agreement']:.4f}\n")
+    return result
 
 
 def load_model(path: str) -> Pipeline:
@@ -105,15 +665,113 @@ def predict(pipeline: Pipeline, texts: list[str]) -> list[str]:
     return pipeline.predict(texts).tolist()
 
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Training model klasifikasi peraturan OJK.")
+    parser.add_argument(
+        "--input", default=INPUT_CSV,
+        help="Dataset berlabel (.csv atau .jsonl, default output_pojk_classified.csv).",
+    )
+    parser.add_argument(
+        "--export-compact-only", action="store_true",
+        help="Tanpa training: ekspor model tersimpan ke format ringkas (nb_inference).",
+    )
+    parser.add_argument(
+        "--tune", action="store_true",
+        help="Cari hyperparameter TF-IDF + NB terbaik lalu simpan pipeline terbaik.",
+    )
+    parser.add_argument(
+        "--n-iter", type=int, default=None,
+        help="Dengan --tune: random search sebanyak N kombinasi (default: grid penuh).",
+    )
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Dengan --tune: jumlah proses (-1 = semua core).")
+    parser.add_argument("--top", type=int, default=15, help="Dengan --tune: jumlah baris tabel peringkat.")
+    parser.add_argument(
+        "--add", metavar="FILE",
+        help="Tambahkan satu dokumen berlabel (.pdf atau teks) secara inkremental; butuh --label.",
+    )
+    parser.add_argument("--label", help="Departemen untuk dokumen --add.")
+    parser.add_argument(
+        "--rebuild-every", type=int, default=DEFAULT_REBUILD_EVERY,
+        help="Full rebuild setelah sekian update inkremental (0 = tidak pernah).",
+    )
+    parser.add_argument("--rebuild", action="store_true", help="Full rebuild tanpa CV dari --input.")
+    parser.add_argument(
+        "--slim", action="store_true",
+        help="Setelah training: tulis juga model padat (float32, terkompresi) lewat model_compaction.",
+    )
+    parser.add_argument(
+        "--prune", type=float, default=None,
+        help="Dengan --slim: buang term dengan selisih log-probabilitas antar kelas di bawah nilai ini.",
+    )
+    parser.add_argument(
+        "--feature-store", metavar="DIR", nargs="?", const=FEATURE_STORE_DIR,
+        help="Baca hitungan n-gram dari feature store (disinkronkan dari --input) "
+             "alih-alih men-tokenisasi ulang teks (default: feature_store/).",
+    )
+    parser.add_argument(
+        "--compare-incremental", action="store_true",
+        help="Bandingkan akurasi model inkremental dengan full retrain pada held-out split.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.export_compact_only:
+        export_compact_model(load_model(MODEL_PATH), COMPACT_MODEL_DIR)
+        return
+
+    store = FeatureStore(args.feature_store) if args.feature_store else None
+
+    if args.add:
+        if not args.label:
+            parser.error("--add membutuhkan --label")
+        add_document(args.add, args.label, args.input, args.rebuild_every, store)
+        return
+
+    if args.rebuild:
+        pipeline = rebuild_model(args.input, store)
+        save_model(pipeline, MODEL_PATH, training_metadata(pipeline, "rebuild", args.input))
+        export_compact_model(pipeline, COMPACT_MODEL_DIR)
+        if args.slim:
+            save_slim_model(pipeline, args.prune)
+        return
+
     # Load
-    df = load_data(INPUT_CSV)
+    df = load_data(args.input)
+    if store is not None:
+        stats = store.sync(args.input)
+        print(f"Feature store '{store.path}': {stats['added']} added, {stats['updated']} updated, "
+              f"{stats['unchanged']} unchanged\n")
+
+    if args.compare_incremental:
+        compare_incremental(df)
+        return
+
+    if args.tune:
+        results = tune_hyperparameters(df, n_iter=args.n_iter, n_jobs=args.n_jobs, store=store)
+        print_tuning_results(results, top=args.top)
+        best = results[0]["params"]
+        print(f"Best params: {best}")
+        print("Training pada seluruh dataset dengan parameter terbaik...")
+        if store is not None:
+            counts, terms = store.counts(df["filename"], tuple(best["ngram_range"]))
+            pipeline, _ = fit_counts(counts, terms, df["department"].to_numpy(), **best)
+        else:
+            pipeline = build_pipeline(**best).fit(df["content"], df["department"])
+        save_incremental_state({"updates_since_rebuild": 0})
+        save_model(pipeline, MODEL_PATH, training_metadata(pipeline, "tune", args.input, results[0]["scores"]))
+        export_compact_model(pipeline, COMPACT_MODEL_DIR)
+        if args.slim:
+            save_slim_model(pipeline, args.prune, df["content"].tolist())
+        return
 
     # Train & evaluate
-    pipeline = train_and_evaluate(df)
+    pipeline, cv_scores = train_and_evaluate(df, store)
 
     # Save
-    save_model(pipeline, MODEL_PATH)
+    save_incremental_state({"updates_since_rebuild": 0})
+    save_model(pipeline, MODEL_PATH, training_metadata(pipeline, "train", args.input, cv_scores))
+    export_compact_model(pipeline, COMPACT_MODEL_DIR)
+    if args.slim:
+        save_slim_model(pipeline, args.prune, df["content"].tolist())
 
     # Demo: predict on a few sample texts
     print("\n" + "=" * 60)